@@ -0,0 +1,170 @@
+"""Adaptif zorluk motoru: öğrenci başına artımlı istatistikler ve soru seçimi.
+
+Her cevapta `guncelle()` O(1) zamanda üssel ağırlıklı ortalamayı, trendi ve
+işlem bazlı ustalık tahminini günceller. Sonraki sorunun zorluğu ve işlemi
+yalnızca bu istatistiklerden seçilir; geçmiş puan listesi yeniden taranmaz.
+
+Politikaları geçmiş veriler üzerinde karşılaştırmak için:
+    python adaptif.py [veri_dizini|defter.csv]
+"""
+import random
+import sys
+import time
+from collections import defaultdict
+
+from defter import Defter, defter_yollari
+from veri_modeli import Islem, Ogrenci, OgrenciIstatistik, Zorluk, islem_coz
+
+# Güncelleme ağırlıkları: ilk gözlemlerde düz ortalama, sonra üssel ağırlık
+ORTALAMA_ALFA = 0.4
+TREND_ALFA = 0.5
+USTALIK_ALFA = 0.3
+
+# Zorluk eşikleri (100 üzerinden puan)
+ILERI_ESIGI = 85
+ORTA_ESIGI = 65
+
+# Ustalığı bu değerin altında kalan işlemler daha sık sorulur
+KESIF_AGIRLIGI = 0.15
+
+
+def guncelle(ist: OgrenciIstatistik, puan: int, islem=None):
+    """Puanlanan bir cevabı istatistiklere işler (O(1))"""
+    ist.n += 1
+    if ist.n == 1:
+        ist.ortalama = float(puan)
+        ist.trend = 0.0
+    else:
+        ist.trend += TREND_ALFA * ((puan - ist.son_puan) - ist.trend)
+        ist.ortalama += max(ORTALAMA_ALFA, 1 / ist.n) * (puan - ist.ortalama)
+    ist.son_puan = puan
+
+    if islem is not None:
+        i = int(islem)
+        ist.deneme[i] += 1
+        ist.ustalik[i] += max(USTALIK_ALFA, 1 / ist.deneme[i]) * (puan / 100 - ist.ustalik[i])
+
+
+def istatistik_hazirla(profil: Ogrenci) -> OgrenciIstatistik:
+    """Profilin istatistiklerini döndürür; eski kayıtlarda bir kereye mahsus geçmişten kurar"""
+    ist = profil.istatistik
+    if ist.n == 0 and profil.soru_sayisi > 0:
+        for deneme in profil.gecmis_sorular[:profil.soru_sayisi]:
+            guncelle(ist, deneme.puan, deneme.islem)
+    return ist
+
+
+# ============= POLİTİKALAR =============
+def ewma_politikasi(ist: OgrenciIstatistik, puanlar=None) -> Zorluk:
+    """Üssel ortalama ve trende göre zorluk (varsayılan politika)"""
+    if ist.n == 0:
+        return Zorluk.TEMEL
+    if ist.ortalama >= ILERI_ESIGI and ist.trend >= -5:
+        return Zorluk.ILERI
+    if ist.ortalama >= ORTA_ESIGI and ist.trend >= -10:
+        return Zorluk.ORTA
+    return Zorluk.TEMEL
+
+
+def pencere_politikasi(ist: OgrenciIstatistik, puanlar=None) -> Zorluk:
+    """Eski kural: son 3 puanın ortalaması ve son iki puan farkı (karşılaştırma için)"""
+    if not puanlar:
+        return Zorluk.TEMEL
+    son_3 = puanlar[-3:]
+    yuzde = sum(son_3) / len(son_3)
+    trend = puanlar[-1] - puanlar[-2] if len(puanlar) >= 2 else 0
+    if yuzde >= ILERI_ESIGI and trend >= 0:
+        return Zorluk.ILERI
+    if yuzde >= ORTA_ESIGI and trend >= -1:
+        return Zorluk.ORTA
+    return Zorluk.TEMEL
+
+
+def sabit_politika(ist: OgrenciIstatistik, puanlar=None) -> Zorluk:
+    """Herkese temel soru (alt sınır olarak)"""
+    return Zorluk.TEMEL
+
+
+POLITIKALAR = {
+    "ewma": ewma_politikasi,
+    "pencere": pencere_politikasi,
+    "sabit": sabit_politika,
+}
+AKTIF_POLITIKA = "ewma"
+
+
+def zorluk_sec(profil: Ogrenci) -> Zorluk:
+    return POLITIKALAR[AKTIF_POLITIKA](istatistik_hazirla(profil), profil.gecmis_puanlar)
+
+
+def islem_sec(ist: OgrenciIstatistik, rng=random) -> Islem:
+    """Ustalığı düşük (ya da hiç denenmemiş) işlemleri daha sık seçer"""
+    agirliklar = [(1.0 - u) + KESIF_AGIRLIGI for u in ist.ustalik]
+    return rng.choices(list(Islem), weights=agirliklar)[0]
+
+
+# ============= ÇEVRİMDIŞI SİMÜLASYON =============
+def _seviye(puan: float) -> Zorluk:
+    if puan >= ILERI_ESIGI:
+        return Zorluk.ILERI
+    if puan >= ORTA_ESIGI:
+        return Zorluk.ORTA
+    return Zorluk.TEMEL
+
+
+def defter_oku(yol: str) -> dict:
+    """Cevap defterini (ya da dizindeki tüm defterleri) {uid: [(soru_no, puan, islem), ...]} biçiminde okur"""
+    oturumlar = defaultdict(list)
+    for defter_yolu in defter_yollari(yol):
+        for k in Defter(defter_yolu).kayitlar():
+            oturumlar[k.uid].append((k.soru_no, k.puan, islem_coz(k.soru)))
+    for kayitlar in oturumlar.values():
+        kayitlar.sort(key=lambda k: k[0])
+    return oturumlar
+
+
+def simule_et(oturumlar: dict, politikalar=None) -> dict:
+    """Her politikayı geçmiş oturumlar üzerinde yeniden oynatır.
+
+    Her cevaptan önce politikanın seçtiği zorluk, öğrencinin o cevapta gerçekten
+    ulaştığı puan bandıyla karşılaştırılır. Dönen sözlük politika başına isabet
+    oranını, ortalama seviye sapmasını ve seçilen zorluk dağılımını içerir.
+    """
+    politikalar = politikalar or POLITIKALAR
+    sonuclar = {}
+    for ad, politika in politikalar.items():
+        isabet = sapma = toplam = 0
+        dagilim = [0] * len(Zorluk)
+        for kayitlar in oturumlar.values():
+            ist = OgrenciIstatistik()
+            puanlar = []
+            for _, puan, islem in kayitlar:
+                secim = politika(ist, puanlar)
+                gercek = _seviye(puan)
+                isabet += secim == gercek
+                sapma += abs(int(secim) - int(gercek))
+                dagilim[secim] += 1
+                toplam += 1
+                guncelle(ist, puan, islem)
+                puanlar.append(puan)
+        sonuclar[ad] = {
+            "cevap": toplam,
+            "isabet": round(isabet / toplam, 3) if toplam else 0.0,
+            "ortalama_sapma": round(sapma / toplam, 3) if toplam else 0.0,
+            "dagilim": {z.metin: dagilim[z] for z in Zorluk},
+        }
+    return sonuclar
+
+
+if __name__ == "__main__":
+    yol = sys.argv[1] if len(sys.argv) > 1 else "."
+    t = time.perf_counter()
+    oturumlar = defter_oku(yol)
+    okuma = time.perf_counter() - t
+    t = time.perf_counter()
+    sonuclar = simule_et(oturumlar)
+    sure = time.perf_counter() - t
+    print(f"{len(oturumlar)} oturum okundu ({okuma * 1000:.0f} ms), simülasyon {sure * 1000:.0f} ms")
+    for ad, s in sonuclar.items():
+        print(f"{ad:<10} isabet %{s['isabet'] * 100:5.1f}  sapma {s['ortalama_sapma']:.2f}  "
+              f"dağılım {s['dagilim']}  ({s['cevap']} cevap)")
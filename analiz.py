@@ -0,0 +1,194 @@
+"""Çevrimdışı madde analizi: hangi rasyonel sorular gerçekten zor?
+
+defter.csv'deki soru metinleri `(s1) op (s2)` biçimine geri ayrıştırılır ve
+tüm geçmiş üzerinde vektörel pandas/NumPy işlemleriyle şunlar hesaplanır:
+
+* madde (s1 op s2) ve işlem başına puan dağılımı (n, ortalama, std, çeyrekler)
+* ayırt edicilik: üst %27 ile alt %27 öğrenci grubunun madde ortalaması farkı
+* madde-kalan korelasyonu: madde puanı ile öğrencinin diğer cevaplarının ortalaması
+
+Sonuç, soru üretecinin başlangıçta yüklediği kompakt bir kalibrasyon tablosuna
+(kalibrasyon.json) yazılır. Çalıştırmak için (dizin verilirse kök defter ve
+tüm sınıf parçalarının defterleri birlikte okunur):
+    python analiz.py [veri_dizini|defter.csv] [kalibrasyon.json]
+"""
+import datetime
+import json
+import os
+import sys
+
+from defter import BASLIKLAR, Defter, defter_yollari
+from veri_modeli import RASYONEL_SORU_RE, Zorluk
+
+KALIBRASYON_SURUMU = 1
+MIN_MADDE_CEVABI = 3    # Bundan az cevaplı maddeler tabloya yazılmaz
+BUZULME_AGIRLIGI = 5    # Madde ortalaması işlem ortalamasına bu kadar "sanal cevap" ile çekilir
+UC_GRUP_ORANI = 0.27
+
+
+def sorulari_ayristir(df):
+    """`soru` sütununu s1, islem, s2, sonuc ve madde sütunlarına ayırır (vektörel).
+
+    Kalıba uymayan sorular (eski şablonlar) atılır.
+    """
+    # Soru kalıbı veri_modeli'ndekiyle aynıdır (soru_sikistir / rasyonel_parcalar)
+    parcalar = df["soru"].astype(str).str.extract(RASYONEL_SORU_RE)
+    parcalar.columns = ["s1", "islem", "s2", "sonuc"]
+    df = df.join(parcalar).dropna(subset=["islem"])
+    df["madde"] = df["s1"] + " " + df["islem"] + " " + df["s2"]
+    return df
+
+
+def defter_yukle(yol):
+    import pandas as pd
+
+    # Parçalı kurulumda kök defter yalnızca başlıktan oluşur; boş (object türlü) çerçeveler
+    # birleştirilirse puan sütunu da object olur ve quantile çalışmaz
+    cerceveler = [c for c in (Defter(y).veri_cercevesi() for y in defter_yollari(yol)) if len(c)]
+    df = pd.concat(cerceveler, ignore_index=True) if cerceveler else pd.DataFrame(columns=BASLIKLAR)
+    df["puan"] = df["puan"].astype("int64")
+    return sorulari_ayristir(df)
+
+
+def _dagilim(gruplar):
+    # describe() grup başına ayrı çalışır; agg + tek quantile çağrısı çok daha hızlıdır
+    puan = gruplar["puan"]
+    ozet = puan.agg(["count", "mean", "std", "min", "max"])
+    ceyrekler = puan.quantile([0.25, 0.5, 0.75]).unstack()
+    ozet["c1"], ozet["medyan"], ozet["c3"] = ceyrekler[0.25], ceyrekler[0.5], ceyrekler[0.75]
+    ozet = ozet.rename(columns={"count": "n", "mean": "ortalama"})
+    return ozet[["n", "ortalama", "std", "min", "c1", "medyan", "c3", "max"]]
+
+
+def _ayirt_edicilik(df, anahtar):
+    """Üst ve alt %27 öğrenci gruplarının ortalama farkı (0-1 ölçeğinde)"""
+    import numpy as np
+
+    yetenek = df.groupby("uid")["puan"].mean()
+    alt_sinir, ust_sinir = yetenek.quantile([UC_GRUP_ORANI, 1 - UC_GRUP_ORANI])
+    grup = df["uid"].map(yetenek)
+    etiket = np.where(grup >= ust_sinir, "ust", np.where(grup <= alt_sinir, "alt", ""))
+    uclar = df.assign(grup=etiket)[etiket != ""]
+    tablo = uclar.groupby([anahtar, "grup"])["puan"].mean().unstack()
+    for sutun in ("ust", "alt"):
+        if sutun not in tablo:
+            tablo[sutun] = np.nan
+    return (tablo["ust"] - tablo["alt"]) / 100
+
+
+def _madde_kalan_korelasyonu(df, anahtar):
+    """Madde puanı ile aynı öğrencinin diğer cevaplarının ortalaması arasındaki korelasyon"""
+    ogrenci = df.groupby("uid")["puan"].agg(["sum", "count"])
+    toplam = df["uid"].map(ogrenci["sum"])
+    sayi = df["uid"].map(ogrenci["count"])
+    kalan = (toplam - df["puan"]) / (sayi - 1).where(sayi > 1)
+    cift = df.assign(x=df["puan"], y=kalan).dropna(subset=["y"])
+    # Pearson r, grup başına toplamlardan tek geçişte hesaplanır
+    cift = cift.assign(xx=cift["x"] ** 2, yy=cift["y"] ** 2, xy=cift["x"] * cift["y"])
+    t = cift.groupby(anahtar)[["x", "y", "xx", "yy", "xy"]].sum()
+    n = cift.groupby(anahtar).size()
+    pay = n * t["xy"] - t["x"] * t["y"]
+    payda = ((n * t["xx"] - t["x"] ** 2) * (n * t["yy"] - t["y"] ** 2)) ** 0.5
+    return (pay / payda.where(payda > 0)).clip(-1, 1)
+
+
+def analiz_et(df):
+    """(madde_tablosu, islem_tablosu) DataFrame'lerini döndürür"""
+    tablolar = []
+    for anahtar in ("madde", "islem"):
+        tablo = _dagilim(df.groupby(anahtar))
+        tablo["ayirt_edicilik"] = _ayirt_edicilik(df, anahtar)
+        tablo["madde_kalan_r"] = _madde_kalan_korelasyonu(df, anahtar)
+        tablolar.append(tablo)
+    maddeler, islemler = tablolar
+    maddeler["islem"] = df.groupby("madde")["islem"].first()
+
+    # Az cevaplı maddelerin ortalaması işlem ortalamasına doğru büzülür
+    islem_ort = maddeler["islem"].map(islemler["ortalama"])
+    maddeler["beklenen"] = ((maddeler["n"] * maddeler["ortalama"] + BUZULME_AGIRLIGI * islem_ort)
+                            / (maddeler["n"] + BUZULME_AGIRLIGI))
+    return maddeler, islemler
+
+
+def kalibrasyon_tablosu(maddeler, islemler) -> dict:
+    """Soru üretecinin yükleyeceği kompakt tabloyu kurar"""
+    secili = maddeler[maddeler["n"] >= MIN_MADDE_CEVABI]
+    esikler = secili["beklenen"].quantile([1 / 3, 2 / 3]).tolist() if len(secili) else []
+    return {
+        "v": KALIBRASYON_SURUMU,
+        "uretim": datetime.datetime.now().isoformat(timespec="seconds"),
+        "esikler": [round(e, 1) for e in esikler],
+        "islemler": {
+            op: [int(s["n"]), round(float(s["ortalama"]), 1)] for op, s in islemler.iterrows()
+        },
+        "maddeler": {
+            madde: [int(s["n"]), round(float(s["beklenen"]), 1)] for madde, s in secili.iterrows()
+        },
+    }
+
+
+# ============= ÜRETECİN KULLANDIĞI TABLO (pandas gerektirmez) =============
+class Kalibrasyon:
+    """kalibrasyon.json'u yükler ve bir maddenin hangi zorluk bandına düştüğünü söyler"""
+
+    def __init__(self, veri: dict = None):
+        veri = veri or {}
+        self.esikler = veri.get("esikler") or []
+        self.maddeler = {m: b for m, (_, b) in veri.get("maddeler", {}).items()}
+
+    def __bool__(self):
+        return len(self.esikler) == 2 and bool(self.maddeler)
+
+    def zorluk(self, madde: str):
+        """Maddenin ("1/2 + -1/3") kalibre zorluk seviyesi; verisi yoksa None"""
+        beklenen = self.maddeler.get(madde)
+        if beklenen is None:
+            return None
+        if beklenen >= self.esikler[1]:
+            return Zorluk.TEMEL
+        if beklenen >= self.esikler[0]:
+            return Zorluk.ORTA
+        return Zorluk.ILERI
+
+
+def kalibrasyon_yukle(yol: str) -> Kalibrasyon:
+    if not os.path.exists(yol):
+        return Kalibrasyon()
+    try:
+        with open(yol, encoding="utf-8") as f:
+            veri = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"UYARI: Kalibrasyon tablosu okunamadı ({e}), kalibrasyonsuz devam ediliyor.")
+        return Kalibrasyon()
+    if veri.get("v") != KALIBRASYON_SURUMU:
+        return Kalibrasyon()
+    return Kalibrasyon(veri)
+
+
+def main():
+    import pandas as pd
+
+    kaynak = sys.argv[1] if len(sys.argv) > 1 else "."
+    dizin = kaynak if os.path.isdir(kaynak) else os.path.dirname(kaynak) or "."
+    hedef = sys.argv[2] if len(sys.argv) > 2 else os.path.join(dizin, "kalibrasyon.json")
+    df = defter_yukle(kaynak)
+    if df.empty:
+        print("Ayrıştırılabilir soru bulunamadı.")
+        return
+    maddeler, islemler = analiz_et(df)
+    tablo = kalibrasyon_tablosu(maddeler, islemler)
+    with open(hedef, "w", encoding="utf-8") as f:
+        json.dump(tablo, f, ensure_ascii=False, separators=(",", ":"))
+
+    with pd.option_context("display.width", 120, "display.precision", 2):
+        print(islemler)
+        print(f"\n{len(maddeler)} madde, {len(tablo['maddeler'])} tanesi tabloya yazıldı "
+              f"(en az {MIN_MADDE_CEVABI} cevap). Eşikler: {tablo['esikler']}")
+        print("\nEn zor 10 madde:")
+        print(maddeler[maddeler["n"] >= MIN_MADDE_CEVABI].nsmallest(10, "beklenen")[
+            ["islem", "n", "ortalama", "beklenen", "ayirt_edicilik", "madde_kalan_r"]])
+    print(f"\n--> {hedef}")
+
+
+if __name__ == "__main__":
+    main()
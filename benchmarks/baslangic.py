@@ -0,0 +1,65 @@
+"""Soğuk başlangıç ölçümü: modül importu ve create_app() süresi.
+
+Her ölçüm temiz bir Python sürecinde yapılır; böylece import önbelleği
+sonuçları etkilemez. Karşılaştırma için tek başına `import pandas` süresi de
+yazdırılır (eski sürüm bu maliyeti her başlangıçta ödüyordu).
+
+Kullanım:
+    python benchmarks/baslangic.py [tekrar_sayisi]
+"""
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+KOK = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+OLCUMLER = {
+    "import krm_calisir": (
+        "import time; t=time.perf_counter(); import krm_calisir; "
+        "print(time.perf_counter()-t)"
+    ),
+    "import + create_app()": (
+        "import time; t=time.perf_counter(); import krm_calisir; krm_calisir.create_app(); "
+        "print(time.perf_counter()-t)"
+    ),
+    "import pandas (referans)": (
+        "import time; t=time.perf_counter(); import pandas; "
+        "print(time.perf_counter()-t)"
+    ),
+}
+
+
+def olc(kod, tekrar, veri_dizini):
+    ortam = dict(os.environ, DYNAPROOF_VERI_DIZINI=veri_dizini, PYTHONDONTWRITEBYTECODE="1")
+    sureler = []
+    for _ in range(tekrar):
+        cikti = subprocess.run(
+            [sys.executable, "-c", kod], cwd=KOK, env=ortam,
+            capture_output=True, text=True, check=True,
+        ).stdout
+        sureler.append(float(cikti.strip().splitlines()[-1]))
+    return sureler
+
+
+def main():
+    tekrar = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    with tempfile.TemporaryDirectory() as veri_dizini:
+        for ad, kod in OLCUMLER.items():
+            sureler = olc(kod, tekrar, veri_dizini)
+            print(f"{ad:<28} medyan {statistics.median(sureler) * 1000:8.1f} ms  "
+                  f"(min {min(sureler) * 1000:.1f} ms, n={tekrar})")
+
+        # pandas'ın gerçekten tembel yüklendiğini doğrula
+        kontrol = subprocess.run(
+            [sys.executable, "-c",
+             "import sys, krm_calisir; krm_calisir.create_app(); print('pandas' in sys.modules)"],
+            cwd=KOK, env=dict(os.environ, DYNAPROOF_VERI_DIZINI=veri_dizini),
+            capture_output=True, text=True, check=True,
+        ).stdout.strip().splitlines()[-1]
+        print(f"create_app() sonrası pandas yüklü mü: {kontrol}")
+
+
+if __name__ == "__main__":
+    main()
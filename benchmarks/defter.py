@@ -0,0 +1,87 @@
+"""Cevap defteri: eski (tam metinli) biçim ile sözlüklü biçimin boyutu ve okuma süresi.
+
+Eski defter.csv her satırda öğrenci adını, soru metnini ve uzun geri bildirim
+metnini tekrar yazıyordu. Yeni biçimde bu metinler defter.csv.sozluk tablosunda
+bir kez saklanır, satırlar kimliklere başvurur ve uzun cevaplar sıkıştırılır.
+
+Kullanım:
+    python benchmarks/defter.py [kayit_sayisi]
+"""
+import csv
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from defter import BASLIKLAR, Defter  # noqa: E402
+from veri_modeli import RASYONEL_SORU_KALIBI, Zorluk  # noqa: E402
+
+GERI_BILDIRIMLER = [
+    "Mükemmel! Hem doğru sonucu buldun hem de adımları açıkça anlattın.",
+    "İyi! Doğru yoldasın ama bazı adımları daha açık yazabilirsin.",
+    "Yetersiz. Cevabını adım adım, matematiksel terimler (payda, pay, eşitleme) kullanarak "
+    "ve 'çünkü' ile sebep belirterek tekrar yazmalısın.",
+]
+CEVAPLAR = [
+    "bilmiyorum",
+    "paydaları eşitledim sonra payları topladım",
+    "Önce paydaları eşitlemek için ortak payda bulunur çünkü farklı paydalı kesirler doğrudan "
+    "toplanamaz. Sonra paylar toplanır ve sonuç sadeleştirilir.",
+]
+
+
+def eski_defter_yaz(yol, n, rng):
+    with open(yol, "w", newline="", encoding="utf-8-sig") as f:
+        yazici = csv.writer(f)
+        yazici.writerow(BASLIKLAR)
+        for i in range(n):
+            uid = f"{i // 10:08x}"
+            a, b, c = rng.randint(1, 9), rng.randint(2, 12), rng.randint(1, 9)
+            soru = RASYONEL_SORU_KALIBI.format(s1=f"{a}/{b}", op=rng.choice("+-*/"), s2=f"{c}/{b}", sonuc="1/2")
+            yazici.writerow([f"{1 + i % 28:02d}-10-2026 {10 + i % 8}:{i % 60:02d}", uid,
+                             f"Öğrenci {i // 10} Soyad", f"7-{'ABCD'[i // 10 % 4]}", soru,
+                             rng.choice(CEVAPLAR) + f" ({i})", rng.randint(0, 100),
+                             rng.choice(list(Zorluk)).metin, i % 10 + 1, rng.choice(GERI_BILDIRIMLER)])
+
+
+def okuma_suresi(yol, tekrar=3):
+    en_iyi = float("inf")
+    for _ in range(tekrar):
+        t = time.perf_counter()
+        kayitlar = Defter(yol).kayitlar()
+        en_iyi = min(en_iyi, time.perf_counter() - t)
+    return en_iyi, kayitlar
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    dizin = tempfile.mkdtemp()
+    try:
+        yol = os.path.join(dizin, "defter.csv")
+        eski_defter_yaz(yol, n, random.Random(0))
+        eski_boyut = os.path.getsize(yol)
+        eski_sure, eski_kayitlar = okuma_suresi(yol)
+        eski_kayitlar = [k.sozluk() for k in eski_kayitlar]
+
+        t = time.perf_counter()
+        Defter(yol).hazirla()
+        donusum = time.perf_counter() - t
+        yeni_boyut = os.path.getsize(yol) + os.path.getsize(yol + ".sozluk")
+        yeni_sure, yeni_kayitlar = okuma_suresi(yol)
+        assert [k.sozluk() for k in yeni_kayitlar] == eski_kayitlar, "dönüşüm kayıtları değiştirdi"
+
+        print(f"{n} kayıt (dönüşüm {donusum * 1000:.0f} ms)")
+        print(f"boyut : eski {eski_boyut / 1024:8.0f} KiB   yeni {yeni_boyut / 1024:8.0f} KiB "
+              f"({eski_boyut / yeni_boyut:.1f}x küçük)")
+        print(f"okuma : eski {eski_sure * 1000:8.0f} ms    yeni {yeni_sure * 1000:8.0f} ms "
+              f"({eski_sure / yeni_sure:.1f}x)")
+    finally:
+        shutil.rmtree(dizin)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Güncelleme başına yazma maliyeti ve kurtarma süresi: tam dosya yazımı ile günlük.
+
+Eski yol her cevapta tüm ogrenciler.json'u yeniden yazıyordu. Depo (depo.py)
+yalnızca tek bir günlük satırı ekleyip fsync eder; açılışta son anlık görüntü
+ile günlüğün kuyruğunu oynatır.
+
+Kullanım:
+    python benchmarks/gunluk.py [ogrenci_sayisi] [guncelleme_sayisi]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from depo import OgrenciDeposu  # noqa: E402
+from veri_modeli import Konu, Ogrenci, SoruDenemesi, Zorluk, ogrencileri_serilestir  # noqa: E402
+
+SORU = "(1/2) + (-1/3) işleminin sonucunun neden 1/6 olduğunu adım adım açıkla."
+
+
+def doldur(depo, n):
+    for i in range(n):
+        uid = f"{i:08x}"
+        depo.kaydet(uid, Ogrenci("Ahmet", "Yılmaz", "7-A", "2026-10-19T10:00:00"))
+        for no in range(1, 11):
+            depo.soru_ekle(uid, SoruDenemesi.yeni(no, Konu.RASYONEL, Zorluk.TEMEL, SORU))
+            depo.cevap_isle(uid, 60)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    guncelleme = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    dizin = tempfile.mkdtemp()
+    try:
+        anlik, gunluk = os.path.join(dizin, "ogrenciler.json"), os.path.join(dizin, "ogrenciler.gunluk")
+        depo = OgrenciDeposu(anlik, gunluk, anlik_araligi=10 ** 9)
+        doldur(depo, n)
+        depo.anlik_al()
+        ogrenciler = depo.ogrenciler()
+
+        # Eski yol: her güncellemede tam dosya yazımı (+ fsync, adil karşılaştırma için)
+        t = time.perf_counter()
+        for _ in range(guncelleme):
+            with open(os.path.join(dizin, "tam.json"), "w", encoding="utf-8") as f:
+                f.write(ogrencileri_serilestir(ogrenciler))
+                f.flush()
+                os.fsync(f.fileno())
+        tam = (time.perf_counter() - t) / guncelleme
+
+        # Günlük: yeni bir öğrencinin kaydı + soru + cevap (3 satır) başına
+        t = time.perf_counter()
+        for i in range(guncelleme // 3):
+            uid = f"yeni{i}"
+            depo.kaydet(uid, Ogrenci("Ayşe", "Kaya", "7-B", "2026-10-19T10:00:00"))
+            depo.soru_ekle(uid, SoruDenemesi.yeni(1, Konu.RASYONEL, Zorluk.TEMEL, SORU))
+            depo.cevap_isle(uid, 70)
+        yazim = (time.perf_counter() - t) / (guncelleme // 3 * 3)
+        print(f"{n} öğrenci ({os.path.getsize(anlik) / 1024:.0f} KiB anlık görüntü)")
+        print(f"güncelleme başına: tam yazım {tam * 1000:7.2f} ms   günlük {yazim * 1000:7.2f} ms "
+              f"({tam / yazim:.0f}x)")
+
+        # Kurtarma: anlık görüntü + kuyruk; kuyruk uzunluğuna göre
+        for kuyruk in (0, 1000, 10000):
+            kurtar = OgrenciDeposu(anlik, gunluk, anlik_araligi=10 ** 9)
+            kurtar.ac()
+            kurtar.anlik_al()
+            for i in range(kuyruk):
+                kurtar.cevap_isle(f"yeni{i % (guncelleme // 3)}", 50) or kurtar.soru_ekle(
+                    f"yeni{i % (guncelleme // 3)}", SoruDenemesi.yeni(i + 2, Konu.RASYONEL, Zorluk.ORTA, SORU))
+            kurtar._gunluk.close()  # kapat() anlık görüntü alırdı; çökmeyi taklit et
+            t = time.perf_counter()
+            OgrenciDeposu(anlik, gunluk).ac()
+            print(f"kurtarma, {kuyruk:>5} kayıtlık kuyruk: {(time.perf_counter() - t) * 1000:7.1f} ms")
+    finally:
+        shutil.rmtree(dizin)
+
+
+if __name__ == "__main__":
+    main()
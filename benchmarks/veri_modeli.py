@@ -0,0 +1,68 @@
+"""Profil belleği ve güncelleme başına yazılan bayt: eski sözlük biçimi ile yeni model.
+
+Eski biçim: serbest sözlükler, `json.dump(..., indent=2)`.
+Yeni biçim: veri_modeli.Ogrenci (slots + enum) ve şema sürümlü kompakt JSON.
+
+Kullanım:
+    python benchmarks/veri_modeli.py [ogrenci_sayisi]
+"""
+import datetime
+import json
+import os
+import random
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from veri_modeli import ogrencileri_coz, ogrencileri_serilestir  # noqa: E402
+
+ZORLUKLAR = ["temel", "orta", "ileri"]
+
+
+def eski_profil(rng):
+    sorular = []
+    for no in range(1, 11):
+        s1, s2 = rng.choice(["1/2", "-2/3", "5/4", "-1/6"]), rng.choice(["1/3", "3/5", "-5/2"])
+        sorular.append({
+            "soru_no": no, "konu": "rasyonel", "zorluk": rng.choice(ZORLUKLAR),
+            "soru": f"({s1}) + ({s2}) işleminin sonucunun neden 1/6 olduğunu adım adım açıkla.",
+            "puan": rng.randrange(0, 101, 10),
+        })
+    return {
+        "ad": "Ahmet", "soyad": "Yılmaz", "sinif": "7-A",
+        "gecmis_puanlar": [s["puan"] for s in sorular], "gecmis_sorular": sorular,
+        "soru_sayisi": 10, "kayit_zamani": datetime.datetime.now().isoformat(),
+    }
+
+
+def bellek(olustur):
+    tracemalloc.start()
+    once = tracemalloc.take_snapshot()
+    nesne = olustur()
+    sonra = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    boyut = sum(s.size_diff for s in sonra.compare_to(once, "filename"))
+    return nesne, boyut
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    rng = random.Random(7)
+    ham = json.dumps({f"{i:08x}": eski_profil(rng) for i in range(n)}, ensure_ascii=False)
+
+    eski, eski_bellek = bellek(lambda: json.loads(ham))
+    yeni, yeni_bellek = bellek(lambda: ogrencileri_coz(ham))
+
+    eski_bayt = len(json.dumps(eski, ensure_ascii=False, indent=2).encode("utf-8"))
+    yeni_bayt = len(ogrencileri_serilestir(yeni).encode("utf-8"))
+
+    print(f"{n} öğrenci, öğrenci başına 10 soru")
+    print(f"bellek / profil   : eski {eski_bellek / n:8.0f} B   yeni {yeni_bellek / n:8.0f} B   "
+          f"({eski_bellek / yeni_bellek:.1f}x)")
+    print(f"yazılan / güncelleme: eski {eski_bayt / 1024:8.1f} KiB yeni {yeni_bayt / 1024:8.1f} KiB "
+          f"({eski_bayt / yeni_bayt:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,514 @@
+"""Cevap defteri (defter.csv) depolama katmanı.
+
+Biçim (sürüm 2): tekrar eden metinler bir kez saklanır. Öğrenci adları, soru
+metinleri ve geri bildirim metinleri `defter.csv.sozluk` tablosuna içerik
+özetiyle (8 karakterlik blake2b kimliği) bir kez yazılır. Defter satırları
+yalnızca bu kimliklere başvurur; cevap metni ise önceden tanımlı bir sözlükle
+zlib ile sıkıştırılır (kısa cevaplar olduğu gibi kalır). Okurken metinler
+sözlükten geri açılır ve aynı metin için tek bir string nesnesi paylaşılır.
+Eski (tam metinli) defter.csv okunabilir; `hazirla()` onu yeni biçime dönüştürür.
+
+Kayıtlar bellekte önbelleğe alınır ve dosyaya eklenen satırlar yalnızca son
+okunan bayttan itibaren artımlı olarak ayrıştırılır. `sorgula()` filtre,
+sıralama ve imleç (keyset) tabanlı sayfalama sunar: sıralı dizin her veri
+sürümünde bir kez kurulur; bir sayfa, imlecin konumundan ikili arama ile
+başlayıp sayfa dolana kadar taranarak üretilir.
+"""
+import base64
+import binascii
+import bisect
+import csv
+import datetime
+import hashlib
+import io
+import json
+import logging
+import os
+import threading
+import zlib
+
+from veri_modeli import CevapKaydi, Zorluk, soru_ac, soru_sikistir
+
+logger = logging.getLogger(__name__)
+
+BASLIKLAR = ["zaman", "uid", "ad_soyad", "sinif", "soru", "cevap", "puan", "zorluk", "soru_no", "geri_bildirim"]
+DEPO_BASLIKLARI = ["zaman", "uid", "sinif", "ogrenci_id", "soru_id", "cevap_z", "puan", "zorluk", "soru_no", "geri_bildirim_id"]
+SOZLUK_BASLIKLARI = ["tur", "id", "metin"]
+DEFTER_ADI = "defter.csv"
+PARCA_DIZINI = "siniflar"  # sınıf parçaları: <veri dizini>/siniflar/<kod>/ (bkz. parcalar.py)
+SIRALAMA_ALANLARI = ("zaman", "puan", "ad_soyad", "sinif", "soru_no")
+# İmleçteki anahtarın her sıralama alanı için beklenen türü
+ANAHTAR_TURLERI = {"zaman": int, "puan": int, "ad_soyad": str, "sinif": str, "soru_no": int}
+TOPLU_DIZINLEME = 1024  # bundan çok yeni satır gelirse dizin ekleme yerine yeniden sıralanır
+AZAMI_SAYFA = 200
+
+# Sözlük türleri
+OGRENCI, SORU, GERI_BILDIRIM = "o", "s", "g"
+
+# Cevap sıkıştırmasında kullanılan ön sözlük: öğrencilerin sık yazdığı kelimeler.
+# DEĞİŞTİRİLMEMELİ: eski kayıtlar bu sözlükle açılır (yeni sözlük yeni bir işaretle eklenmeli).
+CEVAP_SOZLUGU = (
+    "rasyonel sayı kesir tam sayı pay payda paydaları eşitle genişlet sadeleştir "
+    "toplama çıkarma çarpma bölme ters çevir işlem sonuç sonucu eşittir elde edilir "
+    "bu yüzden çünkü dolayı yani için önce sonra adım olduğu için bulunur ile "
+).encode("utf-8")
+_SIKISTIRILMIS = "~"   # sıkıştırılmış cevap öneki (ardından base64)
+_KACIS = "\\"          # "~" ya da "\\" ile başlayan düz cevap öneki
+_SIKISTIRMA_ESIGI = 48   # bundan kısa cevaplar sıkıştırılmaz
+_ACILACAK = (_SIKISTIRILMIS, _KACIS)
+_ZORLUKLAR = tuple(Zorluk)
+_ZORLUK_ADLARI = tuple(z.metin for z in Zorluk)
+
+
+class SorguHatasi(ValueError):
+    """Geçersiz filtre, sıralama ya da imleç"""
+
+
+def metin_kimligi(tur: str, metin: str) -> str:
+    """Metnin içerik özetinden türetilen 8 karakterlik kimlik"""
+    ozet = hashlib.blake2b(f"{tur}:{metin}".encode("utf-8"), digest_size=6).digest()
+    return base64.urlsafe_b64encode(ozet).decode("ascii")
+
+
+def cevap_sikistir(metin: str) -> str:
+    if len(metin) >= _SIKISTIRMA_ESIGI:
+        z = zlib.compressobj(9, zlib.DEFLATED, -15, 9, zdict=CEVAP_SOZLUGU)
+        kod = _SIKISTIRILMIS + base64.b64encode(z.compress(metin.encode("utf-8")) + z.flush()).decode("ascii").rstrip("=")
+        if len(kod) < len(metin):
+            return kod
+    if metin.startswith((_SIKISTIRILMIS, _KACIS)):
+        return _KACIS + metin
+    return metin
+
+
+def cevap_ac(kod: str) -> str:
+    if kod.startswith(_SIKISTIRILMIS):
+        z = zlib.decompressobj(-15, zdict=CEVAP_SOZLUGU)
+        return (z.decompress(binascii.a2b_base64(kod[1:] + "=" * (-(len(kod) - 1) % 4))) + z.flush()).decode("utf-8")
+    if kod.startswith(_KACIS):
+        return kod[1:]
+    return kod
+
+
+def zaman_anahtari(zaman: str) -> int:
+    """'19-10-2026 14:05' → 202610191405 (sıralanabilir tamsayı); çözülemezse 0"""
+    try:
+        return int(zaman[6:10] + zaman[3:5] + zaman[0:2] + zaman[11:13] + zaman[14:16])
+    except (ValueError, TypeError):
+        return 0
+
+
+def tarih_anahtari(tarih: str, gun_sonu: bool = False) -> int:
+    """'2026-10-19' (HTML date input) → 202610190000 ya da gün sonu için 202610192359"""
+    try:
+        yil, ay, gun = (int(p) for p in tarih.split("-"))
+        datetime.date(yil, ay, gun)
+    except ValueError:
+        raise SorguHatasi(f"Geçersiz tarih: {tarih!r}")
+    return ((yil * 100 + ay) * 100 + gun) * 10000 + (2359 if gun_sonu else 0)
+
+
+def _tamsayi(deger) -> int:
+    try:
+        return int(float(deger))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _eski_kayit(satir: list) -> CevapKaydi:
+    satir = (satir + [""] * len(BASLIKLAR))[:len(BASLIKLAR)]
+    zaman, uid, ad_soyad, sinif, soru, cevap, puan, zorluk, soru_no, geri_bildirim = satir
+    return CevapKaydi(zaman, uid, ad_soyad, sinif, soru, cevap, _tamsayi(puan),
+                      Zorluk.coz(zorluk), _tamsayi(soru_no), geri_bildirim)
+
+
+def imlec_kodla(*konum) -> str:
+    """Sayfa konumunu (ör. [anahtar, sira]) URL'de taşınabilir bir metne çevirir"""
+    ham = json.dumps(list(konum), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(ham).decode("ascii").rstrip("=")
+
+
+def imlec_coz(imlec: str, uzunluk: int = 2, sirala: str = "zaman") -> tuple:
+    """imlec_kodla'nın tersi; son alan (dosya sırası) tamsayıdır.
+
+    İlk alan `sirala` alanının anahtarıdır; türü tutmayan (ör. sıralama değiştirilip
+    eski imleçle gelinen) imleç geçersizdir. Aradaki alanlar (parça kodu) metindir.
+    """
+    try:
+        ham = base64.urlsafe_b64decode(imlec + "=" * (-len(imlec) % 4))
+        konum = json.loads(ham)
+    except (ValueError, TypeError):
+        raise SorguHatasi("Geçersiz imleç")
+    if (not isinstance(konum, list) or len(konum) != uzunluk
+            or type(konum[0]) is not ANAHTAR_TURLERI[sirala]
+            or not all(type(k) is str for k in konum[1:-1])
+            or type(konum[-1]) is not int or konum[-1] < 0):
+        raise SorguHatasi("Geçersiz imleç")
+    return tuple(konum)
+
+
+def defter_yollari(yol: str) -> list:
+    """Bir defter dosyası ya da veri dizini için okunacak tüm defter dosyaları.
+
+    Dizin verilirse kökteki defter ile sınıf parçalarının (siniflar/*/) defterleri döner.
+    """
+    if not os.path.isdir(yol):
+        return [yol]
+    yollar = [os.path.join(yol, DEFTER_ADI)]
+    parcalar = os.path.join(yol, PARCA_DIZINI)
+    if os.path.isdir(parcalar):
+        yollar += [os.path.join(parcalar, ad, DEFTER_ADI) for ad in sorted(os.listdir(parcalar))]
+    return [y for y in yollar if os.path.exists(y)]
+
+
+def _kayitlar_sonu(ham: bytes) -> int:
+    """`ham` içinde son tamamlanmış CSV kaydının bittiği konum.
+
+    Tırnak içindeki satır sonları (çok satırlı cevaplar) kaydı bitirmez: kayıt,
+    başından beri tırnak sayısı çift olan ilk satır sonunda biter.
+    """
+    son = bas = tirnak = 0
+    while True:
+        i = ham.find(b"\n", bas)
+        if i < 0:
+            return son
+        tirnak += ham.count(b'"', bas, i)
+        bas = i + 1
+        if not tirnak % 2:
+            son = bas
+
+
+def _yarim_kaydi_kes(yol: str, gecerli: int):
+    """Çökmede yarım kalmış son kaydı siler; yoksa eklenen satır ona yapışırdı.
+
+    `gecerli` son tamamlanmış kaydın bittiği konumdur (Defter'in okuma ofseti).
+    """
+    try:
+        with open(yol, "rb+") as f:
+            son = f.seek(0, os.SEEK_END)
+            if son > gecerli:
+                logger.warning("%s: yarım kalmış son kayıt silindi (%d bayt)", yol, son - gecerli)
+                f.truncate(gecerli)
+    except FileNotFoundError:
+        pass
+
+
+def _csv_yaz(yol: str, satirlar, yeni: bool = False, gecerli: int = None):
+    if gecerli is not None:
+        _yarim_kaydi_kes(yol, gecerli)
+    with open(yol, "w" if yeni else "a", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerows(satirlar)
+
+
+class Defter:
+    """Tek bir defter (kayıt dosyası + sözlük tablosu); okuma önbelleği ve yazma kilidi içerir"""
+
+    def __init__(self, yol: str):
+        self.yol = yol
+        self.sozluk_yolu = yol + ".sozluk"
+        self._kilit = threading.RLock()
+        self._sifirla()
+
+    def _sifirla(self):
+        self._kayitlar = []
+        self._zamanlar = []
+        self._ofset = 0
+        self._sozluk_ofset = 0
+        self._sozluk = {}      # id -> açılmış metin
+        self._eski_bicim = False
+        self._dizinler = {}    # (alan, bölüm alanı) -> {bölüm değeri: [(anahtar, sira), ...]}
+
+    # ---------- yazma ----------
+    def _bicim(self):
+        """'yok', 'eski' ya da 'yeni' (başlık satırına göre)"""
+        if not os.path.exists(self.yol) or os.path.getsize(self.yol) == 0:
+            return "yok"
+        with open(self.yol, newline="", encoding="utf-8-sig") as f:
+            baslik = next(csv.reader(f), [])
+        return "yeni" if "soru_id" in baslik else "eski"
+
+    def hazirla(self):
+        """Dosya yoksa oluşturur; eski (tam metinli) defteri yeni biçime dönüştürür"""
+        with self._kilit:
+            bicim = self._bicim()
+            if bicim == "yok":
+                _csv_yaz(self.yol, [DEPO_BASLIKLARI], yeni=True)
+                if not os.path.exists(self.sozluk_yolu):
+                    _csv_yaz(self.sozluk_yolu, [SOZLUK_BASLIKLARI], yeni=True)
+            elif bicim == "eski":
+                self._donustur()
+
+    def _donustur(self):
+        eski_boyut = os.path.getsize(self.yol)
+        kayitlar = list(self.kayitlar())
+        gecici = self.yol + ".tmp"
+        self._sifirla()
+        bilinen = set()
+        sozluk, satirlar = [SOZLUK_BASLIKLARI], [DEPO_BASLIKLARI]
+        for k in kayitlar:
+            sozluk_satirlari, satir = self._satir_kodla(k, bilinen)
+            bilinen.update(kimlik for _, kimlik, _ in sozluk_satirlari)
+            sozluk.extend(sozluk_satirlari)
+            satirlar.append(satir)
+        _csv_yaz(self.sozluk_yolu + ".tmp", sozluk, yeni=True)
+        _csv_yaz(gecici, satirlar, yeni=True)
+        os.replace(self.yol, self.yol + ".eski")
+        os.replace(self.sozluk_yolu + ".tmp", self.sozluk_yolu)
+        os.replace(gecici, self.yol)
+        self._sifirla()
+        logger.info("defter dönüştürüldü: %d kayıt, %.0f KiB → %.0f KiB (eski dosya %s.eski)",
+                    len(kayitlar), eski_boyut / 1024,
+                    (os.path.getsize(self.yol) + os.path.getsize(self.sozluk_yolu)) / 1024, self.yol)
+
+    @staticmethod
+    def _satir_kodla(kayit: CevapKaydi, bilinen):
+        """(yeni sözlük satırları, defter satırı) döndürür; `bilinen`de olmayan kimlikler yeni sayılır"""
+        yeni = []
+        kimlikler = []
+        for tur, metin in ((OGRENCI, kayit.ad_soyad), (SORU, soru_sikistir(kayit.soru)),
+                           (GERI_BILDIRIM, kayit.geri_bildirim)):
+            kimlik = metin_kimligi(tur, metin)
+            if kimlik not in bilinen:
+                yeni.append([tur, kimlik, metin])
+            kimlikler.append(kimlik)
+        ogrenci_id, soru_id, geri_bildirim_id = kimlikler
+        satir = [kayit.zaman, kayit.uid, kayit.sinif, ogrenci_id, soru_id, cevap_sikistir(kayit.cevap),
+                 kayit.puan, int(kayit.zorluk), kayit.soru_no, geri_bildirim_id]
+        return yeni, satir
+
+    def ekle(self, kayit: CevapKaydi):
+        with self._kilit:
+            self._tazele()
+            if self._ofset == 0 or self._eski_bicim:
+                self.hazirla()
+                self._tazele()
+            self._sozlugu_tazele()
+            yeni, satir = self._satir_kodla(kayit, self._sozluk)
+            # Önce sözlük: satır diske düştüğünde başvurduğu metinler mutlaka vardır.
+            # Yazmadan önce son tam kaydın ötesindeki (çökmede yarım kalmış) baytlar silinir.
+            if yeni:
+                _csv_yaz(self.sozluk_yolu, yeni, gecerli=self._sozluk_ofset)
+                self._sozlugu_tazele()
+            _csv_yaz(self.yol, [satir], gecerli=self._ofset)
+
+    # ---------- okuma ----------
+    def _sozlugu_tazele(self):
+        try:
+            boyut = os.path.getsize(self.sozluk_yolu)
+        except OSError:
+            return
+        if boyut <= self._sozluk_ofset:
+            return
+        with open(self.sozluk_yolu, "rb") as f:
+            f.seek(self._sozluk_ofset)
+            ham = f.read(boyut - self._sozluk_ofset)
+        # Yalnızca tamamlanmış kayıtlar okunur; yarım kalan son kayıt (çökme) ofsetin ötesinde kalır
+        son = _kayitlar_sonu(ham)
+        if not son:
+            return
+        okuyucu = csv.reader(io.StringIO(ham[:son].decode("utf-8-sig", errors="replace"), newline=""))
+        for satir in okuyucu:
+            if len(satir) != 3:
+                continue
+            tur, kimlik, deger = satir
+            # Kimlik metnin özetidir: kesilmiş ya da bozulmuş metin kabul edilmez (başlık da elenir)
+            if metin_kimligi(tur, deger) != kimlik:
+                continue
+            self._sozluk[kimlik] = soru_ac(deger) if tur == SORU else deger
+        self._sozluk_ofset += son
+
+    def _tazele(self):
+        """Dosyaya son okumadan beri eklenen satırları önbelleğe alır"""
+        try:
+            boyut = os.path.getsize(self.yol)
+        except OSError:
+            boyut = 0
+        if boyut < self._ofset:  # Dosya kısaldı / değiştirildi: baştan oku
+            self._sifirla()
+        if boyut == self._ofset:
+            return
+        ilk = len(self._kayitlar)
+        with open(self.yol, "rb") as f:
+            f.seek(self._ofset)
+            ham = f.read(boyut - self._ofset)
+        # Yarım kalan son kayıt okunmaz; ofset onun başında kalır (bir sonraki ekleme onu siler)
+        son = _kayitlar_sonu(ham)
+        if not son:
+            return
+        ham = ham[:son]
+        metin = ham.decode("utf-8-sig" if self._ofset == 0 else "utf-8", errors="replace")
+        okuyucu = csv.reader(io.StringIO(metin, newline=""))
+        if self._ofset == 0:
+            baslik = next(okuyucu, [])
+            self._eski_bicim = "soru_id" not in baslik
+        ekle, zamanlar = self._kayitlar.append, self._zamanlar.append
+        if self._eski_bicim:
+            for satir in okuyucu:
+                if satir:
+                    kayit = _eski_kayit(satir)
+                    ekle(kayit)
+                    zamanlar(zaman_anahtari(kayit.zaman))
+        else:
+            self._sozlugu_tazele()
+            sozluk, zorluklar, alan_sayisi = self._sozluk.get, _ZORLUKLAR, len(DEPO_BASLIKLARI)
+            for satir in okuyucu:
+                if len(satir) != alan_sayisi:
+                    continue
+                zaman, uid, sinif, ogrenci_id, soru_id, cevap_z, puan, zorluk, soru_no, geri_bildirim_id = satir
+                if cevap_z[:1] in _ACILACAK:
+                    cevap_z = cevap_ac(cevap_z)
+                ekle(CevapKaydi(zaman, uid, sozluk(ogrenci_id, ""), sinif, sozluk(soru_id, ""),
+                                cevap_z, int(puan), zorluklar[int(zorluk)], int(soru_no),
+                                sozluk(geri_bildirim_id, "")))
+                zamanlar(zaman_anahtari(zaman))
+        self._ofset += son
+        self._dizinlere_ekle(ilk)
+
+    def kayitlar(self) -> list:
+        """Tüm kayıtlar (dosyadaki sırayla); dönen liste değiştirilmemelidir"""
+        with self._kilit:
+            self._tazele()
+            return self._kayitlar
+
+    def veri_cercevesi(self):
+        """Admin raporları için pandas DataFrame (pandas burada tembel yüklenir)"""
+        import pandas as pd
+
+        return pd.DataFrame([k.sozluk() for k in self.kayitlar()], columns=BASLIKLAR)
+
+    # ---------- sorgu ----------
+    def _anahtar(self, alan: str, i: int):
+        if alan == "zaman":
+            return self._zamanlar[i]
+        return getattr(self._kayitlar[i], alan)
+
+    def _bolum(self, bolum, i: int):
+        return getattr(self._kayitlar[i], bolum) if bolum else None
+
+    def _dizin(self, alan: str, bolum=None, deger=None) -> list:
+        """[(anahtar, sira), ...] — alan değerine, eşitlikte dosya sırasına göre sıralı.
+
+        `bolum` ("uid" ya da "sinif") verilirse yalnızca o alanı `deger` olan kayıtlar;
+        filtreli sayfalar böylece tüm defteri taramaz. Dizin ilk istekte kurulur, sonra
+        her yeni satırda artımlı güncellenir.
+        """
+        bolumler = self._dizinler.get((alan, bolum))
+        if bolumler is None:
+            bolumler = {}
+            for i in range(len(self._kayitlar)):
+                bolumler.setdefault(self._bolum(bolum, i), []).append((self._anahtar(alan, i), i))
+            for dizin in bolumler.values():
+                dizin.sort()
+            self._dizinler[(alan, bolum)] = bolumler
+        return bolumler.get(deger, [])
+
+    def _dizinlere_ekle(self, ilk: int):
+        """`ilk` sırasından sonra okunan kayıtları kurulmuş dizinlere işler"""
+        son = len(self._kayitlar)
+        for (alan, bolum), bolumler in self._dizinler.items():
+            degisen = set()
+            for i in range(ilk, son):
+                girdi = (self._anahtar(alan, i), i)
+                deger = self._bolum(bolum, i)
+                dizin = bolumler.setdefault(deger, [])
+                if son - ilk > TOPLU_DIZINLEME:
+                    dizin.append(girdi)
+                    degisen.add(deger)
+                elif not dizin or girdi > dizin[-1]:
+                    dizin.append(girdi)  # zamana göre eklenen satırlar çoğunlukla sona düşer
+                else:
+                    bisect.insort(dizin, girdi)
+            for deger in degisen:
+                bolumler[deger].sort()
+
+    def sorgula(self, sinif=None, uid=None, zorluk=None, baslangic=None, bitis=None,
+                min_puan=None, max_puan=None, sirala="zaman", azalan=False,
+                limit=50, imlec=None) -> dict:
+        """Filtrelenmiş, sıralı bir sayfa döndürür: {"kayitlar": [...], "sonraki": imlec|None}
+
+        `baslangic` / `bitis` 'YYYY-AA-GG' biçimindedir ve uçlar dahildir.
+        """
+        sorgu = sorgu_hazirla(sinif, uid, zorluk, baslangic, bitis, min_puan, max_puan, sirala, limit)
+        konum = imlec_coz(imlec, sirala=sorgu["sirala"]) if imlec else None
+        sayfa, devam = self.sayfa(sorgu, azalan, konum)
+        return {"kayitlar": [k.sozluk() for _, _, k in sayfa],
+                "sonraki": imlec_kodla(*sayfa[-1][:2]) if devam else None}
+
+    def sayfa(self, sorgu: dict, azalan: bool, konum=None):
+        """Ham sayfa: ([(anahtar, sira, CevapKaydi), ...], devam_var_mi).
+
+        `konum` (anahtar, sira) verilirse sıralamada ondan sonra gelen kayıtlarla başlar.
+        """
+        sinif, uid, zorluk = sorgu["sinif"], sorgu["uid"], sorgu["zorluk"]
+        alt_zaman, ust_zaman = sorgu["alt_zaman"], sorgu["ust_zaman"]
+        min_puan, max_puan, limit = sorgu["min_puan"], sorgu["max_puan"], sorgu["limit"]
+
+        with self._kilit:
+            self._tazele()
+            if uid:
+                dizin = self._dizin(sorgu["sirala"], "uid", uid)
+            elif sinif:
+                dizin = self._dizin(sorgu["sirala"], "sinif", sinif)
+            else:
+                dizin = self._dizin(sorgu["sirala"])
+            kayitlar, zamanlar = self._kayitlar, self._zamanlar
+
+            # Zamana göre sıralıyken tarih aralığı dizinde ikili aramayla daraltılır
+            alt_j, ust_j = 0, len(dizin)
+            if sorgu["sirala"] == "zaman":
+                if alt_zaman is not None:
+                    alt_j = bisect.bisect_left(dizin, (alt_zaman, -1))
+                if ust_zaman is not None:
+                    ust_j = bisect.bisect_right(dizin, (ust_zaman, float("inf")))
+
+            if azalan:
+                baslangic_i = ust_j if konum is None else min(ust_j, bisect.bisect_left(dizin, konum))
+                baslangic_i, adim, bitis_i = baslangic_i - 1, -1, alt_j - 1
+            else:
+                baslangic_i = alt_j if konum is None else max(alt_j, bisect.bisect_right(dizin, konum))
+                adim, bitis_i = 1, ust_j
+
+            sayfa = []
+            for j in range(baslangic_i, bitis_i, adim):
+                anahtar, i = dizin[j]
+                k = kayitlar[i]
+                if sinif and k.sinif != sinif:
+                    continue
+                if uid and k.uid != uid:
+                    continue
+                if zorluk is not None and k.zorluk != zorluk:
+                    continue
+                if alt_zaman is not None and zamanlar[i] < alt_zaman:
+                    continue
+                if ust_zaman is not None and zamanlar[i] > ust_zaman:
+                    continue
+                if min_puan is not None and k.puan < min_puan:
+                    continue
+                if max_puan is not None and k.puan > max_puan:
+                    continue
+                if len(sayfa) == limit:
+                    return sayfa, True
+                sayfa.append((anahtar, i, k))
+            return sayfa, False
+
+
+def sorgu_hazirla(sinif=None, uid=None, zorluk=None, baslangic=None, bitis=None,
+                  min_puan=None, max_puan=None, sirala="zaman", limit=50) -> dict:
+    """Sorgu parametrelerini doğrular ve Defter.sayfa() için normalleştirir"""
+    if sirala not in SIRALAMA_ALANLARI:
+        raise SorguHatasi(f"Sıralama alanı şunlardan biri olmalı: {', '.join(SIRALAMA_ALANLARI)}")
+    if zorluk and str(zorluk).strip().lower() not in _ZORLUK_ADLARI:
+        raise SorguHatasi(f"Zorluk şunlardan biri olmalı: {', '.join(_ZORLUK_ADLARI)}")
+    for ad, puan in (("min_puan", min_puan), ("max_puan", max_puan)):
+        if puan is not None and not 0 <= puan <= 100:
+            raise SorguHatasi(f"{ad} 0 ile 100 arasında olmalı")
+    if not 1 <= limit <= AZAMI_SAYFA:
+        raise SorguHatasi(f"limit 1 ile {AZAMI_SAYFA} arasında olmalı")
+    return {
+        "sinif": sinif, "uid": uid,
+        "zorluk": Zorluk.coz(zorluk) if zorluk else None,
+        "alt_zaman": tarih_anahtari(baslangic) if baslangic else None,
+        "ust_zaman": tarih_anahtari(bitis, gun_sonu=True) if bitis else None,
+        "min_puan": min_puan, "max_puan": max_puan,
+        "sirala": sirala, "limit": limit,
+    }
@@ -0,0 +1,224 @@
+"""Öğrenci durumu deposu: önce-yaz günlüğü (WAL), anlık görüntü ve sıkıştırma.
+
+Her profil değişikliği (kayıt, soru verildi, cevap puanlandı) günlük dosyasına
+tek satır olarak eklenir ve fsync edilir; ogrenciler.json her yazmada baştan
+yazılmaz. Belirli sayıda kayıttan sonra tüm durum geçici bir dosyaya yazılıp
+atomik olarak (os.replace) ogrenciler.json'un yerine konur ve günlük boşaltılır.
+
+Açılışta son anlık görüntü okunur ve yalnızca ondan sonraki günlük kayıtları
+yeniden oynatılır; kurtarma süresi geçmişin tamamıyla değil, kuyrukla orantılıdır.
+Yarım kalmış son satır (çökme anında yazılan) sağlama toplamıyla tespit edilip atılır.
+
+Depo tek bir sürecin sahipliğindedir (Flask'ın çok iş parçacıklı sunucusu gibi);
+aynı dosyaları birden çok süreç aynı anda açmamalıdır.
+"""
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+import zlib
+
+import adaptif
+from veri_modeli import COZUM_HATALARI, Ogrenci, SoruDenemesi, anlik_coz, ogrencileri_serilestir
+
+logger = logging.getLogger(__name__)
+
+ANLIK_ARALIGI = 500  # Bu kadar günlük kaydından sonra anlık görüntü alınır
+
+# Günlük kayıt türleri
+KAYIT = "k"
+SORU = "s"
+CEVAP = "c"
+
+
+def _satir_kodla(sira: int, tur: str, uid: str, veri) -> bytes:
+    govde = json.dumps([sira, tur, uid, veri], ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return b"%08x %s\n" % (zlib.crc32(govde), govde)
+
+
+def _satir_coz(satir: bytes):
+    """Geçerli bir satırı (sira, tur, uid, veri) olarak döndürür; bozuksa None"""
+    if not satir.endswith(b"\n") or len(satir) < 10:
+        return None
+    crc, govde = satir[:8], satir[9:-1]
+    try:
+        if int(crc, 16) != zlib.crc32(govde):
+            return None
+        return tuple(json.loads(govde))
+    except ValueError:
+        return None
+
+
+class OgrenciDeposu:
+    def __init__(self, anlik_yolu: str, gunluk_yolu: str, anlik_araligi: int = ANLIK_ARALIGI, fsync: bool = True):
+        self.anlik_yolu = anlik_yolu
+        self.gunluk_yolu = gunluk_yolu
+        self.anlik_araligi = anlik_araligi
+        self.fsync = fsync
+        self._kilit = threading.RLock()
+        self._ogrenciler = None
+        self._sira = 0
+        self._gunluk = None
+        self._bekleyen = 0  # son anlık görüntüden beri yazılan günlük kaydı
+
+    @property
+    def acik(self) -> bool:
+        """Günlük dosyası açık mı (kapat() sonrası ilk erişimde yeniden açılır)"""
+        return self._gunluk is not None
+
+    # ---------- açılış / kurtarma ----------
+    def ac(self) -> dict:
+        """Anlık görüntüyü yükler, günlüğün kuyruğunu yeniden oynatır; {uid: Ogrenci} döndürür"""
+        with self._kilit:
+            if self._ogrenciler is not None:
+                return self._ogrenciler
+            t = time.perf_counter()
+            self._sira, self._ogrenciler = self._anlik_oku()
+            # Eski kayıtların istatistikleri burada, kilit altında kurulur; böylece okuma
+            # yolundaki istatistik_hazirla (ör. ön üretim iş parçacığı) profili değiştirmez
+            for profil in self._ogrenciler.values():
+                adaptif.istatistik_hazirla(profil)
+            anlik_sirasi = self._sira
+            oynatilan = self._gunlugu_oynat(anlik_sirasi)
+            self._gunluk = open(self.gunluk_yolu, "ab")
+            self._bekleyen = oynatilan
+            logger.info("Öğrenci deposu açıldı: %d öğrenci, %d günlük kaydı oynatıldı (%.1f ms)",
+                        len(self._ogrenciler), oynatilan, (time.perf_counter() - t) * 1000)
+            return self._ogrenciler
+
+    def _anlik_oku(self):
+        if not os.path.exists(self.anlik_yolu):
+            return 0, {}
+        yedek = f"{self.anlik_yolu}.bozuk-{time.strftime('%Y%m%d%H%M%S')}"
+        atlanan = []
+        try:
+            with open(self.anlik_yolu, encoding="utf-8-sig") as f:
+                sira, ogrenciler = anlik_coz(f.read(), atlanan)
+        except COZUM_HATALARI as e:
+            # Sessizce sıfırlamak yerine bozuk dosyayı kenara al; günlükteki kayıtlar yine de kurtarılır
+            os.replace(self.anlik_yolu, yedek)
+            logger.critical("Anlık görüntü okunamadı (%s); %s olarak saklandı, yalnızca günlükten kurtarılıyor.", e, yedek)
+            return 0, {}
+        if atlanan:
+            # Yalnızca bozuk öğrenci satırları atlanır; sonraki anlık görüntü onları içermeyeceği için
+            # dosyanın bu hali kenarda saklanır
+            shutil.copy2(self.anlik_yolu, yedek)
+            for uid, e in atlanan:
+                logger.critical("Anlık görüntüdeki %s öğrencisi okunamadı: %r", uid, e)
+            logger.critical("%d bozuk öğrenci satırı atlandı; dosyanın kopyası %s", len(atlanan), yedek)
+        return sira, ogrenciler
+
+    def _gunlugu_oynat(self, anlik_sirasi: int) -> int:
+        if not os.path.exists(self.gunluk_yolu):
+            return 0
+        oynatilan = 0
+        gecerli_uzunluk = 0
+        with open(self.gunluk_yolu, "rb") as f:
+            for satir in f:
+                kayit = _satir_coz(satir)
+                if kayit is None:
+                    break
+                gecerli_uzunluk += len(satir)
+                sira, tur, uid, veri = kayit
+                if sira <= anlik_sirasi:
+                    continue  # anlık görüntü alındı ama günlük boşaltılamadan çökülmüş
+                self._sira = sira
+                try:
+                    self._uygula(tur, uid, veri)
+                except COZUM_HATALARI as e:
+                    # Ör. anlık görüntü kaybolduysa daha önce kaydolmuş öğrencinin kayıtları
+                    logger.error("Günlük kaydı %d uygulanamadı (%s %s): %r", sira, tur, uid, e)
+                    continue
+                oynatilan += 1
+        if gecerli_uzunluk < os.path.getsize(self.gunluk_yolu):
+            logger.warning("Günlüğün sonunda yarım kalmış kayıt atıldı (%s)", self.gunluk_yolu)
+            with open(self.gunluk_yolu, "r+b") as f:
+                f.truncate(gecerli_uzunluk)
+        return oynatilan
+
+    # ---------- değişiklikler ----------
+    def _uygula(self, tur: str, uid: str, veri):
+        if tur == KAYIT:
+            profil = Ogrenci.satirdan(veri)
+            adaptif.istatistik_hazirla(profil)
+            self._ogrenciler[uid] = profil
+            return
+        profil = self._ogrenciler[uid]
+        if tur == SORU:
+            profil.gecmis_sorular.append(SoruDenemesi.satirdan(veri))
+        elif tur == CEVAP:
+            son = profil.gecmis_sorular[-1]
+            son.puan = veri
+            profil.gecmis_puanlar.append(veri)
+            adaptif.guncelle(profil.istatistik, veri, son.islem)
+            profil.soru_sayisi += 1
+
+    def _yaz(self, tur: str, uid: str, veri):
+        """Kaydı önce günlüğe yazar (kalıcı hale getirir), sonra bellekte uygular"""
+        self.ac()
+        self._sira += 1
+        self._gunluk.write(_satir_kodla(self._sira, tur, uid, veri))
+        self._gunluk.flush()
+        if self.fsync:
+            os.fsync(self._gunluk.fileno())
+        self._uygula(tur, uid, veri)
+        self._bekleyen += 1
+        if self._bekleyen >= self.anlik_araligi:
+            self.anlik_al()
+
+    def kaydet(self, uid: str, ogrenci: Ogrenci):
+        with self._kilit:
+            self._yaz(KAYIT, uid, ogrenci.satir())
+
+    def soru_ekle(self, uid: str, deneme: SoruDenemesi) -> SoruDenemesi:
+        """Soruyu profile ekler; aynı numaralı soru zaten verilmişse onu döndürür"""
+        with self._kilit:
+            profil = self.ac()[uid]
+            if profil.gecmis_sorular and profil.gecmis_sorular[-1].soru_no == deneme.soru_no:
+                return profil.gecmis_sorular[-1]
+            self._yaz(SORU, uid, deneme.satir())
+            return profil.gecmis_sorular[-1]
+
+    def cevap_isle(self, uid: str, puan: int) -> bool:
+        """Son verilen soruyu puanlar; puanlanacak açık soru yoksa False döner"""
+        with self._kilit:
+            profil = self.ac()[uid]
+            if len(profil.gecmis_sorular) <= profil.soru_sayisi:
+                return False
+            self._yaz(CEVAP, uid, int(puan))
+            return True
+
+    # ---------- okuma ----------
+    def getir(self, uid: str):
+        with self._kilit:
+            return self.ac().get(uid)
+
+    def ogrenciler(self) -> dict:
+        with self._kilit:
+            return dict(self.ac())
+
+    # ---------- anlık görüntü / sıkıştırma ----------
+    def anlik_al(self):
+        """Tüm durumu atomik olarak ogrenciler.json'a yazar ve günlüğü boşaltır"""
+        with self._kilit:
+            self.ac()
+            gecici = self.anlik_yolu + ".tmp"
+            with open(gecici, "w", encoding="utf-8") as f:
+                f.write(ogrencileri_serilestir(self._ogrenciler, self._sira))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(gecici, self.anlik_yolu)
+            # Buradan sonra çökülürse günlükteki eski kayıtlar sıra numarasıyla atlanır
+            self._gunluk.truncate(0)
+            self._gunluk.seek(0)
+            self._bekleyen = 0
+
+    def kapat(self):
+        with self._kilit:
+            if self._gunluk is not None:
+                self.anlik_al()
+                self._gunluk.close()
+                self._gunluk = None
+                self._ogrenciler = None
@@ -0,0 +1,443 @@
+"""Soru motoru, puanlama ve zorluk seçimi için fark (differential) ve özellik doğrulaması.
+
+Hızlandırılmış gerçekleştirmeler, değiştirilmeden saklanan referans kopyalarıyla
+aynı girdiler üzerinde yan yana çalıştırılır:
+
+* puanlama: puanla_akilli ile puanla_referans aynı puanı, seviyeyi ve geri
+  bildirimi vermeli.
+* soru: işlem ve zorluk verilmeden rasyonel_soru_uret_motoru, aynı tohumla ilk
+  sürümdeki üreteçle (soru_referans) aynı soruyu üretmeli; kalibrasyon yokken
+  zorluk soruyu değiştirmemeli. Her soru ayrıca geçerli olmalı: metindeki sonuç
+  Fraction ile hesaplanana eşit, payda ≤ 12, pay -10..10 aralığında, istenen
+  işlem kullanılmış.
+* zorluk: cevap başına artımlı güncellenen istatistiklerle seçilen zorluk
+  (zorluk_belirle_akilli), aynı geçmişten baştan kurulan istatistiklerle
+  seçilenle aynı olmalı.
+* hesap: sayısal denetim (sayisal.py) adım adım yazılmış doğru çözüme (önce
+  yanlış sonuç yazılıp düzeltilmiş olsa da) tam puan vermeli, sonucu yanlış
+  yazılmış çözümü yakalamalı, yalnızca soruyu kopyalayan cevaba puan vermemeli;
+  rastgele cevaplarda puan 0-100 aralığında kalmalı. (puanlama denetimi beklenen sonuç verilmeyen yolu
+  kapsar; o yolda puanlar referansla birebir aynı kalır.)
+
+Girdiler tohumlu parçalara bölünüp süreç havuzunda çalıştırılır; aynı tohum aynı
+girdileri üretir, böylece bulunan her fark tekrar üretilebilir. Referans kopyaların
+algoritması değiştirilmemelidir: yeni bir hızlandırma onlara göre doğrulanır.
+puanla_referans yalnızca saf SequenceMatcher oranlarını ve parça içinde tekrar eden
+cevapları önbelleğe alır.
+
+Varsayılan olarak her denetim türü 20.000 girdiyle çalışır (VARSAYILAN_ADET); bu, tek
+çekirdekte yaklaşık 6 dakika sürer. Darboğaz puanlama ve hesap denetimleridir (çekirdek
+başına saniyede ~120 girdi); soru ve zorluk denetimleri bunun 20-100 katı hızlıdır.
+Milyonluk tam ölçekli tarama --adet ile açıkça istenir; dört türün her biri için bir
+milyon girdi toplam 4-5 çekirdek-saattir (32 çekirdekte ~10, 8 çekirdekte ~40 dakika):
+
+    python dogrulama.py [--adet 20000] [--isci N] [--tohum 0] [--sadece puanlama,soru,zorluk,hesap]
+    python dogrulama.py --adet 1000000 --isci $(nproc)      # tam ölçekli tarama
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+import unicodedata
+from difflib import SequenceMatcher
+from fractions import Fraction
+from functools import lru_cache
+from math import gcd
+from multiprocessing import Pool
+
+PARCA = 2000  # işçiye bir seferde verilen girdi sayısı
+VARSAYILAN_ADET = 20_000  # tür başına; tek çekirdekte ~6 dakika (tam ölçek için --adet 1000000)
+PAYDA_SINIRI = 12
+PAY_SINIRI = 10
+ORNEK_HATA = 5  # tür başına raporlanan en fazla hata
+
+
+# ============= REFERANS GERÇEKLEŞTİRMELER (DEĞİŞTİRMEYİN) =============
+def _temizle_referans(metin):
+    return ''.join(c for c in unicodedata.normalize('NFD', metin)
+                  if unicodedata.category(c) != 'Mn')
+
+@lru_cache(maxsize=1 << 17)
+def _oran_referans(terim, kelime):
+    # Saf fonksiyon; önbellek sonucu değiştirmez, yalnızca tekrar eden çiftleri atlar
+    return SequenceMatcher(None, terim, kelime).ratio()
+
+def puanla_referans(ogrenci_cevabi, soru_metni):
+    """puanla_akilli'nin hızlandırma öncesi hali (SequenceMatcher her kelime çiftinde)"""
+    # 1. Temizlik ve Normalizasyon
+    cevap_orijinal = ogrenci_cevabi.lower().strip()
+    cevap_norm = _temizle_referans(cevap_orijinal)
+
+    # Cevap yoksa
+    if not cevap_norm or len(cevap_norm) < 3:
+        return {
+            "toplam": 0, "seviye": "cevap_yok", "max_puan": 100,
+            "geri_bildirim": "Henüz bir cevap yazmadın."
+        }
+
+    puan = 0
+    # --- 1. ÇABA PUANI (20 Puan) ---
+    puan += 20
+
+    # --- 2. MATEMATİKSEL TERİM PUANI (60 Puan) ---
+
+    # Konuya göre anahtar kelimeler
+    rasyonel_kelimeler = ["payda", "pay", "esitle", "genislet", "sadelestir", "kesir", "tam sayi", "toplam", "cikar", "bolum"]
+    cebir_kelimeler = ["degisken", "bilinmeyen", "x", "katsayi", "terim", "benzer", "parantez", "dagilma"]
+    mantik_kelimeler = ["cunku", "bu yuzden", "dolayi", "esittir", "sonuc", "elde edilir", "yani"]
+
+    # Eskiden kalan geometri kelimeleri
+    geo_kelimeler = ["hipotenus", "pisagor", "dik", "kare"]
+
+    tum_kelimeler = rasyonel_kelimeler + cebir_kelimeler + mantik_kelimeler + geo_kelimeler
+
+    bulunan_kelimeler = []
+
+    for k in tum_kelimeler:
+        if k in cevap_norm:
+            bulunan_kelimeler.append(k)
+        else:
+            for kelime in cevap_norm.split():
+                if _oran_referans(k, kelime) > 0.80:
+                    bulunan_kelimeler.append(k)
+                    break
+
+    benzersiz_kelime_sayisi = len(set(bulunan_kelimeler))
+
+    if benzersiz_kelime_sayisi >= 1: puan += 20
+    if benzersiz_kelime_sayisi >= 3: puan += 20
+    if benzersiz_kelime_sayisi >= 5: puan += 20
+
+    # --- 3. MANTIK VE UZUNLUK PUANI (20 Puan) ---
+    if len(cevap_norm.split()) > 5:
+        puan += 10
+    if "cunku" in cevap_norm or "yuzden" in cevap_norm or "icin" in cevap_norm:
+        puan += 10
+
+    # Maksimum Puan Kontrolü
+    if puan > 100: puan = 100
+
+    # --- Geri Bildirim Oluşturma (Geliştirilmiş) ---
+
+    # Detaylı geri bildirim için ipuçları
+    eksik_terimler = [k for k in rasyonel_kelimeler if k not in cevap_norm]
+
+    if puan >= 85:
+        seviye = "mükemmel"
+        mesaj = "Mükemmel! Matematiksel dil ve mantık yürütme becerin çok yüksek. Devam et!"
+    elif puan >= 65: # Hassaslaştırılmış eşik
+        seviye = "iyi"
+        mesaj = "Çok iyi! Mantık yürütmen doğru ancak daha fazla matematiksel terim kullanabilirsin. Cevabını daha resmi bir dille yazmayı dene."
+    elif puan >= 40:
+        seviye = "orta"
+        mesaj = f"Gelişmekte. Cevabında {' '.join(bulunan_kelimeler)} gibi terimler var. Ancak daha fazla adım ve sebep-sonuç ilişkisi kurmalısın. Özellikle rasyonel sayılarla ilgili şu terimleri kullanmayı dene: {', '.join(eksik_terimler[:3])}."
+    else:
+        seviye = "yetersiz"
+        mesaj = "Yetersiz. Cevabını adım adım, matematiksel terimler (payda, pay, eşitleme) kullanarak ve 'çünkü' ile sebep belirterek tekrar yazmalısın."
+
+    return {
+        "toplam": int(puan),
+        "seviye": seviye,
+        "max_puan": 100,
+        "geri_bildirim": mesaj
+    }
+
+def soru_referans():
+    """rasyonel_soru_uret_motoru'nun ilk sürümü (işlem ve zorluk seçimi öncesi; modül düzeyindeki random ile)"""
+    payda_limit = 12
+    islemler = ['+', '-', '*', '/']
+
+    while True:
+        op = random.choice(islemler)
+        s1 = Fraction(random.randint(-5, 5), random.randint(2, 6))
+        s2 = Fraction(random.randint(-5, 5), random.randint(2, 6))
+
+        if s1 == 0: s1 = Fraction(1, 2)
+        if s2 == 0: s2 = Fraction(1, 3)
+
+        if op == '+':
+            sonuc = s1 + s2
+        elif op == '-':
+            sonuc = s1 - s2
+        elif op == '*':
+            sonuc = s1 * s2
+        elif op == '/':
+            if s2 == 0: continue
+            sonuc = s1 / s2
+
+        if sonuc.denominator <= payda_limit and -10 <= sonuc.numerator <= 10:
+            return f"({s1}) {op} ({s2}) işleminin sonucunun neden {sonuc} olduğunu adım adım açıkla."
+
+
+# ============= GİRDİ ÜRETİCİLERİ =============
+KELIME_HAVUZU = [
+    "payda", "pay", "paydaları", "eşitle", "eşitledim", "genişlet", "sadeleştir", "kesir", "kesirler",
+    "tam", "sayı", "toplam", "topladım", "çıkar", "çıkardım", "bölüm", "böldüm", "çarptım", "değişken",
+    "bilinmeyen", "x", "katsayı", "terim", "benzer", "parantez", "dağılma", "çünkü", "bu", "yüzden",
+    "dolayı", "eşittir", "sonuç", "sonucu", "elde", "edilir", "yani", "hipotenüs", "pisagor", "dik", "kare",
+    "için", "önce", "sonra", "ve", "ile", "olur", "bulunur", "İşlem", "ŞÖYLE", "ılık", "ığdır", "1/2",
+    "-3/4", "5/6", "=", "+", "-", "*", "/", "(1/2)", "2", "12", "abc", "bilmiyorum", "cevap", "paydalar",
+]
+
+
+def _bozuk(kelime: str, rng) -> str:
+    """Yazım hatası: bir ya da iki karakter silme / ekleme / değiştirme / yer değiştirme"""
+    harfler = list(kelime)
+    for _ in range(rng.randint(1, 2)):
+        i = rng.randrange(len(harfler) + 1)
+        islem = rng.randrange(4)
+        if islem == 0 and i < len(harfler):
+            del harfler[i]
+        elif islem == 1:
+            harfler.insert(i, rng.choice("abcdeilmnoprstuyzçğışöü"))
+        elif islem == 2 and i < len(harfler):
+            harfler[i] = rng.choice("abcdeilmnoprstuyzçğışöü")
+        elif i + 1 < len(harfler):
+            harfler[i], harfler[i + 1] = harfler[i + 1], harfler[i]
+    return "".join(harfler)
+
+
+def cevap_uret(rng) -> str:
+    if rng.random() < 0.03:
+        return rng.choice(["", " ", "a", "ab", "  x ", "çş", "...", "İİ"])
+    kelimeler = []
+    for kelime in rng.choices(KELIME_HAVUZU, k=rng.randint(1, 40)):
+        if rng.random() < 0.3:
+            kelime = _bozuk(kelime, rng) or kelime
+        if rng.random() < 0.05:
+            kelime = kelime.upper()
+        kelimeler.append(kelime)
+    ayrac = rng.choice([" ", " ", " ", ", ", "  ", "\n"])
+    return ayrac.join(kelimeler)
+
+
+# ============= DENETİMLER =============
+_SORU_DESENI = re.compile(
+    r"^\((-?\d+(?:/\d+)?)\) ([-+*/]) \((-?\d+(?:/\d+)?)\) işleminin sonucunun neden "
+    r"(-?\d+(?:/\d+)?) olduğunu adım adım açıkla\.$")
+_ISLEMLER = {"+": Fraction.__add__, "-": Fraction.__sub__, "*": Fraction.__mul__, "/": Fraction.__truediv__}
+
+
+def soru_hatasi(soru: str, islem=None):
+    """Soru geçersizse nedenini, geçerliyse None döndürür"""
+    eslesme = _SORU_DESENI.match(soru)
+    if not eslesme:
+        return "biçim"
+    s1, op, s2, belirtilen = eslesme.groups()
+    s1, s2, belirtilen = Fraction(s1), Fraction(s2), Fraction(belirtilen)
+    if islem is not None and op != islem.sembol:
+        return f"işlem {op} != {islem.sembol}"
+    if s1 == 0 or s2 == 0:
+        return "sıfır işlenen"
+    gercek = _ISLEMLER[op](s1, s2)
+    if gercek != belirtilen:
+        return f"sonuç {belirtilen} != {gercek}"
+    if gercek.denominator > PAYDA_SINIRI:
+        return f"payda {gercek.denominator} > {PAYDA_SINIRI}"
+    if not -PAY_SINIRI <= gercek.numerator <= PAY_SINIRI:
+        return f"pay {gercek.numerator} aralık dışında"
+    return None
+
+
+def puanlama_denetle(tohum: int, adet: int) -> list:
+    import krm_calisir
+
+    rng = random.Random(tohum)
+    hatalar = []
+    referans = {}  # aynı cevap parçada tekrar gelirse referans yeniden çalıştırılmaz
+    for _ in range(adet):
+        cevap = cevap_uret(rng)
+        eski = referans.get(cevap)
+        if eski is None:
+            eski = referans[cevap] = puanla_referans(cevap, "")
+        yeni = krm_calisir.puanla_akilli(cevap, "")
+        if yeni != eski:
+            hatalar.append({"cevap": cevap, "yeni": yeni, "referans": eski})
+    return hatalar
+
+
+def soru_denetle(tohum: int, adet: int) -> list:
+    import krm_calisir
+    from veri_modeli import Islem, Zorluk
+
+    rng = random.Random(tohum)
+    hatalar = []
+    for _ in range(adet):
+        islem = rng.choice([None, *Islem])
+        zorluk = rng.choice([None, *Zorluk])
+        soru_tohumu = rng.getrandbits(64)
+        random.seed(soru_tohumu)
+        if islem is None and zorluk is None:
+            yeni = krm_calisir.rasyonel_soru_uret_motoru()
+            random.seed(soru_tohumu)
+            eski = soru_referans()
+        else:
+            # İşçilerde create_app çağrılmaz, kalibrasyon tablosu boştur: zorluk soruyu değiştirmemeli
+            yeni = krm_calisir.rasyonel_soru_uret_motoru(islem, zorluk)
+            random.seed(soru_tohumu)
+            eski = krm_calisir.rasyonel_soru_uret_motoru(islem)
+        neden = soru_hatasi(yeni, islem) or (None if yeni == eski else f"referanstan farklı: {eski}")
+        if neden:
+            hatalar.append({"islem": islem and islem.metin, "zorluk": zorluk and zorluk.metin,
+                            "tohum": soru_tohumu, "soru": yeni, "neden": neden})
+    return hatalar
+
+
+def zorluk_denetle(tohum: int, adet: int) -> list:
+    import adaptif
+    import krm_calisir
+    from veri_modeli import Islem, Konu, Ogrenci, SoruDenemesi, Zorluk
+
+    rng = random.Random(tohum)
+    hatalar = []
+    for _ in range(adet):
+        egilim = rng.random()
+        puanlar = [min(100, max(0, int(rng.gauss(egilim * 100, 20)) // 10 * 10))
+                   for _ in range(rng.randint(0, 12))]
+        artimli = Ogrenci("A", "B", "7-A", "")
+        for no, puan in enumerate(puanlar, 1):
+            # Depo'nun yaptığı gibi: soru ekle, zorluk seç, cevabı O(1) işle
+            random.seed(rng.getrandbits(64))
+            soru = krm_calisir.rasyonel_soru_uret_motoru(rng.choice([None, *Islem]))
+            deneme = SoruDenemesi.yeni(no, Konu.RASYONEL, Zorluk.TEMEL, soru)
+            artimli.gecmis_sorular.append(deneme)
+            deneme.puan = puan
+            artimli.gecmis_puanlar.append(puan)
+            adaptif.guncelle(adaptif.istatistik_hazirla(artimli), puan, deneme.islem)
+            artimli.soru_sayisi += 1
+
+            bastan = Ogrenci("A", "B", "7-A", "")
+            bastan.gecmis_sorular.extend(artimli.gecmis_sorular)
+            bastan.gecmis_puanlar.extend(artimli.gecmis_puanlar)
+            bastan.soru_sayisi = artimli.soru_sayisi
+            secim, beklenen = krm_calisir.zorluk_belirle_akilli(artimli), krm_calisir.zorluk_belirle_akilli(bastan)
+            neden = None
+            if secim not in {z.metin for z in Zorluk}:
+                neden = f"geçersiz zorluk {secim}"
+            elif secim != beklenen:
+                neden = f"artımlı {secim} != baştan {beklenen}"
+            elif all(p == 100 for p in puanlar[:no]) and secim != Zorluk.ILERI.metin:
+                neden = "hep 100 alan öğrenciye ileri seçilmedi"
+            elif all(p == 0 for p in puanlar[:no]) and secim != Zorluk.TEMEL.metin:
+                neden = "hep 0 alan öğrenciye temel seçilmedi"
+            if neden:
+                hatalar.append({"puanlar": puanlar[:no], "neden": neden})
+                break
+    return hatalar
+
+
+def _cozum(s1: Fraction, op: str, s2: Fraction, sonuc) -> str:
+    """Sorunun sadeleştirmeden adım adım yazılmış doğru çözümü (Fraction'dan bağımsız kurulur)"""
+    n1, d1, n2, d2 = s1.numerator, s1.denominator, s2.numerator, s2.denominator
+    if op in "+-":
+        payda = d1 * d2 // gcd(d1, d2)
+        a, b = n1 * payda // d1, n2 * payda // d2
+        return f"paydaları eşitledim {a}/{payda} {op} {b}/{payda} = {a + b if op == '+' else a - b}/{payda} = {sonuc}"
+    if op == "*":
+        return f"payları ve paydaları çarptım {n1 * n2}/{d1 * d2} = {sonuc}"
+    ters = f"{-d2 if n2 < 0 else d2}/{abs(n2)}"
+    return f"böleni ters çevirdim {ters} ile çarptım {n1 * d2 * (-1 if n2 < 0 else 1)}/{d1 * abs(n2)} = {sonuc}"
+
+
+def hesap_denetle(tohum: int, adet: int) -> list:
+    import krm_calisir
+    from sayisal import beklenen_coz, sayisal_denetle
+
+    rng = random.Random(tohum)
+    hatalar = []
+    for _ in range(adet):
+        random.seed(rng.getrandbits(64))
+        soru = krm_calisir.rasyonel_soru_uret_motoru()
+        beklenen = beklenen_coz(soru)
+        s1, op, s2, sonuc = _SORU_DESENI.match(soru).groups()
+        s1, s2 = Fraction(s1), Fraction(s2)
+        dogru = _cozum(s1, op, s2, sonuc)
+        yanlis = _cozum(s1, op, s2, Fraction(sonuc) + 1)
+        # Önce yanlış sonuç iddia edip sonra adımlarla doğrusunu yazan öğrenci
+        duzeltilmis = f"önce = {Fraction(sonuc) + 1} buldum, düzelttim: {dogru.rsplit('=', 1)[0]} sonuç {sonuc}"
+        kopya = soru.split(" işleminin")[0]  # "(1/2) + (1/3)"
+        gurultu = cevap_uret(rng)
+        neden = None
+        if beklenen is None or beklenen.sonuc != _ISLEMLER[op](s1, s2):
+            neden = f"beklenen {beklenen}"
+        elif (d := sayisal_denetle(dogru, beklenen))["puan"] != 100:
+            neden = f"doğru çözüm {d}: {dogru}"
+        elif (d := sayisal_denetle(yanlis, beklenen))["yanlis"] is None or d["puan"] > 40:
+            neden = f"yanlış sonuç yakalanmadı {d}: {yanlis}"
+        elif (d := sayisal_denetle(duzeltilmis, beklenen))["puan"] != 100:
+            neden = f"düzeltilen sonuç kabul edilmedi {d}: {duzeltilmis}"
+        elif (d := sayisal_denetle(kopya, beklenen))["puan"] != 0:
+            neden = f"soruyu kopyalamak puan aldı {d}: {kopya}"
+        elif not 0 <= sayisal_denetle(gurultu, beklenen)["puan"] <= 100:
+            neden = f"puan aralık dışında: {gurultu!r}"
+        elif not 0 <= krm_calisir.puanla_akilli(gurultu + " " + dogru, soru, beklenen)["toplam"] <= 100:
+            neden = f"toplam puan aralık dışında: {gurultu!r}"
+        if neden:
+            hatalar.append({"soru": soru, "neden": neden})
+    return hatalar
+
+
+DENETIMLER = {
+    "puanlama": puanlama_denetle,
+    "soru": soru_denetle,
+    "zorluk": zorluk_denetle,
+    "hesap": hesap_denetle,
+}
+
+
+def _calistir(gorev):
+    tur, tohum, adet = gorev
+    t = time.perf_counter()
+    hatalar = DENETIMLER[tur](tohum, adet)
+    return tur, adet, hatalar, time.perf_counter() - t
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    ap.add_argument("--adet", type=int, default=VARSAYILAN_ADET, help="tür başına girdi sayısı (varsayılan %(default)s; tam ölçekli tarama için 1000000)")
+    ap.add_argument("--isci", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--tohum", type=int, default=0)
+    ap.add_argument("--sadece", default=",".join(DENETIMLER), help="virgülle ayrılmış denetim türleri")
+    args = ap.parse_args()
+    turler = [t for t in args.sadece.split(",") if t]
+    bilinmeyen = set(turler) - set(DENETIMLER)
+    if bilinmeyen:
+        ap.error(f"bilinmeyen denetim: {', '.join(sorted(bilinmeyen))}")
+
+    # Parçalar türler arasında karıştırılır: tüm türler birlikte ilerler
+    gorevler = []
+    for i in range(0, args.adet, PARCA):
+        for j, tur in enumerate(turler):
+            gorevler.append((tur, args.tohum * 1_000_003 + i * len(DENETIMLER) + j, min(PARCA, args.adet - i)))
+
+    sayac = dict.fromkeys(turler, 0)
+    hatalar = {t: [] for t in turler}
+    hata_sayisi = dict.fromkeys(turler, 0)
+    isci_suresi = dict.fromkeys(turler, 0.0)
+    t = son_rapor = time.perf_counter()
+    with Pool(args.isci) as havuz:
+        for tur, adet, bulunan, gecen in havuz.imap_unordered(_calistir, gorevler):
+            sayac[tur] += adet
+            isci_suresi[tur] += gecen
+            hata_sayisi[tur] += len(bulunan)
+            hatalar[tur] += bulunan[:ORNEK_HATA - len(hatalar[tur])]
+            if time.perf_counter() - son_rapor > 5:
+                son_rapor = time.perf_counter()
+                print(f"  {son_rapor - t:6.0f} s  " + "  ".join(f"{k}: {v}" for k, v in sayac.items()), flush=True)
+    sure = time.perf_counter() - t
+
+    print(f"\n{args.isci} işçi, {sure:.1f} s")
+    for tur in turler:
+        durum = "TAMAM" if hata_sayisi[tur] == 0 else f"{hata_sayisi[tur]} HATA"
+        # Hız tek işçi saniyesi başınadır (referans kopyaların süresi dahil)
+        hiz = sayac[tur] / isci_suresi[tur] if isci_suresi[tur] else 0
+        print(f"{tur:<9} {sayac[tur]:>9} girdi  {hiz:9.0f}/işçi-s  {durum}")
+        for hata in hatalar[tur]:
+            print(f"    {hata}")
+    sys.exit(1 if any(hata_sayisi.values()) else 0)
+
+
+if __name__ == "__main__":
+    main()
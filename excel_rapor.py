@@ -0,0 +1,127 @@
+"""Admin Excel raporu: özet, ayrıntı ve öğrenci başına sayfalar.
+
+Öğrenci sayfalarının içeriği (filtreleme, sıralama, sütun adları) iş
+parçacıklarında paralel hazırlanır; openpyxl çalışma kitabına yazım ise tek
+bir yazıcıyla, sabit sırada yapılır. Veri bir kez `groupby` ile bölünür; eski
+kodda olduğu gibi her öğrenci için tüm tablo yeniden taranmaz.
+
+Excel sayfa adları en fazla 31 karakterdir, bazı karakterleri kabul etmez ve
+büyük/küçük harf duyarsız olarak benzersiz olmalıdır. `sayfa_adi()` adı temizler,
+kısaltır ve çakışmada "(2)", "(3)" ... ekleyerek benzersiz yapar.
+"""
+import logging
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+AZAMI_SAYFA_ADI = 31
+AZAMI_ISCI = 8
+OZET_SAYFASI = "Genel Özet"
+DETAY_SAYFASI = "Detaylı Veriler"
+_YASAK_KARAKTER = re.compile(r"[\[\]:*?/\\\x00-\x1f]")
+
+DETAY_SUTUNLARI = {
+    "ad_soyad": "Ad Soyad", "sinif": "Sınıf", "zaman": "Zaman", "soru_no": "Soru No", "zorluk": "Zorluk",
+    "soru": "Soru", "cevap": "Cevap", "puan": "Puan", "geri_bildirim": "Geri Bildirim",
+}
+OGRENCI_SUTUNLARI = {
+    "soru_no": "Soru No", "zorluk": "Zorluk", "soru": "Soru", "cevap": "Cevap", "puan": "Puan",
+    "geri_bildirim": "Geri Bildirim",
+}
+
+
+def sayfa_adi(ad: str, kullanilan: set) -> str:
+    """Excel'in kabul ettiği, `kullanilan` içinde olmayan bir sayfa adı döndürür ve kümeye ekler.
+
+    `kullanilan` küçük harfe çevrilmiş adları tutar (Excel adları harf duyarsız karşılaştırır).
+    """
+    temiz = _YASAK_KARAKTER.sub("-", str(ad or "")).strip().strip("'")
+    if not temiz or temiz.casefold() == "history":  # "History" Excel'e ayrılmıştır
+        temiz = "Öğrenci"
+    aday = temiz[:AZAMI_SAYFA_ADI].rstrip()
+    n = 1
+    while aday.casefold() in kullanilan:
+        n += 1
+        ek = f" ({n})"
+        aday = temiz[:AZAMI_SAYFA_ADI - len(ek)].rstrip() + ek
+    kullanilan.add(aday.casefold())
+    return aday
+
+
+def ozet_cercevesi(df):
+    """Öğrenci başına özet satırı (ilk görülme sırasıyla)"""
+    gruplar = df.groupby("uid", sort=False)
+    ozet = gruplar.agg(ad_soyad=("ad_soyad", "first"), sinif=("sinif", "first"), zaman=("zaman", "first"),
+                       toplam=("puan", "size"), ortalama=("puan", "mean"), en_yuksek=("puan", "max"),
+                       en_dusuk=("puan", "min"))
+    ozet["ortalama"] = ozet["ortalama"].round(1)
+    ozet.columns = ["Ad Soyad", "Sınıf", "Giriş Saati", "Toplam Soru", "Ortalama Puan",
+                    "En Yüksek Puan", "En Düşük Puan"]
+    return ozet.reset_index(drop=True)
+
+
+def _ogrenci_sayfasi(grup):
+    sayfa = grup[list(OGRENCI_SUTUNLARI)].sort_values("soru_no", kind="stable")
+    return list(sayfa.itertuples(index=False, name=None))
+
+
+def _baslik_bicimi():
+    """pandas.to_excel başlık biçimi: kalın, ortalı, ince kenarlık"""
+    from openpyxl.styles import Alignment, Border, Font, Side
+
+    cizgi = Side(style="thin")
+    return {"font": Font(bold=True), "border": Border(left=cizgi, right=cizgi, top=cizgi, bottom=cizgi),
+            "alignment": Alignment(horizontal="center", vertical="top")}
+
+
+def _sayfa_yaz(kitap, ad, basliklar, satirlar, bicim):
+    from openpyxl.cell import WriteOnlyCell
+
+    sayfa = kitap.create_sheet(ad)
+    baslik = []
+    for metin in basliklar:
+        hucre = WriteOnlyCell(sayfa, value=metin)
+        hucre.font, hucre.border, hucre.alignment = bicim["font"], bicim["border"], bicim["alignment"]
+        baslik.append(hucre)
+    sayfa.append(baslik)
+    for satir in satirlar:
+        sayfa.append(satir)
+
+
+def excel_yaz(df, hedef, ilerleme=None, isci_sayisi=None) -> dict:
+    """`df` (defter sütunları) için raporu `hedef`e (yol ya da dosya nesnesi) yazar.
+
+    `ilerleme(asama, tamamlanan, toplam)` her sayfadan sonra çağrılır.
+    """
+    from openpyxl import Workbook  # Tembel yükleme
+
+    bildir = ilerleme or (lambda asama, tamamlanan, toplam: None)
+    gruplar = [grup for _, grup in df.groupby("uid", sort=False)]
+    toplam = len(gruplar) + 2
+
+    # Sayfa adları sırayla atanır: çıktı paralel hazırlıktan bağımsız olarak belirlenimcidir
+    kullanilan = {OZET_SAYFASI.casefold(), DETAY_SAYFASI.casefold()}
+    adlar = [sayfa_adi(grup["ad_soyad"].iat[0], kullanilan) for grup in gruplar]
+
+    bildir("hazirlaniyor", 0, toplam)
+    # Yalnızca-yazma kipi: sayfalar akış halinde yazılır (pandas.ExcelWriter her sayfada
+    # tüm sayfa listesini yeniden kurar ve yüzlerce sayfada karesel yavaşlar)
+    kitap = Workbook(write_only=True)
+    bicim = _baslik_bicimi()
+    isci_sayisi = isci_sayisi or min(AZAMI_ISCI, os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=isci_sayisi, thread_name_prefix="excel") as havuz:
+        sayfalar = havuz.map(_ogrenci_sayfasi, gruplar)
+        ozet = ozet_cercevesi(df)
+        _sayfa_yaz(kitap, OZET_SAYFASI, ozet.columns, ozet.itertuples(index=False, name=None), bicim)
+        detay = df[list(DETAY_SUTUNLARI)]
+        _sayfa_yaz(kitap, DETAY_SAYFASI, DETAY_SUTUNLARI.values(), detay.itertuples(index=False, name=None), bicim)
+        bildir("yaziliyor", 2, toplam)
+        # map sonuçları sırayla döner; hazırlık yazımla örtüşür
+        for i, (ad, satirlar) in enumerate(zip(adlar, sayfalar), start=3):
+            _sayfa_yaz(kitap, ad, OGRENCI_SUTUNLARI.values(), satirlar, bicim)
+            bildir("yaziliyor", i, toplam)
+    kitap.save(hedef)
+    bildir("tamamlandi", toplam, toplam)
+    return {"ogrenci": len(gruplar), "kayit": len(df), "sayfa": toplam}
@@ -0,0 +1,357 @@
+"""Ağır admin işleri için arka plan iş yürütücüsü (rapor, Excel, CSV, yeniden puanlama).
+
+İşler HTTP isteğinin içinde değil, ayrı bir süreç havuzunda çalışır; istek işi
+kuyruğa koyar ve hemen döner (`gonder`). Her işin kendi dizini vardır:
+
+    <veri dizini>/isler/<kimlik>/durum.json      (tür, parametreler, durum, zamanlar, hata)
+    <veri dizini>/isler/<kimlik>/ilerleme.json   (işçi süreç yazar: aşama, tamamlanan, toplam)
+    <veri dizini>/isler/<kimlik>/<çıktı>         (xlsx / html / csv)
+
+İşçi süreçler defterleri yalnızca okur (Parcalar.ac(salt_okunur=True)); öğrenci
+depolarının sahibi ana süreçtir. Aynı anda en fazla `azami_eszamanli` iş çalışır,
+en fazla `azami_bekleyen` iş sıra bekler; fazlası reddedilir. İşçiler düşük
+öncelikle (nice) çalışır, böylece öğrenci istekleri CPU için beklemez.
+
+Tamamlanan işlerin çıktıları yeniden başlatmadan sonra da indirilebilir; en
+yeni `saklanan` iş dışındakiler silinir.
+"""
+import csv
+import datetime
+import json
+import logging
+import multiprocessing
+import os
+import shutil
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from defter import BASLIKLAR, sorgu_hazirla
+
+logger = logging.getLogger(__name__)
+
+AZAMI_ESZAMANLI = 2
+AZAMI_BEKLEYEN = 8
+SAKLANAN = 20
+ISCI_ONCELIGI = 10  # os.nice artışı
+
+# Durumlar
+BEKLIYOR, CALISIYOR, TAMAMLANDI, HATA = "bekliyor", "calisiyor", "tamamlandi", "hata"
+FILTRELER = ("sinif", "zorluk", "baslangic", "bitis", "min_puan", "max_puan")
+
+
+class IsHatasi(ValueError):
+    """Bilinmeyen iş türü"""
+
+
+class KuyrukDolu(IsHatasi):
+    """Eşzamanlı + bekleyen iş sınırı aşıldı (istemci daha sonra tekrar denemeli)"""
+
+
+def _json_yaz(yol: str, veri):
+    gecici = yol + ".tmp"
+    with open(gecici, "w", encoding="utf-8") as f:
+        json.dump(veri, f, ensure_ascii=False)
+    os.replace(gecici, yol)
+
+
+def _json_oku(yol: str):
+    try:
+        with open(yol, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+# ============= İŞÇİ SÜREÇ TARAFI =============
+class Ilerleme:
+    """İşçinin ilerleme bildirimi; dosyaya en fazla saniyede birkaç kez yazılır"""
+
+    ARALIK = 0.25
+
+    def __init__(self, dizin: str):
+        self.yol = os.path.join(dizin, "ilerleme.json")
+        self._son = 0.0
+
+    def __call__(self, asama: str, tamamlanan: int = 0, toplam: int = 0):
+        simdi = time.monotonic()
+        if simdi - self._son >= self.ARALIK or (toplam and tamamlanan >= toplam):
+            self._son = simdi
+            _json_yaz(self.yol, {"asama": asama, "tamamlanan": tamamlanan, "toplam": toplam})
+
+
+def _isci_baslat():
+    if hasattr(os, "nice"):
+        os.nice(ISCI_ONCELIGI)
+
+
+def _parcalar(kok: str):
+    from parcalar import Parcalar
+
+    parcalar = Parcalar(kok)
+    parcalar.ac(salt_okunur=True)
+    return parcalar
+
+
+def _filtreli_kayitlar(parcalar, parametreler: dict, ilerleme):
+    """Filtreye uyan tüm kayıtlar (zamana göre); sayfa sayfa, parçalar arası birleşik"""
+    kayitlar, imlec = [], None
+    while True:
+        sayfa = parcalar.sorgula(**parametreler, limit=200, imlec=imlec)
+        kayitlar += sayfa["kayitlar"]
+        ilerleme("okunuyor", len(kayitlar), 0)
+        imlec = sayfa["sonraki"]
+        if not imlec:
+            return kayitlar
+
+
+def excel_isi(kok: str, dizin: str, parametreler: dict) -> str:
+    import pandas as pd
+    from excel_rapor import excel_yaz
+
+    ilerleme = Ilerleme(dizin)
+    ilerleme("okunuyor")
+    parcalar = _parcalar(kok)
+    if any(parametreler.get(a) for a in FILTRELER):
+        df = pd.DataFrame(_filtreli_kayitlar(parcalar, parametreler, ilerleme), columns=BASLIKLAR)
+    else:
+        df = parcalar.veri_cercevesi()
+    excel_yaz(df, os.path.join(dizin, "rapor.xlsx"), ilerleme=ilerleme)
+    return "rapor.xlsx"
+
+
+def csv_isi(kok: str, dizin: str, parametreler: dict) -> str:
+    ilerleme = Ilerleme(dizin)
+    kayitlar = _filtreli_kayitlar(_parcalar(kok), parametreler, ilerleme)
+    with open(os.path.join(dizin, "kayitlar.csv"), "w", newline="", encoding="utf-8-sig") as f:
+        yazici = csv.DictWriter(f, fieldnames=BASLIKLAR)
+        yazici.writeheader()
+        for i, k in enumerate(kayitlar, 1):
+            yazici.writerow(k)
+            if i % 1000 == 0:
+                ilerleme("yaziliyor", i, len(kayitlar))
+    ilerleme("tamamlandi", len(kayitlar), len(kayitlar))
+    return "kayitlar.csv"
+
+
+RAPOR_SABLONU = """<!DOCTYPE html>
+<html lang="tr"><head><meta charset="utf-8"><title>DynaProof Rapor</title>
+<style>body{font-family:sans-serif;margin:2em}table{border-collapse:collapse;width:100%;font-size:.85em}
+th,td{border:1px solid #ccc;padding:4px;vertical-align:top}th{background:#667eea;color:#fff}</style></head>
+<body><h1>📊 DynaProof Akademik Rapor</h1><p>Rapor Tarihi: {{ tarih }} — {{ kayitlar|length }} kayıt, {{ ozet|length }} öğrenci</p>
+<h2>Öğrenci Özeti</h2><table><tr><th>Ad Soyad</th><th>Sınıf</th><th>Soru</th><th>Ortalama</th></tr>
+{% for o in ozet %}<tr><td>{{ o.ad_soyad }}</td><td>{{ o.sinif }}</td><td>{{ o.n }}</td><td>{{ o.ortalama }}</td></tr>{% endfor %}
+</table><h2>Cevaplar</h2><table><tr><th>Zaman</th><th>Öğrenci</th><th>#</th><th>Zorluk</th><th>Soru</th><th>Cevap</th><th>Puan</th><th>Değerlendirme</th></tr>
+{% for k in kayitlar %}<tr><td>{{ k.zaman }}</td><td>{{ k.ad_soyad }} ({{ k.sinif }})</td><td>{{ k.soru_no }}</td><td>{{ k.zorluk }}</td>
+<td>{{ k.soru }}</td><td>{{ k.cevap }}</td><td>{{ k.puan }}/100</td><td>{{ k.geri_bildirim }}</td></tr>{% endfor %}
+</table></body></html>"""
+
+
+def rapor_isi(kok: str, dizin: str, parametreler: dict) -> str:
+    from jinja2 import Environment
+
+    ilerleme = Ilerleme(dizin)
+    kayitlar = _filtreli_kayitlar(_parcalar(kok), parametreler, ilerleme)
+    ozet = {}
+    for k in kayitlar:
+        o = ozet.setdefault(k["uid"], {"ad_soyad": k["ad_soyad"], "sinif": k["sinif"], "n": 0, "toplam": 0})
+        o["n"] += 1
+        o["toplam"] += k["puan"]
+    for o in ozet.values():
+        o["ortalama"] = round(o["toplam"] / o["n"], 1)
+    ilerleme("yaziliyor", 0, 1)
+    sablon = Environment(autoescape=True).from_string(RAPOR_SABLONU)
+    with open(os.path.join(dizin, "rapor.html"), "w", encoding="utf-8") as f:
+        f.write(sablon.render(kayitlar=kayitlar, ozet=list(ozet.values()),
+                              tarih=datetime.datetime.now().strftime("%d.%m.%Y %H:%M")))
+    ilerleme("tamamlandi", 1, 1)
+    return "rapor.html"
+
+
+def yeniden_puanla_isi(kok: str, dizin: str, parametreler: dict) -> str:
+    """Filtreye uyan cevapları güncel puanlama ile yeniden puanlar (defter değiştirilmez; fark raporu)"""
+    from krm_calisir import puanla_akilli
+    from sayisal import beklenen_coz
+
+    ilerleme = Ilerleme(dizin)
+    kayitlar = _filtreli_kayitlar(_parcalar(kok), parametreler, ilerleme)
+    with open(os.path.join(dizin, "yeniden_puanlama.csv"), "w", newline="", encoding="utf-8-sig") as f:
+        yazici = csv.writer(f)
+        yazici.writerow(["zaman", "uid", "ad_soyad", "sinif", "soru_no", "eski_puan", "yeni_puan", "fark"])
+        for i, k in enumerate(kayitlar, 1):
+            yeni = puanla_akilli(k["cevap"], k["soru"], beklenen_coz(k["soru"]))["toplam"]
+            yazici.writerow([k["zaman"], k["uid"], k["ad_soyad"], k["sinif"], k["soru_no"],
+                             k["puan"], yeni, yeni - k["puan"]])
+            if i % 200 == 0:
+                ilerleme("puanlaniyor", i, len(kayitlar))
+    ilerleme("tamamlandi", len(kayitlar), len(kayitlar))
+    return "yeniden_puanlama.csv"
+
+
+ISLER = {
+    "excel": excel_isi,
+    "csv": csv_isi,
+    "rapor": rapor_isi,
+    "yeniden_puanla": yeniden_puanla_isi,
+}
+
+
+# ============= ANA SÜREÇ TARAFI =============
+class IsYoneticisi:
+    def __init__(self, kok_dizin: str, is_dizini: str, azami_eszamanli: int = AZAMI_ESZAMANLI,
+                 azami_bekleyen: int = AZAMI_BEKLEYEN, saklanan: int = SAKLANAN):
+        self.kok_dizin = kok_dizin
+        self.is_dizini = is_dizini
+        self.azami_eszamanli = azami_eszamanli
+        self.azami_bekleyen = azami_bekleyen
+        self.saklanan = saklanan
+        self._isler = {}  # kimlik -> durum sözlüğü (durum.json ile aynı)
+        self._kilit = threading.Lock()
+        self._havuz = None
+        self._sayaclar = dict.fromkeys(("gonderilen", "tamamlanan", "hatali", "reddedilen"), 0)
+
+    def ac(self):
+        """Önceki çalıştırmaların işlerini yükler; yarıda kalanları hatalı işaretler"""
+        os.makedirs(self.is_dizini, exist_ok=True)
+        with self._kilit:
+            for kimlik in os.listdir(self.is_dizini):
+                durum = _json_oku(os.path.join(self.is_dizini, kimlik, "durum.json"))
+                if durum is None:
+                    continue
+                if durum["durum"] in (BEKLIYOR, CALISIYOR):
+                    durum.update(durum=HATA, hata="Sunucu iş bitmeden yeniden başlatıldı")
+                    _json_yaz(os.path.join(self.is_dizini, kimlik, "durum.json"), durum)
+                self._isler[kimlik] = durum
+
+    def _havuz_al(self) -> ProcessPoolExecutor:
+        if self._havuz is None:
+            # spawn: çok iş parçacıklı sunucu sürecini çatallamak (fork) güvenli değildir
+            self._havuz = ProcessPoolExecutor(max_workers=self.azami_eszamanli,
+                                              mp_context=multiprocessing.get_context("spawn"),
+                                              initializer=_isci_baslat)
+        return self._havuz
+
+    def _havuzu_birak(self, havuz):
+        """Bozulan havuzu (ör. bir işçi öldürüldü) bırakır; sonraki çağrı yenisini kurar"""
+        with self._kilit:
+            if self._havuz is not havuz:
+                return
+            self._havuz = None
+        logger.warning("İş havuzu bozuldu; yeniden kurulacak")
+        havuz.shutdown(wait=False, cancel_futures=True)
+
+    def gonder(self, tur: str, parametreler: dict = None) -> dict:
+        """İşi kuyruğa koyar ve durumunu döndürür; tür bilinmiyorsa IsHatasi, sınır aşıldıysa KuyrukDolu"""
+        if tur not in ISLER:
+            raise IsHatasi(f"İş türü şunlardan biri olmalı: {', '.join(ISLER)}")
+        parametreler = {a: d for a, d in (parametreler or {}).items() if a in FILTRELER and d not in (None, "")}
+        sorgu_hazirla(**parametreler)  # Geçersiz filtre kuyruğa girmeden SorguHatasi verir
+        with self._kilit:
+            aktif = sum(1 for d in self._isler.values() if d["durum"] in (BEKLIYOR, CALISIYOR))
+            if aktif >= self.azami_eszamanli + self.azami_bekleyen:
+                self._sayaclar["reddedilen"] += 1
+                raise KuyrukDolu("Çok fazla bekleyen iş var; biraz sonra tekrar deneyin")
+            kimlik = uuid.uuid4().hex[:12]
+            dizin = os.path.join(self.is_dizini, kimlik)
+            os.makedirs(dizin)
+            durum = {"kimlik": kimlik, "tur": tur, "parametreler": parametreler, "durum": BEKLIYOR,
+                     "olusturma": datetime.datetime.now().isoformat(timespec="seconds"),
+                     "bitis": None, "dosya": None, "hata": None}
+            _json_yaz(os.path.join(dizin, "durum.json"), durum)
+            self._isler[kimlik] = durum
+            self._sayaclar["gonderilen"] += 1
+        # Havuz bozuksa bir kez yenisiyle denenir; yine olmazsa iş hatalı işaretlenir
+        for deneme in range(2):
+            with self._kilit:
+                havuz = self._havuz_al()
+            try:
+                gelecek = havuz.submit(ISLER[tur], self.kok_dizin, dizin, parametreler)
+                break
+            except (BrokenProcessPool, RuntimeError) as e:
+                self._havuzu_birak(havuz)
+                hata = e
+        else:
+            self._hata_isaretle(kimlik, hata)
+            raise IsHatasi("İş başlatılamadı; biraz sonra tekrar deneyin")
+        gelecek.add_done_callback(lambda g: self._bitti(kimlik, g, havuz))
+        self._temizle()
+        return self.durum(kimlik)
+
+    def _bitti(self, kimlik: str, gelecek, havuz):
+        try:
+            dosya = gelecek.result()
+        except (BrokenProcessPool, RuntimeError) as e:
+            # İşçi süreç öldü: havuzdaki tüm işler bu hatayla biter, havuz yeniden kurulur
+            self._havuzu_birak(havuz)
+            self._hata_isaretle(kimlik, e)
+            return
+        except BaseException as e:
+            self._hata_isaretle(kimlik, e)
+            return
+        with self._kilit:
+            durum = self._isler.get(kimlik)
+            if durum is None:
+                return
+            durum.update(durum=TAMAMLANDI, dosya=dosya,
+                         bitis=datetime.datetime.now().isoformat(timespec="seconds"))
+            self._sayaclar["tamamlanan"] += 1
+            _json_yaz(os.path.join(self.is_dizini, kimlik, "durum.json"), durum)
+
+    def _hata_isaretle(self, kimlik: str, hata: BaseException):
+        with self._kilit:
+            durum = self._isler.get(kimlik)
+            if durum is None:
+                return
+            durum.update(durum=HATA, hata=f"{type(hata).__name__}: {hata}",
+                         bitis=datetime.datetime.now().isoformat(timespec="seconds"))
+            self._sayaclar["hatali"] += 1
+            logger.error("İş başarısız (%s %s): %s", durum["tur"], kimlik, durum["hata"])
+            _json_yaz(os.path.join(self.is_dizini, kimlik, "durum.json"), durum)
+
+    def _temizle(self):
+        """En yeni `saklanan` iş dışındaki bitmiş işlerin dizinlerini siler"""
+        with self._kilit:
+            bitmis = sorted((d for d in self._isler.values() if d["durum"] in (TAMAMLANDI, HATA)),
+                            key=lambda d: d["olusturma"], reverse=True)
+            for durum in bitmis[self.saklanan:]:
+                self._isler.pop(durum["kimlik"], None)
+                shutil.rmtree(os.path.join(self.is_dizini, durum["kimlik"]), ignore_errors=True)
+
+    def durum(self, kimlik: str):
+        """İşin durumu ve (çalışıyorsa) ilerlemesi; bilinmeyen iş için None"""
+        with self._kilit:
+            durum = self._isler.get(kimlik)
+            if durum is None:
+                return None
+            durum = dict(durum)
+        if durum["durum"] in (BEKLIYOR, CALISIYOR):
+            ilerleme = _json_oku(os.path.join(self.is_dizini, kimlik, "ilerleme.json"))
+            if ilerleme is not None:
+                durum.update(durum=CALISIYOR, ilerleme=ilerleme)
+        return durum
+
+    def liste(self) -> list:
+        with self._kilit:
+            kimlikler = sorted(self._isler, key=lambda k: self._isler[k]["olusturma"], reverse=True)
+        return [self.durum(k) for k in kimlikler]
+
+    def dosya(self, kimlik: str):
+        """Tamamlanmış işin çıktı dosyasının yolu; hazır değilse None"""
+        durum = self.durum(kimlik)
+        if durum is None or durum["durum"] != TAMAMLANDI:
+            return None
+        return os.path.join(self.is_dizini, kimlik, durum["dosya"])
+
+    def metrikler(self) -> dict:
+        with self._kilit:
+            m = dict(self._sayaclar)
+            m["aktif"] = sum(1 for d in self._isler.values() if d["durum"] in (BEKLIYOR, CALISIYOR))
+        m["azami_eszamanli"] = self.azami_eszamanli
+        return m
+
+    def kapat(self):
+        if self._havuz is not None:
+            self._havuz.shutdown(wait=False, cancel_futures=True)
+            self._havuz = None
@@ -0,0 +1,153 @@
+"""Cevap gönderimleri için kabul kontrolü (admission control).
+
+Öğretmen "şimdi gönderin" dediğinde onlarca /cevap isteği aynı saniyede gelir.
+Geliştirme sunucusu bunları sınırsız kuyruğa alır ve hepsi birlikte zaman aşımına
+uğrar. Bu katman:
+
+* Aynı (uid, soru_no) için ikinci gönderimi işlemez: ilk gönderim sürüyorsa onun
+  sonucunu bekler, bittiyse aynı sonucu (yönlendirme adresini) döndürür.
+* Aynı anda en fazla `azami_eszamanli` gönderimi işler; fazlası sınırlı bir bekleme
+  kuyruğunda en fazla `azami_bekleme` saniye sırasını bekler. Kuyruk doluysa ya da
+  süre dolarsa istek beklemeden `Doygun` ile reddedilir (503 + Retry-After).
+
+Kullanım:
+    with KABUL.giris(uid, soru_no) as giris:
+        if giris.onceki:
+            return redirect(giris.onceki)
+        ...
+        giris.tamamla(hedef)
+"""
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+AZAMI_ESZAMANLI = 4
+AZAMI_BEKLEYEN = 32
+AZAMI_BEKLEME = 2.0  # saniye
+AZAMI_KAYIT = 4096   # hatırlanan (uid, soru_no) sonucu
+SURE_ALFA = 0.1      # işlem süresi ortalaması (Retry-After tahmini için)
+
+
+class Doygun(Exception):
+    """İstek kabul edilmedi; `tekrar` saniye sonra yeniden denenmeli"""
+
+    def __init__(self, mesaj: str, tekrar: int):
+        super().__init__(mesaj)
+        self.tekrar = tekrar
+
+
+class _Giris:
+    __slots__ = ("onceki", "sonuc", "bitti")
+
+    def __init__(self, onceki=None):
+        self.onceki = onceki  # tekrar gönderimde ilk gönderimin sonucu
+        self.sonuc = None
+        self.bitti = threading.Event()
+
+    def tamamla(self, sonuc):
+        """İşlenen gönderimin sonucu; aynı anahtarla gelen tekrarlara bu döndürülür"""
+        self.sonuc = sonuc
+
+
+class KabulKontrolu:
+    def __init__(self, azami_eszamanli: int = AZAMI_ESZAMANLI, azami_bekleyen: int = AZAMI_BEKLEYEN,
+                 azami_bekleme: float = AZAMI_BEKLEME, azami_kayit: int = AZAMI_KAYIT):
+        self.azami_eszamanli = azami_eszamanli
+        self.azami_bekleyen = azami_bekleyen
+        self.azami_bekleme = azami_bekleme
+        self._azami_kayit = azami_kayit
+        self._kosul = threading.Condition()
+        self._aktif = 0
+        self._bekleyen = 0
+        self._kayitlar = OrderedDict()  # (uid, soru_no) -> _Giris (en eski önce)
+        self._ortalama_sure = 0.05
+        self._sayaclar = dict.fromkeys(
+            ("kabul", "tekrar", "reddedilen", "zaman_asimi", "hata", "en_derin_kuyruk"), 0)
+
+    def _tekrar_suresi(self) -> int:
+        """Kuyruğun erimesi için tahmini saniye (en az 1)"""
+        return max(1, math.ceil((self._bekleyen + 1) * self._ortalama_sure / max(1, self.azami_eszamanli)))
+
+    @contextmanager
+    def giris(self, uid: str, soru_no: int):
+        anahtar = (uid, soru_no)
+        with self._kosul:
+            ilk = self._kayitlar.get(anahtar)
+            if ilk is None:
+                giris = self._kayitlar[anahtar] = _Giris()
+                while len(self._kayitlar) > self._azami_kayit:
+                    self._kayitlar.popitem(last=False)
+        if ilk is not None:
+            yield self._tekrar(ilk)
+            return
+
+        basladi = None
+        try:
+            self._yer_al()
+            basladi = time.perf_counter()
+            yield giris
+        except Doygun:
+            raise
+        except BaseException:
+            with self._kosul:
+                self._sayaclar["hata"] += 1
+            raise
+        finally:
+            with self._kosul:
+                if basladi is not None:
+                    sure = time.perf_counter() - basladi
+                    self._ortalama_sure += SURE_ALFA * (sure - self._ortalama_sure)
+                    self._aktif -= 1
+                    self._kosul.notify()
+                # Sonuçsuz biten gönderim hatırlanmaz: yeniden gönderilince baştan işlenir
+                if giris.sonuc is None and self._kayitlar.get(anahtar) is giris:
+                    del self._kayitlar[anahtar]
+            giris.bitti.set()
+
+    def _tekrar(self, ilk: _Giris) -> _Giris:
+        """Aynı anahtarla gelen ikinci gönderim: ilkinin sonucunu bekler"""
+        with self._kosul:
+            self._sayaclar["tekrar"] += 1
+        if not ilk.bitti.wait(self.azami_bekleme):
+            with self._kosul:
+                raise Doygun("Cevabın hâlâ işleniyor", self._tekrar_suresi())
+        if ilk.sonuc is None:
+            # İlk gönderim sonuçsuz bitti (hata ya da yönlendirme); tekrar işlenebilir
+            raise Doygun("Cevabın işlenemedi, lütfen yeniden gönder", 1)
+        return _Giris(onceki=ilk.sonuc)
+
+    def _yer_al(self):
+        with self._kosul:
+            if self._aktif < self.azami_eszamanli and not self._bekleyen:
+                self._aktif += 1
+                self._sayaclar["kabul"] += 1
+                return
+            if self._bekleyen >= self.azami_bekleyen:
+                self._sayaclar["reddedilen"] += 1
+                raise Doygun("Sunucu şu an çok yoğun", self._tekrar_suresi())
+            self._bekleyen += 1
+            self._sayaclar["en_derin_kuyruk"] = max(self._sayaclar["en_derin_kuyruk"], self._bekleyen)
+            try:
+                if not self._kosul.wait_for(lambda: self._aktif < self.azami_eszamanli, self.azami_bekleme):
+                    self._sayaclar["zaman_asimi"] += 1
+                    raise Doygun("Sunucu şu an çok yoğun", self._tekrar_suresi())
+            finally:
+                self._bekleyen -= 1
+            self._aktif += 1
+            self._sayaclar["kabul"] += 1
+
+    def metrikler(self) -> dict:
+        with self._kosul:
+            m = dict(self._sayaclar)
+            m["aktif"] = self._aktif
+            m["kuyruk_derinligi"] = self._bekleyen
+            m["azami_eszamanli"] = self.azami_eszamanli
+            m["azami_bekleyen"] = self.azami_bekleyen
+            m["ortalama_sure_ms"] = round(self._ortalama_sure * 1000, 1)
+            m["hatirlanan"] = len(self._kayitlar)
+        return m
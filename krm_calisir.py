@@ -1,50 +1,80 @@
-from flask import Flask, request, render_template_string, redirect, url_for
-import datetime, csv, json, uuid, os, random, re, pandas as pd
+from flask import Blueprint, Flask, jsonify, request, render_template_string, redirect, url_for, send_file
+import datetime, os, random, re
 from collections import Counter
 import logging
 from difflib import SequenceMatcher
 import unicodedata
 from fractions import Fraction
+import adaptif
+import atexit
+from parcalar import Parcalar, uid_uret
+from on_uretim import SoruHazirlayici
+from sayisal import beklenen_coz, sayisal_denetle, sayisal_mesaj
+from defter import SorguHatasi
+from analiz import Kalibrasyon, kalibrasyon_yukle
+from isler import IsHatasi, IsYoneticisi, KuyrukDolu
+from kabul import Doygun, KabulKontrolu
+from varliklar import varlik_bp
+from veri_modeli import CevapKaydi, Islem, Konu, Ogrenci, SoruDenemesi, Zorluk
+
+# NOT: pandas/openpyxl burada import EDİLMEZ. Yalnızca admin rapor ve Excel
+# uçları ilk kez çağrıldığında yüklenir; öğrenci sayfaları ve soğuk başlangıç
+# bu ağır kütüphaneleri hiç beklemez.
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = Flask(__name__)
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-CSV_FILE = os.path.join(BASE_DIR, "defter.csv")
-STUDENT_FILE = os.path.join(BASE_DIR, "ogrenciler.json")
-
-print(f"--> Dosyalar şuraya kaydediliyor: {BASE_DIR}")
+bp = Blueprint("dynaproof", __name__)
+# Veri dizini ortam değişkeniyle değiştirilebilir (ölçüm ve deneme kurulumları için)
+BASE_DIR = os.environ.get("DYNAPROOF_VERI_DIZINI") or os.path.dirname(os.path.abspath(__file__))
+KALIBRASYON_FILE = os.path.join(BASE_DIR, "kalibrasyon.json")
+# Her sınıfın kendi öğrenci deposu ve defteri var (parcalar.py); create_app() içinde açılır
+PARCALAR = Parcalar(BASE_DIR)
+# Kayıt formundaki sınıflar; başka bir değer yeni parça (dizin ve açık dosyalar) açtıramaz
+SINIFLAR = ("7-A", "7-B", "7-C", "7-D")
+# Ağır admin işleri (Excel, rapor, yeniden puanlama) ayrı süreçlerde çalışır (isler.py)
+ISLER = IsYoneticisi(BASE_DIR, os.path.join(BASE_DIR, "isler"))
 
 def verileri_yukle():
     """Hata korumalı veri yükleme fonksiyonu"""
-    # 1. JSON Kontrolü
-    students = {}
-    if os.path.exists(STUDENT_FILE):
-        try:
-            with open(STUDENT_FILE, encoding="utf-8-sig") as f:
-                content = f.read().strip()
-                if content: # Dosya boş değilse yükle
-                    students = json.loads(content)
-        except (json.JSONDecodeError, ValueError):
-            print("UYARI: JSON dosyası bozuktu, otomatik sıfırlandı.")
-            students = {} # Hata varsa boş sözlükle devam et
-        except Exception as e:
-            print(f"KRİTİK HATA (JSON): {e}")
-            students = {}
-
-    # 2. CSV Kontrolü (Yoksa başlıkları oluştur)
-    if not os.path.exists(CSV_FILE):
-        try:
-            headers = ["zaman", "uid", "ad_soyad", "sinif", "soru", "cevap", "puan", "zorluk", "soru_no", "geri_bildirim"]
-            pd.DataFrame(columns=headers).to_csv(CSV_FILE, index=False, encoding="utf-8-sig")
-        except PermissionError:
-            print("!!! HATA: defter.csv dosyası Excel'de açık olabilir. Lütfen kapatın!")
-
-    return students
-
-# Program başlarken verileri bir kere kontrol et
-verileri_yukle()
+    # Her parça için: öğrenci durumu (son anlık görüntü + günlüğün kuyruğu) ve
+    # CSV kontrolü (yoksa başlıkları oluştur, eski tam metinli defteri dönüştür)
+    try:
+        return PARCALAR.ac()
+    except PermissionError:
+        print("!!! HATA: defter.csv dosyası Excel'de açık olabilir. Lütfen kapatın!")
+
+def create_app():
+    """Uygulama fabrikası: Flask nesnesini kurar ve veri dosyalarını bir kere hazırlar.
+
+    Modülü import etmek hiçbir dosyaya yazmaz; başlangıç işleri burada yapılır.
+    WSGI sunucularında `krm_calisir:create_app()` olarak kullanılabilir.
+    """
+    app = Flask(__name__)
+    app.register_blueprint(bp)
+    # Ortak CSS (parmak izli, uzun önbellekli) ve HTML/JSON yanıt sıkıştırma
+    app.register_blueprint(varlik_bp)
+    print(f"--> Dosyalar şuraya kaydediliyor: {BASE_DIR}")
+    verileri_yukle()
+    atexit.register(PARCALAR.kapat)
+    ISLER.ac()
+    atexit.register(ISLER.kapat)
+    # Madde analizinin (analiz.py) ürettiği zorluk kalibrasyonu varsa yükle
+    global KALIBRASYON
+    KALIBRASYON = kalibrasyon_yukle(KALIBRASYON_FILE)
+    return app
+
+_app = None
+
+def __getattr__(name):
+    # Eski `krm_calisir:app` kullanımını bozmamak için uygulama ilk erişimde kurulur
+    global _app
+    if name == "app":
+        if _app is None:
+            _app = create_app()
+        return _app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 # ============= 7. SINIF AKADEMİK BAŞARI TESTİ SORU HAVUZU (2018 MÜFREDAT) =============
 # Kazanımlar: M.7.1.3 RASYONEL SAYILARLA İŞLEMLER, M.7.2.1. CEBİRSEL İFADELER, M.7.2.2. EŞİTLİK VE DENKLEM
 SORU_SABLONLARI = {
@@ -65,10 +95,6 @@ SORU_SABLONLARI = {
 
 }
 
-if not os.path.exists(CSV_FILE):
-    headers = ["zaman", "uid", "ad_soyad", "sinif", "soru", "cevap", "puan", "zorluk", "soru_no", "geri_bildirim"]
-    pd.DataFrame(columns=headers).to_csv(CSV_FILE, index=False, encoding="utf-8-sig")
-
 # ============= AKILLI PUANLAMA SİSTEMİ (7. SINIF AKADEMİK BAŞARI ODAKLI) =============
 def turkce_karakter_temizle(metin):
     """
@@ -78,7 +104,14 @@ def turkce_karakter_temizle(metin):
     return ''.join(c for c in unicodedata.normalize('NFD', metin)
                   if unicodedata.category(c) != 'Mn')
 
-def puanla_akilli(ogrenci_cevabi, soru_metni):
+SAYISAL_AGIRLIK = 0.3  # Beklenen sonuç biliniyorsa sayısal denetimin toplam puandaki payı
+
+def puanla_akilli(ogrenci_cevabi, soru_metni, beklenen=None):
+    """Cevabı terim, mantık ve (beklenen sonuç verilirse) sayısal doğruluk açısından puanlar.
+
+    `beklenen` sorunun sunucuda saklanan ifadesinden gelir (sayisal.beklenen_coz);
+    verilmezse puanlama yalnızca metne bakar.
+    """
     # 1. Temizlik ve Normalizasyon
     cevap_orijinal = ogrenci_cevabi.lower().strip()
     cevap_norm = turkce_karakter_temizle(cevap_orijinal)
@@ -132,6 +165,12 @@ def puanla_akilli(ogrenci_cevabi, soru_metni):
     # Maksimum Puan Kontrolü
     if puan > 100: puan = 100
 
+    # --- 4. SAYISAL DOĞRULUK: yazılan sonuç ve ara adımlar Fraction ile denetlenir ---
+    denetim = None
+    if beklenen is not None:
+        denetim = sayisal_denetle(ogrenci_cevabi, beklenen)
+        puan = round((1 - SAYISAL_AGIRLIK) * puan + SAYISAL_AGIRLIK * denetim["puan"])
+
     # --- Geri Bildirim Oluşturma (Geliştirilmiş) ---
     
     # Detaylı geri bildirim için ipuçları
@@ -150,6 +189,9 @@ def puanla_akilli(ogrenci_cevabi, soru_metni):
         seviye = "yetersiz"
         mesaj = "Yetersiz. Cevabını adım adım, matematiksel terimler (payda, pay, eşitleme) kullanarak ve 'çünkü' ile sebep belirterek tekrar yazmalısın."
 
+    if denetim is not None:
+        mesaj += " " + sayisal_mesaj(denetim, beklenen)
+
     return {
         "toplam": int(puan),
         "seviye": seviye,
@@ -157,14 +199,23 @@ def puanla_akilli(ogrenci_cevabi, soru_metni):
         "geri_bildirim": mesaj
     }
 # ============= MATEMATİK MOTORU (HATASIZ SORU ÜRETİCİSİ) =============
-def rasyonel_soru_uret_motoru():
-    """Python ile hatasız rasyonel sayı sorusu üretir (Toplama, Çıkarma, Çarpma, Bölme dahil)"""
+KALIBRASYON = Kalibrasyon()
+KALIBRASYON_DENEME = 40  # Bu kadar denemede istenen zorlukta madde çıkmazsa ilk geçerli soru kullanılır
+
+def rasyonel_soru_uret_motoru(islem: Islem = None, zorluk: Zorluk = None):
+    """Python ile hatasız rasyonel sayı sorusu üretir (Toplama, Çıkarma, Çarpma, Bölme dahil)
+
+    `islem` verilirse soru o işlemle üretilir; verilmezse işlem rastgele seçilir.
+    `zorluk` verilir ve kalibrasyon tablosu yüklüyse, geçmiş verilere göre o
+    zorluk bandına düşen maddeler tercih edilir.
+    """
+    deneme = 0
     payda_limit = 12 
     islemler = ['+', '-', '*', '/']
     semboller = {'+': 'toplama', '-': 'çıkarma', '*': 'çarpma', '/': 'bölme'}
     
     while True:
-        op = random.choice(islemler)
+        op = islem.sembol if islem is not None else random.choice(islemler)
         s1 = Fraction(random.randint(-5, 5), random.randint(2, 6))
         s2 = Fraction(random.randint(-5, 5), random.randint(2, 6))
         
@@ -187,48 +238,34 @@ def rasyonel_soru_uret_motoru():
         # Filtre: Sonuç çok karışık olmasın (payda limiti ve pay limiti)
         if sonuc.denominator <= payda_limit and -10 <= sonuc.numerator <= 10:
             
+            # Kalibrasyon: madde başka bir zorluk bandındaysa (sınırlı sayıda) yeniden dene.
+            # Verisi olmayan (kalibre edilmemiş) madde her banda uygun sayılır.
+            deneme += 1
+            if zorluk is not None and KALIBRASYON and deneme <= KALIBRASYON_DENEME:
+                bant = KALIBRASYON.zorluk(f"{s1} {op} {s2}")
+                if bant is not None and bant != zorluk:
+                    continue
+
             # Soru Metni Oluştur
             soru = f"({s1}) {op} ({s2}) işleminin sonucunun neden {sonuc} olduğunu adım adım açıkla."
             return soru
 # =====================================================================
 # ============= AKILLI SORU ÜRETİMİ =============
-def zorluk_belirle_akilli(profil: dict) -> str:
-    """Öğrenci performansına göre zorluk seviyesi belirler"""
-    puanlar = profil.get("gecmis_puanlar", [])
-    
-    if not puanlar:
-        return "temel"
-    
-    # Son 3 sorunun ortalaması
-    son_3 = puanlar[-3:] if len(puanlar) >= 3 else puanlar
-    ortalama = sum(son_3) / len(son_3)
-    max_puan = 100  # Düzeltildi: 100 üzerinden puanlama
-    
-    # Yüzdelik performans
-    yuzde = (ortalama / max_puan) * 100
-    
-    # Trend analizi (yükseliyor mu düşüyor mu?)
-    if len(puanlar) >= 2:
-        trend = puanlar[-1] - puanlar[-2]
-    else:
-        trend = 0
-    
-    # Dinamik zorluk belirleme (Hassaslaştırılmış Eşikler)
-    if yuzde >= 85 and trend >= 0: # %85 ve üzeri (Daha zorlayıcı eşik)
-        return "ileri"
-    elif yuzde >= 65 and trend >= -1: # %65 ve üzeri (Daha zorlayıcı eşik)        
-        return "orta"
-    else: # %65 altı
-        return "temel"
+def zorluk_belirle_akilli(profil: Ogrenci) -> str:
+    """Öğrenci performansına göre zorluk seviyesi belirler (bkz. adaptif.py)"""
+    return adaptif.zorluk_sec(profil).metin
+
+def soru_uret_akilli(profil: Ogrenci):
+    """Öğrencinin geçmiş performansına göre adaptif ve özgün soru üretir.
 
-def soru_uret_akilli(profil: dict) -> str:
-    """Öğrencinin geçmiş performansına göre adaptif ve özgün soru üretir"""
+    Profili değiştirmez; kaydedilecek SoruDenemesi'ni (uygulama bittiyse None) döndürür.
+    """
     
     # 1. Zorluk seviyesini belirle
     zorluk_seviyesi = zorluk_belirle_akilli(profil)
     
     # 2. Daha önce sorulan soruları al
-    gecmis_sorular = profil.get("gecmis_sorular", [])
+    gecmis_sorular = profil.gecmis_sorular
     
     # 3. Konu Seçimi
     # Sadece Rasyonel Sayılar konusunu seç
@@ -239,7 +276,9 @@ def soru_uret_akilli(profil: dict) -> str:
     # --- YENİLİK BURADA: Rasyonel Sayı ise Motoru Kullan ---
     if konu == "rasyonel":
         # Matematik motorundan %100 doğru soru al
-        soru_metni = rasyonel_soru_uret_motoru()
+        # İşlem, öğrencinin en zayıf olduğu işlemlere ağırlık verilerek seçilir
+        islem = adaptif.islem_sec(adaptif.istatistik_hazirla(profil))
+        soru_metni = rasyonel_soru_uret_motoru(islem, Zorluk.coz(zorluk_seviyesi))
         
     else:
         # Diğer konular (Cebir, Denklem) için eski şablon sistemini kullan
@@ -258,7 +297,7 @@ def soru_uret_akilli(profil: dict) -> str:
                 continue
             
             # Soru tekrar kontrolü
-            if any(s['soru'] == soru_metni for s in gecmis_sorular):
+            if any(s.soru == soru_metni for s in gecmis_sorular):
                 soru_metni = ""
                 deneme_sayisi += 1
             else:
@@ -269,22 +308,26 @@ def soru_uret_akilli(profil: dict) -> str:
         soru_metni = "1/2 + 1/3 işleminin sonucunu adım adım açıkla."
 
     # Soru numarasını kontrol et
-    soru_no = profil.get("soru_sayisi", 0) + 1
+    soru_no = profil.soru_sayisi + 1
     if soru_no > 10:
-        return "UYGULAMA_BITTI"
+        return None
         
-    # Yeni soruyu geçmişe ekle
-    profil["gecmis_sorular"].append({
-        "soru_no": soru_no,
-        "konu": konu,
-        "zorluk": zorluk_seviyesi,
-        "soru": soru_metni,
-        "puan": 0 
-    })
-    
-    return soru_metni
+    return SoruDenemesi.yeni(
+        soru_no=soru_no,
+        konu=Konu.coz(konu),
+        zorluk=Zorluk.coz(zorluk_seviyesi),
+        soru=soru_metni,
+    )
+def _sonraki_soruyu_hazirla(uid):
+    profil = PARCALAR.getir(uid)
+    return soru_uret_akilli(profil) if profil else None
+
+# Cevap puanlanınca sonraki soru arka planda hazırlanır; /soru isteği hazır soruyu sunar
+HAZIRLAYICI = SoruHazirlayici(_sonraki_soruyu_hazirla)
+# Cevap gönderimi patlamalarında eşzamanlılık sınırı ve tekrar gönderim bastırma
+KABUL = KabulKontrolu()
 # ============= FLASK ROUTES =============
-@app.route("/")
+@bp.route("/")
 def index():
     return render_template_string("""
     <!doctype html>
@@ -293,19 +336,10 @@ def index():
         <meta charset="utf-8">
         <meta name="viewport" content="width=device-width, initial-scale=1">
         <title>DynaProof – Giriş</title>
-        <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css" rel="stylesheet">
-        <style>
-            body { 
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100% ); 
-                min-height: 100vh; 
-                display: flex;
-                align-items: center;
-            }
-            .card { border-radius: 20px; box-shadow: 0 15px 35px rgba(0,0,0,0.3); }
-            .logo { font-size: 3rem; margin-bottom: 10px; }
-        </style>
+        <link href="{{ bootstrap_css }}" rel="stylesheet">
+        <link href="{{ varlik('dynaproof.css') }}" rel="stylesheet">
     </head>
-    <body>
+    <body class="giris">
         <div class="container" style="max-width:500px">
             <div class="card p-5">
                 <div class="text-center logo">🎓</div>
@@ -323,10 +357,7 @@ def index():
                     <div class="mb-4">
                         <label class="form-label fw-bold">Sınıfın</label>
                         <select class="form-select form-select-lg" name="sinif">
-                            <option value="7-A">7-A</option>
-                            <option value="7-B">7-B</option>
-                            <option value="7-C">7-C</option>
-                            <option value="7-D">7-D</option>
+                            {% for s in siniflar %}<option value="{{ s }}">{{ s }}</option>{% endfor %}
                         </select>
                     </div>
                     <button class="btn btn-primary btn-lg w-100">Başla 🚀</button>
@@ -335,79 +366,58 @@ def index():
         </div>
     </body>
     </html>
-    """)
+    """, siniflar=SINIFLAR)
 
-@app.route("/basla", methods=["POST"])
+@bp.route("/basla", methods=["POST"])
 def basla():
     ad = request.form.get("ad", "").strip()
     soyad = request.form.get("soyad", "").strip()
-    sinif = request.form.get("sinif", "")
-    
-    if not ad or not soyad:
-        return redirect(url_for("index"))
-    
-    uid = str(uuid.uuid4())[:8]
-    students = {}
-    if os.path.exists(STUDENT_FILE):
-        with open(STUDENT_FILE, encoding="utf-8-sig") as f:
-            students = json.load(f)
-    
-    students[uid] = {
-        "ad": ad,
-        "soyad": soyad,
-        "sinif": sinif,
-        "gecmis_puanlar": [],
-        "gecmis_sorular": [], # Yeni eklendi
-        "soru_sayisi": 0,
-        "kayit_zamani": datetime.datetime.now().isoformat()
-    }
+    sinif = request.form.get("sinif", "").strip().upper()
+    
+    if not ad or not soyad or sinif not in SINIFLAR:
+        return redirect(url_for(".index"))
     
-    with open(STUDENT_FILE, "w", encoding="utf-8-sig") as f:
-        json.dump(students, f, ensure_ascii=False, indent=2)
+    # uid öneki öğrencinin sınıf parçasını gösterir (sonraki istekler oraya yönlenir)
+    uid = uid_uret(sinif)
     
-    return redirect(url_for("soru", uid=uid))
+    PARCALAR.sinif_parcasi(sinif).depo.kaydet(uid, Ogrenci(
+        ad=ad,
+        soyad=soyad,
+        sinif=sinif,
+        kayit_zamani=datetime.datetime.now().isoformat()
+    ))
+    
+    return redirect(url_for(".soru", uid=uid))
 
-@app.route("/soru/<uid>")
+@bp.route("/soru/<uid>")
 def soru(uid):
-    students = {}
-    if os.path.exists(STUDENT_FILE):
-        try:
-            with open(STUDENT_FILE, encoding="utf-8-sig") as f:
-                content = f.read().strip()
-                if content:
-                    students = json.loads(content)
-        except:
-            pass
-    
-    profil = students.get(uid)
+    profil = PARCALAR.getir(uid)
     if not profil:
-        return redirect(url_for("index"))
-        
-    if "gecmis_sorular" not in profil:
-        profil["gecmis_sorular"] = []
+        return redirect(url_for(".index"))
     
-    soru_no = profil.get("soru_sayisi", 0) + 1
+    soru_no = profil.soru_sayisi + 1
     
     if soru_no > 10:
-        return redirect(url_for("sonuc_ozet", uid=uid))
+        HAZIRLAYICI.iptal(uid)
+        return redirect(url_for(".sonuc_ozet", uid=uid))
         
     # --- HATA DÜZELTME: SORU ÜRETİM KONTROLÜ ---
-    gecmis_sorular = profil.get("gecmis_sorular", [])
+    gecmis_sorular = profil.gecmis_sorular
     
     # Eğer hiç soru yoksa VEYA son soru numarası uyuşmuyorsa yeni soru üret
-    if not gecmis_sorular or gecmis_sorular[-1]["soru_no"] != soru_no:
-        soru_uret_akilli(profil)
-        # Soru ürettikten sonra listeyi dosyaya kaydetmeyi unutma
-        with open(STUDENT_FILE, "w", encoding="utf-8-sig") as f:
-            json.dump(students, f, ensure_ascii=False, indent=2)
+    if not gecmis_sorular or gecmis_sorular[-1].soru_no != soru_no:
+        yeni_soru = HAZIRLAYICI.al(uid, soru_no) or soru_uret_akilli(profil)
+        # Soruyu günlüğe kaydet (tüm dosya yeniden yazılmaz)
+        if yeni_soru is not None:
+            PARCALAR.depo(uid).soru_ekle(uid, yeni_soru)
             
     # Garantilemek için tekrar oku (IndexError önlemi)
-    if not profil["gecmis_sorular"]:
+    if not profil.gecmis_sorular:
         return "Soru üretilemedi, lütfen sayfayı yenileyin."
 
-    soru_bilgisi = profil["gecmis_sorular"][-1]
-    soru_metni = soru_bilgisi["soru"]
-    zorluk = soru_bilgisi["zorluk"]
+    soru_bilgisi = profil.gecmis_sorular[-1]
+    soru_metni = soru_bilgisi.soru
+    zorluk = soru_bilgisi.zorluk.metin
     
     zorluk_renk = {"temel": "success", "orta": "warning", "ileri": "danger"}
     zorluk_emoji = {"temel": "🌱", "orta": "🌿", "ileri": "🌳"}
@@ -420,22 +430,10 @@ def soru(uid):
         <meta charset="utf-8">
         <meta name="viewport" content="width=device-width, initial-scale=1">
         <title>Soru {{soru_no}}</title>
-        <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css" rel="stylesheet">
-        <style>
-            body { background: linear-gradient(135deg, #667eea 0%, #764ba2 100% ); min-height: 100vh; padding: 20px; }
-            .card { border-radius: 15px; box-shadow: 0 10px 30px rgba(0,0,0,0.2); }
-            .soru-box { 
-                background: linear-gradient(135deg, #f5f7fa 0%, #c3cfe2 100%);
-                border-left: 5px solid #667eea; 
-                padding: 25px; 
-                border-radius: 12px;
-                font-size: 1.1rem;
-            }
-            textarea { font-size: 1rem; line-height: 1.8; }
-            .ipucu-box { background: #fff3cd; border-left: 4px solid #ffc107; }
-        </style>
+        <link href="{{ bootstrap_css }}" rel="stylesheet">
+        <link href="{{ varlik('dynaproof.css') }}" rel="stylesheet">
     </head>
-    <body>
+    <body class="ogrenci">
         <div class="container" style="max-width:800px">
             <div class="card p-4 mb-3">
                 <div class="d-flex justify-content-between align-items-center">
@@ -490,107 +488,128 @@ def soru(uid):
     </body>
     </html>
     """, uid=uid, soru=soru_metni, soru_no=soru_no, 
-         ad=profil["ad"], soyad=profil["soyad"], sinif=profil["sinif"],
+         ad=profil.ad, soyad=profil.soyad, sinif=profil.sinif,
          zorluk=zorluk, zorluk_renk=zorluk_renk.get(zorluk, "primary"), 
          zorluk_emoji=zorluk_emoji.get(zorluk, "❓"))
 
-@app.route("/cevap/<uid>", methods=["POST"])
+@bp.route("/cevap/<uid>", methods=["POST"])
 def cevap(uid):
+    # Aynı soruya ikinci gönderim yeniden işlenmez, ilkinin sonucu döner; yoğunlukta
+    # istekler sınırsız beklemez, hemen 503 ile geri çevrilir (kabul.py)
+    soru_no = int(request.form.get("soru_no", 1))
+    try:
+        with KABUL.giris(uid, soru_no) as giris:
+            if giris.onceki is None:
+                giris.tamamla(_cevap_isle(uid))
+            return redirect(giris.onceki or giris.sonuc)
+    except Doygun as e:
+        return _yogunluk_sayfasi(e), 503, {"Retry-After": str(e.tekrar)}
+
+def _yogunluk_sayfasi(hata):
+    """Gönderilen formu saklayıp `tekrar` saniye sonra kendiliğinden yeniden gönderen sayfa"""
+    return render_template_string("""
+    <!doctype html>
+    <html lang="tr">
+    <head>
+        <meta charset="utf-8">
+        <meta name="viewport" content="width=device-width, initial-scale=1">
+        <title>Biraz bekle</title>
+        <link href="{{ bootstrap_css }}" rel="stylesheet">
+        <link href="{{ varlik('dynaproof.css') }}" rel="stylesheet">
+    </head>
+    <body class="ogrenci">
+        <div class="container" style="max-width:600px">
+            <div class="card p-4 text-center">
+                <h5>⏳ {{ mesaj }}</h5>
+                <p class="text-muted">Cevabın kaybolmadı; <span id="sayac">{{ tekrar }}</span> saniye içinde yeniden gönderilecek.</p>
+                <form id="yeniden" method="post">
+                    {% for ad, deger in alanlar %}<input type="hidden" name="{{ ad }}" value="{{ deger }}">{% endfor %}
+                    <button class="btn btn-primary">Şimdi Gönder</button>
+                </form>
+            </div>
+        </div>
+        <script>
+            let kalan = {{ tekrar }};
+            const zamanlayici = setInterval(() => {
+                kalan -= 1;
+                document.getElementById('sayac').textContent = Math.max(kalan, 0);
+                if (kalan <= 0) { clearInterval(zamanlayici); document.getElementById('yeniden').submit(); }
+            }, 1000);
+        </script>
+    </body>
+    </html>
+    """, mesaj=str(hata), tekrar=hata.tekrar, alanlar=list(request.form.items(multi=True)))
+
+def _cevap_isle(uid):
+    """Cevabı puanlar ve kaydeder; yönlendirilecek adresi döndürür"""
     cevap_metni = request.form.get("cevap", "").strip()
     soru_metni = request.form.get("soru_metni", "")
     soru_no = int(request.form.get("soru_no", 1))
     zorluk = request.form.get("zorluk", "temel")
     
-    students = {}
-    # Güvenli okuma
-    if os.path.exists(STUDENT_FILE):
-        try:
-            with open(STUDENT_FILE, encoding="utf-8-sig") as f:
-                content = f.read().strip()
-                if content:
-                    students = json.loads(content)
-        except:
-            students = {}
-    
-    profil = students.get(uid)
+    profil = PARCALAR.getir(uid)
     if not profil:
-        return redirect(url_for("index"))
-        
-    if "gecmis_sorular" not in profil:
-        profil["gecmis_sorular"] = []
+        return url_for(".index")
     
     # --- HATA DÜZELTME: LİSTE KONTROLÜ ---
     # Eğer geçmiş sorular listesi boşsa, puan verilecek bir soru yok demektir.
     # Kullanıcıyı yeni soru üretmesi için soru sayfasına yönlendir.
-    if not profil["gecmis_sorular"]:
-        return redirect(url_for("soru", uid=uid))
+    if not profil.gecmis_sorular:
+        return url_for(".soru", uid=uid)
         
-    # Akıllı puanlama
-    sonuc = puanla_akilli(cevap_metni, soru_metni)
-    
-    # Son sorunun puanını geçmişe kaydet
-    profil["gecmis_sorular"][-1]["puan"] = sonuc["toplam"]
+    # Akıllı puanlama; beklenen sonuç formdan değil, sunucudaki sorudan alınır
+    sonuc = puanla_akilli(cevap_metni, soru_metni, beklenen_coz(profil.gecmis_sorular[-1].ifade))
     
-    # Soru sayısını artır
-    profil["soru_sayisi"] = profil.get("soru_sayisi", 0) + 1
-    yeni_soru_no = profil["soru_sayisi"] + 1
+    # Son sorunun puanını geçmişe kaydet (soru sayısı ve adaptif istatistikler de güncellenir)
+    if not PARCALAR.depo(uid).cevap_isle(uid, sonuc["toplam"]):
+        # Bu soru zaten puanlanmış (ör. form iki kez gönderildi)
+        return url_for(".soru", uid=uid)
+    yeni_soru_no = profil.soru_sayisi + 1
     
-    with open(STUDENT_FILE, "w", encoding="utf-8-sig") as f:
-        json.dump(students, f, ensure_ascii=False, indent=2)
+    # Sonraki soruyu şimdiden hazırlat; oturum bittiyse bekleyen hazırlığı iptal et
+    if yeni_soru_no <= 10:
+        HAZIRLAYICI.planla(uid)
+    else:
+        HAZIRLAYICI.iptal(uid)
         
     # CSV Kaydı
     try:
-        new_row = pd.DataFrame([{
-            "zaman": datetime.datetime.now().strftime("%d-%m-%Y %H:%M"),
-            "uid": uid,
-            "ad_soyad": f"{profil.get('ad', '')} {profil.get('soyad', '')}",
-            "sinif": profil.get('sinif', ''),
-            "soru": soru_metni,
-            "cevap": cevap_metni,
-            "puan": sonuc["toplam"],
-            "zorluk": zorluk,
-            "soru_no": soru_no,
-            "geri_bildirim": sonuc["geri_bildirim"].replace('\n', ' | ')
-        }])
-        
-        # Dosya yoksa başlıklarla oluştur
-        if not os.path.exists(CSV_FILE):
-            new_row.to_csv(CSV_FILE, index=False, encoding="utf-8-sig")
-        else:
-            new_row.to_csv(CSV_FILE, mode='a', header=False, index=False, encoding="utf-8-sig")
+        PARCALAR.defter(uid).ekle(CevapKaydi(
+            zaman=datetime.datetime.now().strftime("%d-%m-%Y %H:%M"),
+            uid=uid,
+            ad_soyad=profil.ad_soyad,
+            sinif=profil.sinif,
+            soru=soru_metni,
+            cevap=cevap_metni,
+            puan=sonuc["toplam"],
+            zorluk=Zorluk.coz(zorluk),
+            soru_no=soru_no,
+            geri_bildirim=sonuc["geri_bildirim"].replace('\n', ' | ')
+        ))
     except Exception as e:
         print(f"CSV Hatası: {e}")
     
-    return redirect(url_for("sonuc", uid=uid, puan=sonuc["toplam"], 
-                           seviye=sonuc["seviye"], soru_no=yeni_soru_no, 
-                           max_puan=sonuc["max_puan"],
-                           geri_bildirim=sonuc["geri_bildirim"]))
+    return url_for(".sonuc", uid=uid, puan=sonuc["toplam"], 
+                   seviye=sonuc["seviye"], soru_no=yeni_soru_no, 
+                   max_puan=sonuc["max_puan"],
+                   geri_bildirim=sonuc["geri_bildirim"])
 
-@app.route("/sonuc_ozet/<uid>")
+@bp.route("/sonuc_ozet/<uid>")
 def sonuc_ozet(uid):
-    students = {}
-    if os.path.exists(STUDENT_FILE):
-        with open(STUDENT_FILE, encoding="utf-8-sig") as f:
-            students = json.load(f)
-    
-    profil = students.get(uid)
+    profil = PARCALAR.getir(uid)
     if not profil:
-        return redirect(url_for("index"))
-        
-    # Geriye dönük uyumluluk için kontrol
-    if "gecmis_sorular" not in profil:
-        profil["gecmis_sorular"] = []
+        return redirect(url_for(".index"))
         
-    gecmis_sorular = profil.get("gecmis_sorular", [])
-    toplam_puan = sum(s['puan'] for s in gecmis_sorular)
+    gecmis_sorular = profil.gecmis_sorular
+    toplam_puan = sum(s.puan for s in gecmis_sorular)
     ortalama_puan = round(toplam_puan / len(gecmis_sorular), 1) if gecmis_sorular else 0
     max_puan = 100
     
     # Konu bazlı performans
     konu_performans = {}
     for s in gecmis_sorular:
-        konu = s['konu']
-        puan = s['puan']
+        konu = s.konu.metin
+        puan = s.puan
         if konu not in konu_performans:
             konu_performans[konu] = {'toplam': 0, 'sayi': 0}
         konu_performans[konu]['toplam'] += puan
@@ -610,18 +629,14 @@ def sonuc_ozet(uid):
         <meta charset="utf-8">
         <meta name="viewport" content="width=device-width, initial-scale=1">
         <title>Uygulama Özeti</title>
-        <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css" rel="stylesheet">
-        <style>
-            body { background: linear-gradient(135deg, #667eea 0%, #764ba2 100% ); min-height: 100vh; padding: 20px; }
-            .card { border-radius: 15px; box-shadow: 0 10px 30px rgba(0,0,0,0.2); }
-            .puan-box { font-size: 3.5rem; font-weight: bold; }
-        </style>
+        <link href="{{ bootstrap_css }}" rel="stylesheet">
+        <link href="{{ varlik('dynaproof.css') }}" rel="stylesheet">
     </head>
-    <body>
+    <body class="ogrenci">
         <div class="container" style="max-width:700px">
             <div class="card p-5 text-center">
                 <h2 class="mb-4">🎉 Tebrikler, Uygulama Bitti!</h2>
-                <p class="lead"><strong>{{ profil['ad'] }} {{ profil['soyad'] }}</strong>, 10 soruluk akademik başarı testini tamamladın.</p>
+                <p class="lead"><strong>{{ profil.ad }} {{ profil.soyad }}</strong>, 10 soruluk akademik başarı testini tamamladın.</p>
                 
                 <div class="puan-box text-success mb-2">{{ ortalama_puan }}/{{ max_puan }}</div>
                 <p class="text-muted mb-4">Ortalama Başarı Puanın</p>
@@ -643,7 +658,7 @@ def sonuc_ozet(uid):
     </html>
     """, profil=profil, ortalama_puan=ortalama_puan, max_puan=max_puan, konu_ozet=konu_ozet)
 
-@app.route("/sonuc/<uid>")
+@bp.route("/sonuc/<uid>")
 def sonuc(uid):
     puan = int(request.args.get("puan", 0))
     max_puan = int(request.args.get("max_puan", 100))
@@ -651,18 +666,9 @@ def sonuc(uid):
     soru_no = int(request.args.get("soru_no", 1))
     geri_bildirim = request.args.get("geri_bildirim", "")
     
-    students = {}
-    if os.path.exists(STUDENT_FILE):
-        with open(STUDENT_FILE, encoding="utf-8-sig") as f:
-            students = json.load(f)
-    
-    profil = students.get(uid)
+    profil = PARCALAR.getir(uid)
     if not profil:
-        return redirect(url_for("index"))
-        
-    # Geriye dönük uyumluluk için kontrol
-    if "gecmis_sorular" not in profil:
-        profil["gecmis_sorular"] = []
+        return redirect(url_for(".index"))
     
     mesajlar = {
         "mükemmel": "🌟 Mükemmel! Harika bir ispat yazdın!",
@@ -680,7 +686,7 @@ def sonuc(uid):
         "yetersiz": "danger"
     }
     
-    puanlar = profil["gecmis_puanlar"]
+    puanlar = profil.gecmis_puanlar
     ortalama = round(sum(puanlar) / len(puanlar), 1) if puanlar else 0
     yuzde = round((puan / max_puan) * 100)
     
@@ -691,16 +697,10 @@ def sonuc(uid):
         <meta charset="utf-8">
         <meta name="viewport" content="width=device-width, initial-scale=1">
         <title>Sonuç</title>
-        <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css" rel="stylesheet">
-        <style>
-            body { background: linear-gradient(135deg, #667eea 0%, #764ba2 100% ); min-height: 100vh; padding: 20px; }
-            .card { border-radius: 15px; box-shadow: 0 10px 30px rgba(0,0,0,0.2); }
-            .puan-box { font-size: 3.5rem; font-weight: bold; }
-            .geri-bildirim-box { background: #f8f9fa; border-radius: 10px; padding: 20px; white-space: pre-line; }
-            .progress { height: 25px; }
-        </style>
+        <link href="{{ bootstrap_css }}" rel="stylesheet">
+        <link href="{{ varlik('dynaproof.css') }}" rel="stylesheet">
     </head>
-    <body>
+    <body class="ogrenci sonuc">
         <div class="container" style="max-width:700px">
             <div class="card p-5 text-center">
                 <div class="puan-box text-{{renk}} mb-2">{{puan}}/{{max_puan}}</div>
@@ -756,53 +756,59 @@ def sonuc(uid):
          soru_no=soru_no, uid=uid, ortalama=ortalama,
          geri_bildirim=geri_bildirim)
 # ============= VERİ ANALİZİ VE RAPORLAMA =============
-@app.route("/admin/rapor")
-def admin_rapor():
-    """Tüm öğrencilerin verilerini düzenli şekilde gösterir"""
-    import pandas as pd
-    from io import StringIO
-    
-    if not os.path.exists(CSV_FILE):
-        return "Henüz veri yok!"
-    
-    # CSV'yi oku
-    df = pd.read_csv(CSV_FILE, encoding='utf-8', on_bad_lines='skip', engine='python')
-    
-    # Öğrencilere göre grupla
-    ogrenci_raporlari = []
-    
-    for uid in df['uid'].unique():
-        ogrenci_df = df[df['uid'] == uid].sort_values('soru_no')
-        
-        if len(ogrenci_df) == 0:
-            continue
-        
-        ilk_kayit = ogrenci_df.iloc[0]
-        
-        # Sorular ve cevaplar
-        sorular_cevaplar = []
-        for idx, row in ogrenci_df.iterrows():
-            sorular_cevaplar.append({
-                'soru_no': row['soru_no'],
-                'zorluk': row['zorluk'],
-                'soru': row['soru'],
-                'cevap': row['cevap'][:200] + '...' if len(row['cevap']) > 200 else row['cevap'],
-                'puan': row['puan'],
-                'geri_bildirim': row['geri_bildirim']
-            })
-        
-        # Öğrenci özet bilgileri
-        ogrenci_raporlari.append({
-            'ad_soyad': ilk_kayit['ad_soyad'],
-            'sinif': ilk_kayit['sinif'],
-            'giris_saati': ilk_kayit['zaman'],
-            'toplam_soru': len(ogrenci_df),
-            'ortalama_puan': round(ogrenci_df['puan'].mean(), 1),
-            'en_yuksek_puan': ogrenci_df['puan'].max(),
-            'en_dusuk_puan': ogrenci_df['puan'].min(),
-            'sorular_cevaplar': sorular_cevaplar
-        })
+@bp.route("/admin/metrikler")
+def admin_metrikler():
+    """Çalışma zamanı sayaçları (JSON)"""
+    return jsonify({"on_uretim": HAZIRLAYICI.metrikler(), "isler": ISLER.metrikler(),
+                    "kabul": KABUL.metrikler()})
+
+def _sayi_param(ad):
+    deger = request.args.get(ad, "").strip()
+    if not deger:
+        return None
+    try:
+        return int(deger)
+    except ValueError:
+        raise SorguHatasi(f"{ad} bir tam sayı olmalı")
+
+@bp.route("/admin/api/kayitlar")
+def admin_api_kayitlar():
+    """Cevap kayıtlarını filtreleyip sayfa sayfa döndürür (JSON).
+
+    Parametreler: sinif, uid, zorluk, baslangic, bitis (YYYY-AA-GG), min_puan,
+    max_puan, sirala, yon (artan/azalan), limit, imlec, kisalt.
+    """
+    try:
+        limit = _sayi_param("limit")
+        # Rapor tablosu için uzun cevaplar kısaltılır (tam metin Excel çıktısında)
+        kisalt = _sayi_param("kisalt")
+        if kisalt is not None and kisalt < 0:
+            raise SorguHatasi("kisalt negatif olamaz")
+        sayfa = PARCALAR.sorgula(
+            sinif=request.args.get("sinif") or None,
+            uid=request.args.get("uid") or None,
+            zorluk=request.args.get("zorluk") or None,
+            baslangic=request.args.get("baslangic") or None,
+            bitis=request.args.get("bitis") or None,
+            min_puan=_sayi_param("min_puan"),
+            max_puan=_sayi_param("max_puan"),
+            sirala=request.args.get("sirala", "zaman"),
+            azalan=request.args.get("yon", "azalan") != "artan",
+            limit=50 if limit is None else limit,
+            imlec=request.args.get("imlec") or None,
+        )
+    except SorguHatasi as e:
+        return jsonify({"hata": str(e)}), 400
     
+    if kisalt:
+        for k in sayfa["kayitlar"]:
+            if len(k["cevap"]) > kisalt:
+                k["cevap"] = k["cevap"][:kisalt] + "..."
+    return jsonify(sayfa)
+
+@bp.route("/admin/rapor")
+def admin_rapor():
+    """Filtrelenebilir rapor sayfası; kayıtlar API'den sayfa sayfa yüklenir"""
     return render_template_string("""
     <!doctype html>
     <html lang="tr">
@@ -810,22 +816,10 @@ def admin_rapor():
         <meta charset="utf-8">
         <meta name="viewport" content="width=device-width, initial-scale=1">
         <title>Akademik Rapor - DynaProof</title>
-        <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css" rel="stylesheet">
-        <style>
-            body { font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; padding: 20px; }
-            .header { background: linear-gradient(135deg, #667eea 0%, #764ba2 100% ); color: white; padding: 30px; border-radius: 10px; margin-bottom: 30px; }
-            .ogrenci-card { border: 2px solid #e0e0e0; border-radius: 10px; padding: 20px; margin-bottom: 30px; page-break-inside: avoid; }
-            .soru-detay { background: #f8f9fa; border-left: 4px solid #667eea; padding: 15px; margin: 10px 0; border-radius: 5px; }
-            .puan-badge { font-size: 1.2rem; font-weight: bold; padding: 5px 15px; border-radius: 20px; }
-            table { font-size: 0.9rem; }
-            .print-btn { position: fixed; top: 20px; right: 20px; z-index: 1000; }
-            @media print {
-                .print-btn, .no-print { display: none; }
-                .ogrenci-card { page-break-inside: avoid; }
-            }
-        </style>
+        <link href="{{ bootstrap_css }}" rel="stylesheet">
+        <link href="{{ varlik('dynaproof.css') }}" rel="stylesheet">
     </head>
-    <body>
+    <body class="rapor">
         <button class="btn btn-primary print-btn no-print" onclick="window.print()">🖨️ Yazdır / PDF</button>
         
         <div class="header text-center">
@@ -835,163 +829,262 @@ def admin_rapor():
         </div>
         
         <div class="container-fluid">
-            <div class="alert alert-info no-print">
-                <strong>📌 Rapor Bilgisi:</strong> Toplam {{ toplam_ogrenci }} öğrenci, {{ toplam_soru }} soru çözümü
-            </div>
-            
-            {% for ogrenci in ogrenciler %}
-            <div class="ogrenci-card">
-                <div class="row mb-3">
-                    <div class="col-md-8">
-                        <h3>👤 {{ ogrenci.ad_soyad }}</h3>
-                        <p class="text-muted mb-1">
-                            <strong>Sınıf:</strong> {{ ogrenci.sinif }} | 
-                            <strong>Giriş:</strong> {{ ogrenci.giris_saati }}
-                        </p>
-                    </div>
-                    <div class="col-md-4 text-end">
-                        <div class="mb-2">
-                            <span class="badge bg-primary">{{ ogrenci.toplam_soru }} Soru</span>
-                        </div>
-                        <div>
-                            <span class="puan-badge bg-success">Ort: {{ ogrenci.ortalama_puan }}/100</span>
-                        </div>
-                    </div>
+            <form id="filtre" class="row g-2 align-items-end mb-4 no-print">
+                <div class="col-md-1">
+                    <label class="form-label small fw-bold">Sınıf</label>
+                    <select class="form-select form-select-sm" name="sinif">
+                        <option value="">Tümü</option>
+                        {% for s in siniflar %}<option>{{ s }}</option>{% endfor %}
+                    </select>
                 </div>
-                
-                <table class="table table-bordered table-sm">
-                    <thead class="table-light">
-                        <tr>
-                            <th style="width: 5%">#</th>
-                            <th style="width: 10%">Zorluk</th>
-                            <th style="width: 30%">Soru</th>
-                            <th style="width: 30%">Cevap</th>
-                            <th style="width: 10%">Puan</th>
-                            <th style="width: 15%">Değerlendirme</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-                        {% for sc in ogrenci.sorular_cevaplar %}
-                        <tr>
-                            <td><strong>{{ sc.soru_no }}</strong></td>
-                            <td>
-                                {% if sc.zorluk == 'temel' %}
-                                <span class="badge bg-success">🌱 Temel</span>
-                                {% elif sc.zorluk == 'orta' %}
-                                <span class="badge bg-warning">🌿 Orta</span>
-                                {% else %}
-                                <span class="badge bg-danger">🌳 İleri</span>
-                                {% endif %}
-                            </td>
-                            <td><small>{{ sc.soru }}</small></td>
-                            <td><small style="color: #555;">{{ sc.cevap }}</small></td>
-                            <td class="text-center">
-                                <strong class="text-primary">{{ sc.puan }}/100</strong>
-                            </td>
-                            <td><small style="color: #666;">{{ sc.geri_bildirim[:100] }}...</small></td>
-                        </tr>
-                        {% endfor %}
-                    </tbody>
-                </table>
-                
-                <div class="row mt-3">
-                    <div class="col-4">
-                        <div class="alert alert-success mb-0 text-center">
-                            <strong>En Yüksek</strong>  
-{{ ogrenci.en_yuksek_puan }}/100
-                        </div>
-                    </div>
-                    <div class="col-4">
-                        <div class="alert alert-info mb-0 text-center">
-                            <strong>Ortalama</strong>  
-{{ ogrenci.ortalama_puan }}/100
-                        </div>
-                    </div>
-                    <div class="col-4">
-                        <div class="alert alert-warning mb-0 text-center">
-                            <strong>En Düşük</strong>  
-{{ ogrenci.en_dusuk_puan }}/100
-                        </div>
+                <div class="col-md-1">
+                    <label class="form-label small fw-bold">Zorluk</label>
+                    <select class="form-select form-select-sm" name="zorluk">
+                        <option value="">Tümü</option>
+                        <option value="temel">Temel</option>
+                        <option value="orta">Orta</option>
+                        <option value="ileri">İleri</option>
+                    </select>
+                </div>
+                <div class="col-md-2">
+                    <label class="form-label small fw-bold">Başlangıç</label>
+                    <input type="date" class="form-control form-control-sm" name="baslangic">
+                </div>
+                <div class="col-md-2">
+                    <label class="form-label small fw-bold">Bitiş</label>
+                    <input type="date" class="form-control form-control-sm" name="bitis">
+                </div>
+                <div class="col-md-1">
+                    <label class="form-label small fw-bold">Min Puan</label>
+                    <input type="number" class="form-control form-control-sm" name="min_puan" min="0" max="100">
+                </div>
+                <div class="col-md-1">
+                    <label class="form-label small fw-bold">Max Puan</label>
+                    <input type="number" class="form-control form-control-sm" name="max_puan" min="0" max="100">
+                </div>
+                <div class="col-md-2">
+                    <label class="form-label small fw-bold">Sırala</label>
+                    <div class="input-group input-group-sm">
+                        <select class="form-select" name="sirala">
+                            <option value="zaman">Zaman</option>
+                            <option value="puan">Puan</option>
+                            <option value="ad_soyad">Ad Soyad</option>
+                            <option value="sinif">Sınıf</option>
+                            <option value="soru_no">Soru No</option>
+                        </select>
+                        <select class="form-select" name="yon">
+                            <option value="azalan">↓</option>
+                            <option value="artan">↑</option>
+                        </select>
                     </div>
                 </div>
+                <input type="hidden" name="uid">
+                <div class="col-md-2">
+                    <button class="btn btn-primary btn-sm w-100">Filtrele</button>
+                </div>
+            </form>
+            
+            <div id="uid-filtre" class="alert alert-info py-2 no-print" style="display: none">
+                Yalnızca <strong id="uid-ad"></strong> gösteriliyor.
+                <a href="#" id="uid-temizle">Tüm öğrenciler</a>
+            </div>
+            
+            <table class="table table-bordered table-sm">
+                <thead class="table-light">
+                    <tr>
+                        <th style="width: 10%">Zaman</th>
+                        <th style="width: 12%">Öğrenci</th>
+                        <th style="width: 5%">#</th>
+                        <th style="width: 8%">Zorluk</th>
+                        <th style="width: 22%">Soru</th>
+                        <th style="width: 22%">Cevap</th>
+                        <th style="width: 6%">Puan</th>
+                        <th style="width: 15%">Değerlendirme</th>
+                    </tr>
+                </thead>
+                <tbody id="kayitlar"></tbody>
+            </table>
+            <div class="text-center no-print">
+                <div id="durum" class="text-muted small mb-2"></div>
+                <button id="daha-fazla" class="btn btn-outline-primary" style="display: none">Daha Fazla Yükle</button>
             </div>
-            {% endfor %}
         </div>
         
         <div class="text-center mt-5 mb-5">
-            <a href="/admin/excel-indir" class="btn btn-success btn-lg no-print">📥 Excel Olarak İndir</a>
+            <div id="is-durum" class="text-muted small mb-2 no-print"></div>
+            <button data-is="excel" class="btn btn-success btn-lg no-print">📥 Excel Olarak İndir</button>
+            <button data-is="csv" class="btn btn-outline-success btn-lg no-print">📄 CSV (filtreli)</button>
+            <button data-is="rapor" class="btn btn-outline-primary btn-lg no-print">🌐 HTML Rapor (filtreli)</button>
+            <button data-is="yeniden_puanla" class="btn btn-outline-secondary btn-lg no-print">🔁 Yeniden Puanla (önizleme)</button>
             <a href="/" class="btn btn-secondary btn-lg no-print">🏠 Ana Sayfa</a>
         </div>
+        
+        <script>
+        const ROZET = {temel: ['success', '🌱 Temel'], orta: ['warning', '🌿 Orta'], ileri: ['danger', '🌳 İleri']};
+        const form = document.getElementById('filtre');
+        const govde = document.getElementById('kayitlar');
+        const dahaFazla = document.getElementById('daha-fazla');
+        const durum = document.getElementById('durum');
+        let imlec = null, yukleniyor = false, sayac = 0;
+        
+        function hucre(tr, metin, sinif) {
+            const td = document.createElement('td');
+            const el = document.createElement(sinif ? 'strong' : 'small');
+            if (sinif) el.className = sinif;
+            el.textContent = metin;
+            td.appendChild(el);
+            tr.appendChild(td);
+            return td;
+        }
+        
+        function satirEkle(k) {
+            const tr = document.createElement('tr');
+            hucre(tr, k.zaman);
+            const ad = hucre(tr, k.ad_soyad + ' (' + k.sinif + ')');
+            ad.style.cursor = 'pointer';
+            ad.title = 'Yalnızca bu öğrenciyi göster';
+            ad.onclick = () => { form.uid.value = k.uid; document.getElementById('uid-ad').textContent = k.ad_soyad; yenidenYukle(); };
+            hucre(tr, k.soru_no);
+            const z = ROZET[k.zorluk] || ['secondary', k.zorluk];
+            const td = document.createElement('td');
+            const rozet = document.createElement('span');
+            rozet.className = 'badge bg-' + z[0];
+            rozet.textContent = z[1];
+            td.appendChild(rozet);
+            tr.appendChild(td);
+            hucre(tr, k.soru);
+            hucre(tr, k.cevap);
+            hucre(tr, k.puan + '/100', 'text-primary').classList.add('text-center');
+            hucre(tr, k.geri_bildirim.length > 100 ? k.geri_bildirim.slice(0, 100) + '...' : k.geri_bildirim);
+            govde.appendChild(tr);
+        }
+        
+        async function yukle() {
+            if (yukleniyor) return;
+            yukleniyor = true;
+            durum.textContent = 'Yükleniyor...';
+            const p = new URLSearchParams();
+            for (const [a, d] of new FormData(form)) if (d) p.set(a, d);
+            p.set('limit', 50);
+            p.set('kisalt', 200);
+            if (imlec) p.set('imlec', imlec);
+            try {
+                const yanit = await fetch('/admin/api/kayitlar?' + p);
+                const veri = await yanit.json();
+                if (!yanit.ok) { durum.textContent = veri.hata; return; }
+                veri.kayitlar.forEach(satirEkle);
+                sayac += veri.kayitlar.length;
+                imlec = veri.sonraki;
+                dahaFazla.style.display = imlec ? '' : 'none';
+                durum.textContent = sayac ? sayac + ' kayıt gösteriliyor' + (imlec ? '' : ' (tamamı)') : 'Kayıt bulunamadı.';
+            } finally {
+                yukleniyor = false;
+            }
+        }
+        
+        function yenidenYukle() {
+            govde.innerHTML = '';
+            imlec = null;
+            sayac = 0;
+            document.getElementById('uid-filtre').style.display = form.uid.value ? '' : 'none';
+            yukle();
+        }
+        
+        form.onsubmit = (e) => { e.preventDefault(); yenidenYukle(); };
+        dahaFazla.onclick = yukle;
+        document.getElementById('uid-temizle').onclick = (e) => { e.preventDefault(); form.uid.value = ''; yenidenYukle(); };
+        // Sayfa sonuna yaklaşınca sonraki sayfayı kendiliğinden getir
+        new IntersectionObserver((girdiler) => {
+            if (girdiler[0].isIntersecting && imlec) yukle();
+        }).observe(dahaFazla);
+        // Ağır çıktılar arka plan işi olarak hazırlanır; hazır olunca indirilir
+        const isDurum = document.getElementById('is-durum');
+        document.querySelectorAll('[data-is]').forEach((dugme) => dugme.onclick = async () => {
+            const p = new URLSearchParams({tur: dugme.dataset.is});
+            for (const [a, d] of new FormData(form)) if (d && a !== 'uid' && a !== 'sirala' && a !== 'yon') p.set(a, d);
+            const yanit = await fetch('/admin/isler', {method: 'POST', body: p});
+            const is = await yanit.json();
+            if (!yanit.ok) { isDurum.textContent = is.hata; return; }
+            isDurum.textContent = 'İş kuyrukta...';
+            const zamanlayici = setInterval(async () => {
+                const d = await (await fetch('/admin/isler/' + is.kimlik)).json();
+                if (d.durum === 'tamamlandi') {
+                    clearInterval(zamanlayici);
+                    isDurum.textContent = '';
+                    window.location = d.indir;
+                } else if (d.durum === 'hata') {
+                    clearInterval(zamanlayici);
+                    isDurum.textContent = 'İş başarısız: ' + d.hata;
+                } else if (d.ilerleme) {
+                    const i = d.ilerleme;
+                    isDurum.textContent = 'Hazırlanıyor (' + i.asama + '): ' + i.tamamlanan + (i.toplam ? ' / ' + i.toplam : '');
+                }
+            }, 1000);
+        });
+        yukle();
+        </script>
     </body>
     </html>
-    """, ogrenciler=ogrenci_raporlari, 
-         toplam_ogrenci=len(ogrenci_raporlari),
-         toplam_soru=sum(o['toplam_soru'] for o in ogrenci_raporlari),
-         tarih=datetime.datetime.now().strftime("%d.%m.%Y %H:%M"))
+    """, tarih=datetime.datetime.now().strftime("%d.%m.%Y %H:%M"), siniflar=SINIFLAR)
 
-@app.route("/admin/excel-indir")
+@bp.route("/admin/excel-indir", methods=["GET", "POST"])
 def excel_indir():
-    """Verileri düzenli Excel formatında indirir"""
-    import pandas as pd
-    from flask import send_file
-    import io
-    
-    if not os.path.exists(CSV_FILE):
-        return "Henüz veri yok!"
-    
-    # CSV'yi oku
-    df = pd.read_csv(CSV_FILE, encoding='utf-8', on_bad_lines='skip', engine='python')
-    
-    # Excel writer oluştur
-    output = io.BytesIO()
-    
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        # 1. Genel Özet Sayfası
-        ozet_data = []
-        for uid in df['uid'].unique():
-            ogrenci_df = df[df['uid'] == uid]
-            ilk_kayit = ogrenci_df.iloc[0]
-            
-            ozet_data.append({
-                'Ad Soyad': ilk_kayit['ad_soyad'],
-                'Sınıf': ilk_kayit['sinif'],
-                'Giriş Saati': ilk_kayit['zaman'],
-                'Toplam Soru': len(ogrenci_df),
-                'Ortalama Puan': round(ogrenci_df['puan'].mean(), 1),
-                'En Yüksek Puan': ogrenci_df['puan'].max(),
-                'En Düşük Puan': ogrenci_df['puan'].min()
-            })
-        
-        ozet_df = pd.DataFrame(ozet_data)
-        ozet_df.to_excel(writer, sheet_name='Genel Özet', index=False)
-        
-        # 2. Detaylı Veriler Sayfası
-        detay_df = df[['ad_soyad', 'sinif', 'zaman', 'soru_no', 'zorluk', 
-                       'soru', 'cevap', 'puan', 'geri_bildirim']].copy()
-        detay_df.columns = ['Ad Soyad', 'Sınıf', 'Zaman', 'Soru No', 'Zorluk', 
-                           'Soru', 'Cevap', 'Puan', 'Geri Bildirim']
-        detay_df.to_excel(writer, sheet_name='Detaylı Veriler', index=False)
-        
-        # 3. Her öğrenci için ayrı sayfa
-        for uid in df['uid'].unique():
-            ogrenci_df = df[df['uid'] == uid].copy()
-            ad_soyad = ogrenci_df.iloc[0]['ad_soyad']
-            
-            # Sayfa adını temizle (Excel için)
-            safe_name = ad_soyad.replace('/', '-')[:31]
-            
-            ogrenci_df_clean = ogrenci_df[['soru_no', 'zorluk', 'soru', 'cevap', 'puan', 'geri_bildirim']].copy()
-            ogrenci_df_clean.columns = ['Soru No', 'Zorluk', 'Soru', 'Cevap', 'Puan', 'Geri Bildirim']
-            ogrenci_df_clean.to_excel(writer, sheet_name=safe_name, index=False)
-    
-    output.seek(0)
-    
-    return send_file(
-        output,
-        mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-        as_attachment=True,
-        download_name=f'DynaProof_Rapor_{datetime.datetime.now().strftime("%Y%m%d_%H%M")}.xlsx'
-    )
+    """POST Excel raporunu arka plan işi olarak başlatır (bkz. /admin/isler); 202 ve iş durumu döner.
+
+    GET iş başlatmaz: son tamamlanan Excel çıktısına, yoksa rapor sayfasına yönlendirir.
+    """
+    if request.method == "POST":
+        return _is_gonder("excel")
+    for durum in ISLER.liste():
+        if durum["tur"] == "excel" and durum["durum"] == "tamamlandi":
+            return redirect(url_for(".admin_is_indir", kimlik=durum["kimlik"]))
+    return redirect(url_for(".admin_rapor"))
+
+# ============= ARKA PLAN İŞLERİ =============
+@bp.route("/admin/isler", methods=["POST"])
+def admin_is_gonder():
+    """İş gönderir (tur: excel, csv, rapor, yeniden_puanla + rapor filtreleri); 202 ve iş durumu döner"""
+    return _is_gonder(request.values.get("tur", ""))
+
+def _is_gonder(tur):
+    parametreler = {a: request.values.get(a, "").strip() for a in ("sinif", "zorluk", "baslangic", "bitis")}
+    try:
+        for ad in ("min_puan", "max_puan"):
+            deger = request.values.get(ad, "").strip()
+            if deger:
+                try:
+                    parametreler[ad] = int(deger)
+                except ValueError:
+                    raise SorguHatasi(f"{ad} bir tam sayı olmalı")
+        durum = ISLER.gonder(tur, parametreler)
+    except KuyrukDolu as e:
+        return jsonify({"hata": str(e)}), 429, {"Retry-After": "30"}
+    except (IsHatasi, SorguHatasi) as e:
+        return jsonify({"hata": str(e)}), 400
+    return jsonify(durum), 202, {"Location": url_for(".admin_is_durumu", kimlik=durum["kimlik"])}
+
+@bp.route("/admin/isler")
+def admin_isler():
+    return jsonify({"isler": ISLER.liste(), "metrikler": ISLER.metrikler()})
+
+@bp.route("/admin/isler/<kimlik>")
+def admin_is_durumu(kimlik):
+    durum = ISLER.durum(kimlik)
+    if durum is None:
+        return jsonify({"hata": "İş bulunamadı"}), 404
+    if durum["durum"] == "tamamlandi":
+        durum["indir"] = url_for(".admin_is_indir", kimlik=kimlik)
+    return jsonify(durum)
+
+@bp.route("/admin/isler/<kimlik>/indir")
+def admin_is_indir(kimlik):
+    yol = ISLER.dosya(kimlik)
+    if yol is None or not os.path.exists(yol):
+        return jsonify({"hata": "İş çıktısı hazır değil"}), 404
+    uzanti = os.path.splitext(yol)[1]
+    return send_file(yol, as_attachment=True,
+                     download_name=f'DynaProof_{ISLER.durum(kimlik)["tur"]}_{kimlik}{uzanti}')
+
 if __name__ == "__main__":
     print("\n" + "="*60)
     print("🚀 DynaProof - Gelişmiş Versiyon Başlatılıyor...")
@@ -999,4 +1092,5 @@ if __name__ == "__main__":
     print("📍 Adres: http://127.0.0.1:5000" )
     print("⚠️  Durdurmak için: Ctrl+C")
     print("="*60 + "\n")
+    app = create_app()
     app.run(debug=True, host='127.0.0.1', port=5001, use_reloader=False)
@@ -0,0 +1,126 @@
+"""Aktif öğrenciler için sonraki soruyu önceden hazırlayan arka plan kuyruğu.
+
+Bir cevap puanlandığı anda `planla(uid)` çağrılır; arka plandaki işçi, güncellenmiş
+zorluk istatistikleriyle öğrencinin sonraki sorusunu üretip bekletir. `/soru/<uid>`
+isteği geldiğinde `al(uid, soru_no)` hazır soruyu döndürür (isabet); hazır soru
+yoksa istek yolu soruyu eskisi gibi kendisi üretir (ıska).
+
+Kuyruk ve bekletilen soru sayısı sınırlıdır; kuyruk doluysa planlama düşürülür
+(soru istek anında üretilir). Oturum bittiğinde `iptal(uid)` bekleyen işi ve
+hazır soruyu geçersiz kılar.
+"""
+import itertools
+import logging
+import queue
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+AZAMI_KUYRUK = 256
+AZAMI_HAZIR = 2048
+
+
+class SoruHazirlayici:
+    def __init__(self, uret, azami_kuyruk: int = AZAMI_KUYRUK, azami_hazir: int = AZAMI_HAZIR):
+        """`uret(uid)` hazırlanacak SoruDenemesi'ni ya da (gerek yoksa) None döndürür"""
+        self._uret = uret
+        self._kuyruk = queue.Queue(maxsize=azami_kuyruk)
+        self._azami_hazir = azami_hazir
+        self._hazir = OrderedDict()  # uid -> SoruDenemesi (en eski önce)
+        # uid -> kuyruktaki ya da hazır sorunun planlama sürümü; iptal/yeniden planlama eskileri
+        # geçersiz kılar. Sürümler tüm öğrencilerde tekildir: silinen girdi yeniden oluşunca
+        # kuyrukta kalmış eski bir iş ona eşleşemez
+        self._surum = {}
+        self._surumler = itertools.count(1)
+        self._kilit = threading.Lock()
+        self._isci = None
+        self._sayaclar = dict.fromkeys(
+            ("planlanan", "hazirlanan", "isabet", "iska", "dusen", "iptal", "atilan", "hata"), 0)
+
+    def _baslat(self):
+        if self._isci is None or not self._isci.is_alive():
+            self._isci = threading.Thread(target=self._calis, name="soru-hazirlayici", daemon=True)
+            self._isci.start()
+
+    def planla(self, uid: str):
+        """Öğrencinin sonraki sorusunu arka planda hazırlatır"""
+        with self._kilit:
+            surum = next(self._surumler)
+            self._surum[uid] = surum
+            self._hazir.pop(uid, None)
+            self._baslat()
+            try:
+                self._kuyruk.put_nowait((uid, surum))
+            except queue.Full:
+                # Reddedilen planlamanın girdisi kalmaz; soru istek anında üretilir
+                self._surum.pop(uid, None)
+                self._sayaclar["dusen"] += 1
+                return
+            self._sayaclar["planlanan"] += 1
+
+    def iptal(self, uid: str):
+        """Oturum bitti: bekleyen hazırlığı ve hazır soruyu geçersiz kılar"""
+        with self._kilit:
+            if uid in self._surum or uid in self._hazir:
+                self._sayaclar["iptal"] += 1
+            self._surum.pop(uid, None)
+            self._hazir.pop(uid, None)
+
+    def al(self, uid: str, soru_no: int):
+        """Bu numara için hazırlanmış soruyu döndürür ve kuyruktan çıkarır; yoksa None"""
+        with self._kilit:
+            deneme = self._hazir.pop(uid, None)
+            self._surum.pop(uid, None)
+            if deneme is not None and deneme.soru_no == soru_no:
+                self._sayaclar["isabet"] += 1
+                return deneme
+            self._sayaclar["iska"] += 1
+            return None
+
+    def _calis(self):
+        while True:
+            uid, surum = self._kuyruk.get()
+            try:
+                with self._kilit:
+                    if self._surum.get(uid) != surum:
+                        self._sayaclar["atilan"] += 1
+                        continue
+                deneme = self._uret(uid)
+                with self._kilit:
+                    # Üretim sürerken iptal edildi ya da yeniden planlandıysa sonucu atla
+                    if self._surum.get(uid) != surum:
+                        self._sayaclar["atilan"] += 1
+                        continue
+                    if deneme is None:
+                        # Hazırlanacak soru yok (ör. oturum bitti); sürümü de bırak
+                        del self._surum[uid]
+                        self._sayaclar["atilan"] += 1
+                        continue
+                    self._hazir[uid] = deneme
+                    self._sayaclar["hazirlanan"] += 1
+                    while len(self._hazir) > self._azami_hazir:
+                        eski, _ = self._hazir.popitem(last=False)
+                        self._surum.pop(eski, None)
+                        self._sayaclar["atilan"] += 1
+            except Exception:
+                with self._kilit:
+                    if self._surum.get(uid) == surum:
+                        del self._surum[uid]
+                    self._sayaclar["hata"] += 1
+                logger.exception("Soru hazırlanamadı (uid=%s)", uid)
+            finally:
+                self._kuyruk.task_done()
+
+    def bekle(self):
+        """Kuyruktaki tüm işler bitene kadar bekler (ölçüm ve kapanış için)"""
+        self._kuyruk.join()
+
+    def metrikler(self) -> dict:
+        with self._kilit:
+            m = dict(self._sayaclar)
+            m["kuyruk_derinligi"] = self._kuyruk.qsize()
+            m["hazir"] = len(self._hazir)
+        istek = m["isabet"] + m["iska"]
+        m["isabet_orani"] = round(m["isabet"] / istek, 3) if istek else None
+        return m
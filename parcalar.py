@@ -0,0 +1,237 @@
+"""Sınıf bazlı parçalama: her sınıfın kendi öğrenci deposu, cevap defteri ve kilitleri.
+
+Veri dizini düzeni:
+    <veri dizini>/ogrenciler.json, ogrenciler.gunluk, defter.csv   (kök parça, eski kayıtlar)
+    <veri dizini>/siniflar/<kod>/parca.json                         ({"sinif": "7-A"})
+    <veri dizini>/siniflar/<kod>/ogrenciler.json, ogrenciler.gunluk, defter.csv
+
+Parça kodu sınıf adının kısa özetidir ve yeni öğrencilerin uid'sine önek olarak
+eklenir ("3fa2c1-9b0e4d2a"); istekler dosya ya da tablo aramadan uid önekiyle
+doğru parçaya yönlendirilir. Öneksiz (eski) uid'ler kök parçada kalır, taşıma
+gerekmez. Bir sınıfın yazmaları yalnızca kendi dosyalarına ve kilitlerine dokunur.
+
+Tüm sınıfları kapsayan rapor sorguları her parçada paralel çalışır ve sonuçlar
+(anahtar, parça kodu, dosya sırası) düzeninde birleştirilir; imleç bu üçlüyü
+taşır, böylece sayfalama parçalar arasında da kararlıdır.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from defter import BASLIKLAR, DEFTER_ADI, PARCA_DIZINI, Defter, imlec_coz, imlec_kodla, sorgu_hazirla, zaman_anahtari
+from depo import OgrenciDeposu
+
+logger = logging.getLogger(__name__)
+
+KOK = ""  # kök parçanın kodu (öneksiz uid'ler)
+AZAMI_PARALEL = 8
+BOSTA_KAPATMA = 600   # saniye; bu kadar kullanılmayan parçanın öğrenci deposu kapatılır
+BOSTA_DENETIMI = 60   # boştaki parçalar en fazla bu aralıkla taranır
+
+
+def parca_kodu(sinif: str) -> str:
+    """Sınıf adının 6 karakterlik kodu; sınıfsız öğrenciler kök parçaya gider"""
+    sinif = (sinif or "").strip()
+    if not sinif:
+        return KOK
+    return hashlib.blake2b(sinif.encode("utf-8"), digest_size=3).hexdigest()
+
+
+def uid_uret(sinif: str) -> str:
+    kod = parca_kodu(sinif)
+    rastgele = str(uuid.uuid4())[:8]
+    return f"{kod}-{rastgele}" if kod else rastgele
+
+
+def uid_parcasi(uid: str) -> str:
+    kod, ayrac, _ = uid.partition("-")
+    return kod if ayrac else KOK
+
+
+class Parca:
+    """Tek bir sınıfın (ya da kök dizinin) dosyaları"""
+
+    def __init__(self, kod: str, dizin: str, sinif: str = ""):
+        self.kod = kod
+        self.dizin = dizin
+        self.sinif = sinif
+        self.depo = OgrenciDeposu(os.path.join(dizin, "ogrenciler.json"), os.path.join(dizin, "ogrenciler.gunluk"))
+        self.defter = Defter(os.path.join(dizin, DEFTER_ADI))
+        self.son_erisim = time.monotonic()
+
+    def ac(self):
+        self.depo.ac()
+        self.defter.hazirla()
+
+
+class Parcalar:
+    def __init__(self, kok_dizin: str):
+        self.kok_dizin = kok_dizin
+        self._parcalar = {}  # kod -> Parca
+        self._kilit = threading.Lock()
+        self._havuz = None
+        self._son_denetim = time.monotonic()
+
+    # ---------- açılış / yönlendirme ----------
+    def ac(self, salt_okunur: bool = False) -> dict:
+        """Kök parçayı ve diskteki tüm sınıf parçalarını açar (her biri kendi günlüğünü kurtarır).
+
+        `salt_okunur` ise yalnızca defterler okunmak üzere kaydedilir; öğrenci depoları
+        açılmaz ve hiçbir dosyaya yazılmaz (depoların sahibi olmayan süreçler için).
+        """
+        with self._kilit:
+            if KOK not in self._parcalar:
+                self._parcalar[KOK] = Parca(KOK, self.kok_dizin)
+            dizin = os.path.join(self.kok_dizin, PARCA_DIZINI)
+            for kod in sorted(os.listdir(dizin)) if os.path.isdir(dizin) else ():
+                if kod not in self._parcalar:
+                    self._parcalar[kod] = self._parca_oku(kod)
+            parcalar = list(self._parcalar.values())
+        if not salt_okunur:
+            for parca in parcalar:
+                parca.ac()
+        logger.info("%d parça açıldı (%d sınıf)", len(parcalar), len(parcalar) - 1)
+        return dict(self._parcalar)
+
+    def _parca_oku(self, kod: str) -> Parca:
+        dizin = os.path.join(self.kok_dizin, PARCA_DIZINI, kod)
+        try:
+            with open(os.path.join(dizin, "parca.json"), encoding="utf-8") as f:
+                sinif = json.load(f).get("sinif", "")
+        except (OSError, ValueError):
+            sinif = ""
+        return Parca(kod, dizin, sinif)
+
+    def parca(self, uid: str):
+        """uid önekine göre parça; bilinmeyen önek için None"""
+        return self._kullan(self._parcalar.get(uid_parcasi(uid)))
+
+    def _kullan(self, parca):
+        """Parçanın son erişim zamanını günceller; arada bir boştaki parçaları kapatır"""
+        if parca is None:
+            return None
+        simdi = parca.son_erisim = time.monotonic()
+        if simdi - self._son_denetim >= BOSTA_DENETIMI:
+            self._son_denetim = simdi
+            self.bostakileri_kapat(simdi - BOSTA_KAPATMA)
+        return parca
+
+    def bostakileri_kapat(self, esik: float = None) -> int:
+        """`esik`ten (time.monotonic) beri kullanılmayan parçaların öğrenci depolarını kapatır.
+
+        Depo anlık görüntüsünü alıp günlük dosyasını bırakır; sonraki erişimde kendiliğinden
+        yeniden açılır. Kapatılan depo sayısını döndürür.
+        """
+        if esik is None:
+            esik = time.monotonic() - BOSTA_KAPATMA
+        kapatilan = 0
+        for parca in list(self._parcalar.values()):
+            if parca.son_erisim < esik and parca.depo.acik:
+                parca.depo.kapat()
+                kapatilan += 1
+        if kapatilan:
+            logger.info("%d boştaki parçanın deposu kapatıldı", kapatilan)
+        return kapatilan
+
+    def sinif_parcasi(self, sinif: str) -> Parca:
+        """Sınıfın parçası; yoksa dizini ile birlikte oluşturulur"""
+        kod = parca_kodu(sinif)
+        parca = self._parcalar.get(kod)
+        if parca is not None:
+            return self._kullan(parca)
+        with self._kilit:
+            parca = self._parcalar.get(kod)
+            if parca is None:
+                dizin = os.path.join(self.kok_dizin, PARCA_DIZINI, kod)
+                os.makedirs(dizin, exist_ok=True)
+                yol = os.path.join(dizin, "parca.json")
+                if not os.path.exists(yol):
+                    with open(yol, "w", encoding="utf-8") as f:
+                        json.dump({"sinif": sinif.strip()}, f, ensure_ascii=False)
+                parca = Parca(kod, dizin, sinif.strip())
+                parca.ac()
+                self._parcalar[kod] = parca
+                logger.info("Yeni sınıf parçası: %s (%s)", kod, sinif)
+            return parca
+
+    def getir(self, uid: str):
+        parca = self.parca(uid)
+        return parca.depo.getir(uid) if parca else None
+
+    def depo(self, uid: str) -> OgrenciDeposu:
+        return self.parca(uid).depo
+
+    def defter(self, uid: str) -> Defter:
+        return self.parca(uid).defter
+
+    def kapat(self):
+        for parca in list(self._parcalar.values()):
+            parca.depo.kapat()
+
+    # ---------- parçalar arası okuma ----------
+    def _dagit(self, islev, parcalar):
+        """islev(parca) çağrılarını parçalar üzerinde paralel çalıştırır (sonuçlar aynı sırayla)"""
+        if len(parcalar) <= 1:
+            return [islev(p) for p in parcalar]
+        if self._havuz is None:
+            self._havuz = ThreadPoolExecutor(max_workers=min(AZAMI_PARALEL, os.cpu_count() or 1),
+                                             thread_name_prefix="parca-sorgu")
+        return list(self._havuz.map(islev, parcalar))
+
+    def _ilgili(self, sinif=None) -> list:
+        """Sınıf filtresi varsa yalnızca o sınıfın parçası ve (eski kayıtlar için) kök parça"""
+        parcalar = sorted(self._parcalar.values(), key=lambda p: p.kod)
+        if sinif:
+            kod = parca_kodu(sinif)
+            parcalar = [p for p in parcalar if p.kod in (KOK, kod)]
+        return parcalar
+
+    def kayitlar(self) -> list:
+        """Tüm parçaların kayıtları, zamana göre sıralı"""
+        listeler = self._dagit(lambda p: p.defter.kayitlar(), self._ilgili())
+        return sorted((k for liste in listeler for k in liste), key=lambda k: zaman_anahtari(k.zaman))
+
+    def veri_cercevesi(self):
+        """Admin raporları için tüm sınıfların pandas DataFrame'i"""
+        import pandas as pd
+
+        return pd.DataFrame([k.sozluk() for k in self.kayitlar()], columns=BASLIKLAR)
+
+    def sorgula(self, sinif=None, uid=None, zorluk=None, baslangic=None, bitis=None,
+                min_puan=None, max_puan=None, sirala="zaman", azalan=False,
+                limit=50, imlec=None) -> dict:
+        """Defter.sorgula ile aynı sözleşme; uid verilirse tek parçaya, yoksa tüm parçalara dağıtılır"""
+        sorgu = sorgu_hazirla(sinif, uid, zorluk, baslangic, bitis, min_puan, max_puan, sirala, limit)
+        if uid:
+            parca = self.parca(uid)
+            parcalar = [parca] if parca else []
+        else:
+            parcalar = self._ilgili(sinif)
+        imlec_konumu = imlec_coz(imlec, uzunluk=3, sirala=sorgu["sirala"]) if imlec else None
+
+        def parca_sayfasi(parca):
+            konum = None
+            if imlec_konumu is not None:
+                anahtar, kod, sira = imlec_konumu
+                # (anahtar, kod, sira) üçlüsünde imleçten sonra gelenler: aynı parçada
+                # imlecin kendisinden, küçük kodlularda anahtarın tümünden sonra başlanır
+                if parca.kod == kod:
+                    konum = (anahtar, sira)
+                else:
+                    konum = (anahtar, float("inf") if parca.kod < kod else -1)
+            sayfa, devam = parca.defter.sayfa(sorgu, azalan, konum)
+            return [(anahtar, parca.kod, sira, k) for anahtar, sira, k in sayfa], devam
+
+        sonuclar = self._dagit(parca_sayfasi, parcalar)
+        birlesik = sorted((s for sayfa, _ in sonuclar for s in sayfa),
+                          key=lambda s: s[:3], reverse=azalan)
+        limit = sorgu["limit"]
+        devam = len(birlesik) > limit or any(d for _, d in sonuclar)
+        sayfa = birlesik[:limit]
+        return {"kayitlar": [s[3].sozluk() for s in sayfa],
+                "sonraki": imlec_kodla(*sayfa[-1][:3]) if devam and sayfa else None}
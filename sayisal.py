@@ -0,0 +1,166 @@
+"""Öğrenci cevabındaki sayıların beklenen sonuçla denetlenmesi.
+
+Her rasyonel sorunun kompakt ifadesi ("1/2 + 1/3 = 5/6", bkz. SoruDenemesi.ifade)
+sunucuda saklanır ve beklenen sonucu taşır. `beklenen_coz` bu ifadeyi işlenenler,
+sonuç ve beklenen ara adımlardan oluşan bir `Beklenen`e çevirir (önbellekli).
+
+Ara adımlar sadeleştirilmemiş biçimleriyle tanınır: 1/2 + 1/3 için ortak paydalı
+3/6, 2/6 ve 5/6 (ya da paydalar çarpılarak bulunan 12'lik biçimler); 2/3 * 3/4
+için 6/12; 1/2 ÷ 3/4 için ters çevrilmiş bölen 4/3 ve 4/6. Soruyu yinelemek ("1/2 * 1")
+ne ara adım ne de sonuç sayılır; önce yanlış bir "= x" yazıp ardından doğru sonucu
+yazan öğrenci kendini düzeltmiş kabul edilir.
+
+`sayisal_denetle` cevaptaki sayıları tek bir derlenmiş düzenli ifadeyle çıkarır
+ve yalnızca tam sayı çarpımlarıyla karşılaştırır. Taranan metin ve sayı adedi
+sınırlıdır; her gönderimde ve toplu yeniden puanlamada çalışabilecek kadar ucuzdur.
+"""
+import re
+from dataclasses import dataclass
+from fractions import Fraction
+from functools import lru_cache
+from itertools import islice
+from math import lcm
+
+from veri_modeli import rasyonel_parcalar
+
+AZAMI_UZUNLUK = 4000  # taranan karakter
+AZAMI_SAYI = 64       # cevap başına denetlenen sayı
+
+SONUC_PUANI = 40
+ARA_ADIM_PUANI = 20   # ara adım başına, en fazla iki adım
+TUTARLILIK_PUANI = 20  # ara adım ya da doğru sonuç yazılmış ve yanlış sonuç iddiası yok
+
+# "= -3/6", "5 / 6", "0,75", "2" ... Eksi işareti yalnızca önünde rakam ya da ")" yoksa
+# sayıya aittir ("5/6-1/3" bir çıkarmadır); "=" ile başlayan sayı bir sonuç iddiasıdır.
+_SAYI_RE = re.compile(
+    r"(?P<esit>=\s*)?(?<![\d/)])(?P<isaret>[-−]?)(?P<pay>\d{1,9})"
+    r"(?:\s*/\s*(?P<payda>\d{1,9})|[.,](?P<ondalik>\d{1,6}))?(?![\d/])"
+)
+# Soruyu yinelerken işlenenlerin arasına yazılabilecek işaretler
+_ISLEM_ISARETLERI = {"+": ("+",), "-": ("-", "−"), "*": ("*", "x", "×", "·"), "/": ("/", "÷", ":")}
+
+
+@dataclass(frozen=True, slots=True)
+class Beklenen:
+    """Bir rasyonel sorunun doğru sonucu ve tanınan ara adımları"""
+    s1: Fraction
+    op: str
+    s2: Fraction
+    sonuc: Fraction
+    ara: frozenset  # (|pay|, payda) çiftleri, sadeleştirilmemiş
+    gerekli: int    # tam puan için gösterilmesi gereken ara adım sayısı (en fazla 2)
+
+
+def _ara_adimlar(s1: Fraction, op: str, s2: Fraction, sonuc: Fraction):
+    """Tüm çözüm yollarının ara adımları ve en kısa yolun adım sayısı"""
+    if op in "+-":
+        yollar = []
+        for payda in {lcm(s1.denominator, s2.denominator), s1.denominator * s2.denominator}:
+            a = s1.numerator * (payda // s1.denominator)
+            b = s2.numerator * (payda // s2.denominator)
+            yollar.append({(abs(a), payda), (abs(b), payda), (abs(a + b if op == "+" else a - b), payda)})
+    elif op == "*":
+        yollar = [{(abs(s1.numerator * s2.numerator), s1.denominator * s2.denominator)}]
+    else:
+        yollar = [{(s2.denominator, abs(s2.numerator)),
+                   (abs(s1.numerator * s2.denominator), s1.denominator * abs(s2.numerator))}]
+    # Soruda zaten yazan sayıları kopyalamak ara adım sayılmaz
+    soruda = {(abs(s.numerator), s.denominator) for s in (s1, s2, sonuc)}
+    yollar = [yol - soruda for yol in yollar]
+    return frozenset().union(*yollar), min(2, *(len(yol) for yol in yollar))
+
+
+@lru_cache(maxsize=4096)
+def beklenen_coz(soru: str):
+    """Soru metninden ya da kompakt ifadesinden Beklenen; rasyonel soru değilse None"""
+    parcalar = rasyonel_parcalar(soru or "")
+    if parcalar is None:
+        return None
+    s1, op, s2, sonuc = parcalar
+    s1, s2, sonuc = Fraction(s1), Fraction(s2), Fraction(sonuc)
+    return Beklenen(s1, op, s2, sonuc, *_ara_adimlar(s1, op, s2, sonuc))
+
+
+def _sayilar(metin: str):
+    """(pay, payda, sonuç iddiası mı, başlangıç, bitiş) demetleri; payda her zaman pozitiftir"""
+    for m in islice(_SAYI_RE.finditer(metin, 0, AZAMI_UZUNLUK), AZAMI_SAYI):
+        pay = int(m["pay"])
+        if m["payda"] is not None:
+            payda = int(m["payda"])
+            if payda == 0:
+                continue
+        elif m["ondalik"] is not None:
+            payda = 10 ** len(m["ondalik"])
+            pay = pay * payda + int(m["ondalik"])
+        else:
+            payda = 1
+        if m["isaret"]:
+            pay = -pay
+        yield pay, payda, m["esit"] is not None, m.start(), m.end()
+
+
+def _esit(pay: int, payda: int, deger: Fraction) -> bool:
+    return pay * deger.denominator == deger.numerator * payda
+
+
+def sayisal_denetle(cevap: str, beklenen: Beklenen) -> dict:
+    """Cevaptaki sayıları beklenen sonuçla karşılaştırır.
+
+    Dönen sözlük: puan (0-100), sonuc (doğru sonuç yazılmış mı), ara (tanınan ara adım
+    sayısı), yanlis (son sonuç iddiası yanlışsa o değer, değilse None).
+    """
+    sonuc = beklenen.sonuc
+    isaretler = _ISLEM_ISARETLERI[beklenen.op]
+    bulunan_ara = set()
+    dogru_siralar = []  # sonuca eşit sayıların sıraları
+    kopya = set()       # soruyu yineleyen "s1 op s2" ikilisindeki sayıların sıraları
+    son_iddia = None
+    iddia_sirasi = son_sira = -1
+    onceki = None
+    for sira, (pay, payda, iddia, bas, bitis) in enumerate(_sayilar(cevap)):
+        if _esit(pay, payda, sonuc):
+            dogru_siralar.append(sira)
+        if (abs(pay), payda) in beklenen.ara:
+            bulunan_ara.add((abs(pay), payda))
+        if iddia:
+            son_iddia, iddia_sirasi = (pay, payda), sira
+        # "1/2 * 1" yazmak, sonuç 1/2 olsa da sonucu bulmak sayılmaz
+        if (onceki is not None and _esit(pay, payda, beklenen.s2) and _esit(*onceki[:2], beklenen.s1)
+                and cevap[onceki[2]:bas].strip(" ()") in isaretler):
+            kopya.update((sira - 1, sira))
+        onceki = (pay, payda, bitis)
+        son_sira = sira
+    dogru_siralar = [i for i in dogru_siralar if i not in kopya]
+    sonuc_var = bool(dogru_siralar)
+    son_sonuc = dogru_siralar[-1] if sonuc_var else -1
+
+    # Son "= x" yanlış değerse sonuç yanlıştır; x bir ara adımsa ve ardından başka sayılar
+    # geliyorsa ("1/2 = 3/6 ve 1/3 = 2/6, toplam 5/6") yalnızca ara adım yazılmıştır.
+    # Ardından doğru sonuç yazılmışsa ("= 4/6, hayır 5/6") öğrenci kendini düzeltmiştir.
+    yanlis = None
+    if son_iddia is not None and not _esit(*son_iddia, sonuc) and son_sonuc < iddia_sirasi:
+        if iddia_sirasi == son_sira or (abs(son_iddia[0]), son_iddia[1]) not in beklenen.ara:
+            yanlis = Fraction(son_iddia[0], son_iddia[1])
+
+    puan = 0
+    if sonuc_var and yanlis is None:
+        puan += SONUC_PUANI
+    gerekli = beklenen.gerekli
+    if gerekli:
+        puan += 2 * ARA_ADIM_PUANI * min(gerekli, len(bulunan_ara)) // gerekli
+    elif sonuc_var and yanlis is None:
+        puan += 2 * ARA_ADIM_PUANI  # sonuç zaten sadeleşmiş; gösterilecek ara adım yok
+    # Yalnızca sorudaki sayıları kopyalamak ya da işareti yanlış sonuç tutarlılık sayılmaz
+    if (sonuc_var or bulunan_ara) and yanlis is None:
+        puan += TUTARLILIK_PUANI
+    return {"puan": puan, "sonuc": sonuc_var, "ara": len(bulunan_ara), "yanlis": yanlis}
+
+
+def sayisal_mesaj(denetim: dict, beklenen: Beklenen) -> str:
+    if denetim["yanlis"] is not None:
+        return f"Sonucu {denetim['yanlis']} bulmuşsun ama doğrusu {beklenen.sonuc}; adımlarını kontrol et."
+    if denetim["sonuc"] and (denetim["ara"] or not beklenen.gerekli):
+        return "Hesabın tutuyor: ara adımların ve sonucun doğru."
+    if denetim["sonuc"]:
+        return "Sonuç doğru; ara adımları (ör. ortak payda) sayılarla da göster."
+    return "Çözümünde işlemi sayılarla adım adım göster."
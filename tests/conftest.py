@@ -0,0 +1,9 @@
+import os
+import sys
+import tempfile
+
+# Modüller depo kökünde (paket değil); testler onları doğrudan import eder
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# krm_calisir veri dizinini import sırasında okur; testler depo köküne veri yazmasın
+os.environ.setdefault("DYNAPROOF_VERI_DIZINI", tempfile.mkdtemp(prefix="dynaproof-test-"))
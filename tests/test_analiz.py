@@ -0,0 +1,36 @@
+import random
+
+import pytest
+
+import analiz
+from parcalar import Parcalar
+from veri_modeli import CevapKaydi, Zorluk
+
+pytest.importorskip("pandas")
+
+MADDELER = ["1/2 + 1/3", "2/3 - 1/4", "1/2 * 2/3", "3/4 / 1/2"]
+SONUCLAR = {"1/2 + 1/3": "5/6", "2/3 - 1/4": "5/12", "1/2 * 2/3": "1/3", "3/4 / 1/2": "3/2"}
+
+
+def test_parcali_veri_dizini_analiz_edilir(tmp_path):
+    parcalar = Parcalar(str(tmp_path))
+    parcalar.ac()
+    rng = random.Random(3)
+    try:
+        for sinif in ("7-A", "7-B"):
+            defter = parcalar.sinif_parcasi(sinif).defter
+            for ogrenci in range(6):
+                for madde in MADDELER:
+                    s1, op, s2 = madde.split()
+                    soru = f"({s1}) {op} ({s2}) işleminin sonucunun neden {SONUCLAR[madde]} olduğunu adım adım açıkla."
+                    defter.ekle(CevapKaydi("19-10-2026 10:00", f"{sinif}-{ogrenci}", f"Öğrenci {ogrenci}", sinif,
+                                           soru, "paydaları eşitledim", rng.randrange(0, 101, 10),
+                                           Zorluk.ORTA, 1, "İyi"))
+    finally:
+        parcalar.kapat()
+
+    df = analiz.defter_yukle(str(tmp_path))  # kök defter yalnızca başlık satırı içerir
+    assert len(df) == 48 and df["puan"].dtype.kind == "i"
+    maddeler, islemler = analiz.analiz_et(df)
+    tablo = analiz.kalibrasyon_tablosu(maddeler, islemler)
+    assert set(tablo["maddeler"]) == set(MADDELER) and len(tablo["esikler"]) == 2
@@ -0,0 +1,111 @@
+from defter import Defter
+from veri_modeli import CevapKaydi, Zorluk
+
+
+def _kayit(i: int, geri_bildirim: str = "İyi") -> CevapKaydi:
+    return CevapKaydi(f"0{i % 9 + 1}-01-2026 10:00", f"u{i}", f"Öğrenci {i}", "7-A",
+                      "(1/2) + (1/3) işleminin sonucunun neden 5/6 olduğunu adım adım açıkla.",
+                      f"paydaları eşitledim {i}", 10 * i, Zorluk.ORTA, i, geri_bildirim)
+
+
+def test_yarim_kalan_satirlar_atlanir_ve_defter_calismaya_devam_eder(tmp_path):
+    yol = str(tmp_path / "defter.csv")
+    defter = Defter(yol)
+    defter.hazirla()
+    for i in range(3):
+        defter.ekle(_kayit(i))
+
+    # Çökme: sözlüğe ve deftere yazılırken kesilmiş son satırlar
+    with open(yol + ".sozluk", "ab") as f:
+        f.write(b'g,AAAAAAAA,"Yar')
+    with open(yol, "ab") as f:
+        f.write(b"01-01-2026 10:00,u9,7-A,abc")
+
+    yeniden = Defter(yol)
+    assert [k.uid for k in yeniden.kayitlar()] == ["u0", "u1", "u2"]
+    sayfa, devam = yeniden.sayfa(yeniden_sorgu(), azalan=False)
+    assert len(sayfa) == 3 and not devam
+
+    # Sonraki eklemeler yarım satırlara yapışmaz; yeni metinler sözlüğe düzgün girer
+    yeniden.ekle(_kayit(3, "Yeni geri bildirim"))
+    yeniden.ekle(_kayit(4, "Yar"))
+    for okuyan in (yeniden, Defter(yol)):
+        kayitlar = okuyan.kayitlar()
+        assert [k.uid for k in kayitlar] == ["u0", "u1", "u2", "u3", "u4"]
+        assert [k.geri_bildirim for k in kayitlar[3:]] == ["Yeni geri bildirim", "Yar"]
+        assert kayitlar[0].ad_soyad == "Öğrenci 0"
+
+
+def yeniden_sorgu():
+    from defter import sorgu_hazirla
+
+    return sorgu_hazirla(limit=10)
+
+
+def test_dizinler_eklemelerle_guncel_kalir(tmp_path):
+    from defter import sorgu_hazirla
+
+    defter = Defter(str(tmp_path / "defter.csv"))
+    defter.hazirla()
+    for i in range(6):
+        defter.ekle(_kayit(i))
+    for sorgu in (sorgu_hazirla(sirala="puan", limit=50), sorgu_hazirla(uid="u2", limit=50),
+                  sorgu_hazirla(sinif="7-A", sirala="ad_soyad", limit=50)):
+        defter.sayfa(sorgu, azalan=False)  # dizinleri kur
+
+    for i in (6, 2, 7, 2):
+        defter.ekle(_kayit(i))
+    taze = Defter(defter.yol)
+    for sorgu in (sorgu_hazirla(sirala="puan", limit=50), sorgu_hazirla(uid="u2", limit=50),
+                  sorgu_hazirla(sinif="7-A", sirala="ad_soyad", limit=50),
+                  sorgu_hazirla(sinif="7-B", limit=50)):
+        for azalan in (False, True):
+            assert defter.sayfa(sorgu, azalan) == taze.sayfa(sorgu, azalan)
+    assert len(defter.sayfa(sorgu_hazirla(uid="u2", limit=50), False)[0]) == 3
+
+
+def test_gecersiz_imlec_ve_parametreler_sorgu_hatasi_verir(tmp_path):
+    import pytest
+    from defter import SorguHatasi, imlec_coz, imlec_kodla, sorgu_hazirla
+
+    defter = Defter(str(tmp_path / "defter.csv"))
+    defter.hazirla()
+    for i in range(3):
+        defter.ekle(_kayit(i))
+    imlec = defter.sorgula(sirala="puan", limit=1)["sonraki"]
+    assert defter.sorgula(sirala="puan", limit=1, imlec=imlec)["kayitlar"]
+    with pytest.raises(SorguHatasi):  # sıralama değişince eski imleç
+        defter.sorgula(sirala="ad_soyad", limit=1, imlec=imlec)
+
+    for konum in ([{"a": 1}, "x", 1], [5, "x", 1.5], [5, 3, 1], [5, "x", -1], [True, "x", 1]):
+        with pytest.raises(SorguHatasi):
+            imlec_coz(imlec_kodla(*konum), uzunluk=3, sirala="puan")
+    assert imlec_coz(imlec_kodla(5, "x", 1), uzunluk=3, sirala="puan") == (5, "x", 1)
+
+    for parametreler in ({"zorluk": "bogus"}, {"limit": -5}, {"limit": 0}, {"limit": 10_000},
+                         {"baslangic": "2026-99-99"}, {"bitis": "2026-02-30"}, {"min_puan": -1}):
+        with pytest.raises(SorguHatasi):
+            sorgu_hazirla(**parametreler)
+    assert sorgu_hazirla(zorluk="Orta", baslangic="2026-10-19")["zorluk"] == Zorluk.ORTA
+
+
+def test_cok_satirli_cevap_icinde_kesilen_kayit_sonraki_eklemeyi_yutmaz(tmp_path):
+    yol = str(tmp_path / "defter.csv")
+    defter = Defter(yol)
+    defter.hazirla()
+    defter.ekle(_kayit(1))
+    cok_satirli = _kayit(2)
+    cok_satirli.cevap = "önce\npaydaları eşitledim"  # kısa: sıkıştırılmadan, satır sonuyla yazılır
+    defter.ekle(cok_satirli)
+
+    # Çökme: çok satırlı bir cevabın tırnağı açıkken kesilmiş kayıt
+    with open(yol, "ab") as f:
+        f.write(b'01-01-2026 10:00,u9,7-A,AAAAAAAA,AAAAAAAA,"yar\xc4\xb1m\n')
+
+    yeniden = Defter(yol)
+    assert [k.uid for k in yeniden.kayitlar()] == ["u1", "u2"]
+    yeniden.ekle(_kayit(3))
+    for okuyan in (yeniden, Defter(yol)):
+        kayitlar = okuyan.kayitlar()
+        assert [k.uid for k in kayitlar] == ["u1", "u2", "u3"]
+        assert kayitlar[1].cevap == "önce\npaydaları eşitledim"
@@ -0,0 +1,74 @@
+import json
+import os
+
+from depo import OgrenciDeposu
+from veri_modeli import Konu, Ogrenci, SoruDenemesi, Zorluk
+
+SORU = "1/2 + 1/3 = 5/6"
+
+
+def _depo(tmp_path, **kw):
+    return OgrenciDeposu(str(tmp_path / "ogrenciler.json"), str(tmp_path / "ogrenciler.gunluk"),
+                         fsync=False, **kw)
+
+
+def _cevapla(depo, uid, no, puan):
+    depo.soru_ekle(uid, SoruDenemesi.yeni(no, Konu.RASYONEL, Zorluk.TEMEL, SORU))
+    depo.cevap_isle(uid, puan)
+
+
+def test_bozuk_anlik_goruntu_ve_gunluk_kuyrugu_kurtarilir(tmp_path):
+    depo = _depo(tmp_path)
+    depo.ac()
+    depo.kaydet("u1", Ogrenci("Ali", "Veli", "7-A", ""))
+    _cevapla(depo, "u1", 1, 80)
+    depo.anlik_al()
+    depo.kaydet("u2", Ogrenci("Ayşe", "Kaya", "7-B", ""))
+    _cevapla(depo, "u2", 1, 60)
+    _cevapla(depo, "u1", 2, 40)
+    depo._gunluk.close()  # çökme: kapat() çağrılmadan
+
+    # JSON olarak geçerli ama bir satırı bozuk anlık görüntü; günlüğün son kaydı yarım
+    with open(depo.anlik_yolu, encoding="utf-8") as f:
+        anlik = json.load(f)
+    anlik["o"]["u3"] = ["Can", "Demir"]
+    with open(depo.anlik_yolu, "w", encoding="utf-8") as f:
+        json.dump(anlik, f)
+    gunluk_boyu = os.path.getsize(depo.gunluk_yolu)
+    with open(depo.gunluk_yolu, "ab") as f:
+        f.write(b'0badc0de [99,"c","u2",10')
+
+    kurtarilan = _depo(tmp_path)
+    ogrenciler = kurtarilan.ac()
+    # Yalnızca bozuk satır atlanır; sağlam u1 anlık görüntüden, sonraki kayıtlar günlükten gelir
+    assert set(ogrenciler) == {"u1", "u2"}
+    assert list(ogrenciler["u1"].gecmis_puanlar) == [80, 40]
+    assert list(ogrenciler["u2"].gecmis_puanlar) == [60]
+    assert ogrenciler["u2"].istatistik.n == 1
+    assert os.path.getsize(depo.gunluk_yolu) == gunluk_boyu
+    assert any(ad.startswith("ogrenciler.json.bozuk-") for ad in os.listdir(tmp_path))
+
+    # Kurtarılan depo yazmaya devam eder ve temiz kapanır
+    _cevapla(kurtarilan, "u2", 2, 100)
+    kurtarilan.kapat()
+    assert list(_depo(tmp_path).ac()["u2"].gecmis_puanlar) == [60, 100]
+
+
+def test_eski_kayitlarin_istatistigi_acilista_kurulur(tmp_path):
+    depo = _depo(tmp_path)
+    depo.ac()
+    depo.kaydet("u1", Ogrenci("Ali", "Veli", "7-A", ""))
+    for no, puan in enumerate((70, 90), 1):
+        _cevapla(depo, "u1", no, puan)
+    depo.kapat()
+
+    # Şema 2 anlık görüntüsü: istatistik alanı yok
+    with open(depo.anlik_yolu, encoding="utf-8") as f:
+        veri = json.load(f)
+    veri["v"] = 2
+    veri["o"]["u1"] = veri["o"]["u1"][:7]
+    with open(depo.anlik_yolu, "w", encoding="utf-8") as f:
+        json.dump(veri, f)
+
+    profil = _depo(tmp_path).ac()["u1"]
+    assert profil.istatistik.n == 2  # okuma yolu artık profili değiştirmek zorunda değil
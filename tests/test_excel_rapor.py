@@ -0,0 +1,32 @@
+import pytest
+
+from excel_rapor import AZAMI_SAYFA_ADI, OZET_SAYFASI, sayfa_adi
+
+
+def test_uzun_ad_31_karaktere_kisaltilir():
+    ad = sayfa_adi("Ali Veli Uzun Soyadı Olan Öğrenci Çok Uzun", set())
+    assert ad == "Ali Veli Uzun Soyadı Olan Öğren" and len(ad) == AZAMI_SAYFA_ADI
+
+
+@pytest.mark.parametrize("ad, beklenen", [
+    ("A/B: [7*A]?", "A-B- -7-A--"),
+    ("'Ayşe\\Kaya'", "Ayşe-Kaya"),
+    ("Tab\tlı", "Tab-lı"),
+    ("", "Öğrenci"),
+    ("history", "Öğrenci"),
+])
+def test_gecersiz_karakterler_temizlenir(ad, beklenen):
+    assert sayfa_adi(ad, set()) == beklenen
+
+
+def test_kisaltilinca_cakisan_adlar_benzersiz_olur():
+    kullanilan = {OZET_SAYFASI.casefold()}
+    uzun = "Ayşe Nur Gökçe Öztürk Karabağlar Ortaokulu"
+    adlar = [sayfa_adi(uzun + " 1", kullanilan), sayfa_adi(uzun + " 2", kullanilan),
+             sayfa_adi(uzun.upper(), kullanilan), sayfa_adi("genel özet", kullanilan)]
+    assert adlar == ["Ayşe Nur Gökçe Öztürk Karabağla",
+                     "Ayşe Nur Gökçe Öztürk Karab (2)",
+                     "AYŞE NUR GÖKÇE ÖZTÜRK KARAB (3)",  # Excel adları harf duyarsız karşılaştırır
+                     "genel özet (2)"]
+    assert all(len(a) <= AZAMI_SAYFA_ADI for a in adlar)
+    assert len({a.casefold() for a in adlar}) == len(adlar)
@@ -0,0 +1,35 @@
+import os
+import signal
+import time
+
+from isler import HATA, TAMAMLANDI, IsYoneticisi
+
+
+def _bekle(yonetici, kimlik, sure=60):
+    son = time.monotonic() + sure
+    while time.monotonic() < son:
+        durum = yonetici.durum(kimlik)
+        if durum["durum"] in (TAMAMLANDI, HATA):
+            return durum
+        time.sleep(0.1)
+    raise AssertionError(f"iş bitmedi: {yonetici.durum(kimlik)}")
+
+
+def test_oldurulen_isci_sonrasi_havuz_yeniden_kurulur(tmp_path):
+    yonetici = IsYoneticisi(str(tmp_path), str(tmp_path / "isler"), azami_eszamanli=1, azami_bekleyen=1)
+    yonetici.ac()
+    try:
+        ilk = yonetici.gonder("csv")
+        for surec in list(yonetici._havuz._processes.values()):
+            os.kill(surec.pid, signal.SIGKILL)
+        durum = _bekle(yonetici, ilk["kimlik"])
+        assert durum["durum"] == HATA
+        assert "BrokenProcessPool" in durum["hata"]
+        assert yonetici.metrikler()["aktif"] == 0
+
+        # Bozuk havuz bırakıldı; yeni iş yeni havuzda tamamlanır
+        ikinci = yonetici.gonder("csv")
+        assert _bekle(yonetici, ikinci["kimlik"])["durum"] == TAMAMLANDI
+        assert os.path.exists(yonetici.dosya(ikinci["kimlik"]))
+    finally:
+        yonetici.kapat()
@@ -0,0 +1,38 @@
+import re
+
+import pytest
+
+import krm_calisir
+from kabul import KabulKontrolu
+
+
+@pytest.fixture(scope="module")
+def istemci():
+    # Veri dizini conftest'te geçici bir dizine yönlendirilir
+    return krm_calisir.create_app().test_client()
+
+
+def _soru_ac(istemci):
+    yanit = istemci.post("/basla", data={"ad": "Ali", "soyad": "Veli", "sinif": "7-A"})
+    uid = yanit.headers["Location"].rstrip("/").split("/")[-1]
+    html = istemci.get(f"/soru/{uid}").get_data(as_text=True)
+    alanlar = dict(re.findall(r'name="(soru_metni|soru_no|zorluk)" value="([^"]*)"', html))
+    return uid, dict(alanlar, cevap="paydaları eşitledim çünkü sonuç 5/6")
+
+
+def test_ayni_cevabin_tekrar_gonderimi_ilk_sonuca_yonlendirir(istemci):
+    uid, form = _soru_ac(istemci)
+    ilk = istemci.post(f"/cevap/{uid}", data=form)
+    tekrar = istemci.post(f"/cevap/{uid}", data=form)
+    assert ilk.status_code == tekrar.status_code == 302
+    assert tekrar.headers["Location"] == ilk.headers["Location"]
+    assert krm_calisir.PARCALAR.getir(uid).soru_sayisi == 1  # ikinci gönderim puanlanmadı
+
+
+def test_kuyruk_doluyken_503_ve_retry_after_doner(istemci, monkeypatch):
+    uid, form = _soru_ac(istemci)
+    monkeypatch.setattr(krm_calisir, "KABUL", KabulKontrolu(azami_eszamanli=0, azami_bekleyen=0))
+    yanit = istemci.post(f"/cevap/{uid}", data=form)
+    assert yanit.status_code == 503 and int(yanit.headers["Retry-After"]) >= 1
+    assert 'id="yeniden"' in yanit.get_data(as_text=True)  # form kendiliğinden yeniden gönderilir
+    assert krm_calisir.PARCALAR.getir(uid).soru_sayisi == 0
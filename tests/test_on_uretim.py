@@ -0,0 +1,64 @@
+import threading
+from types import SimpleNamespace
+
+from on_uretim import SoruHazirlayici
+
+
+def test_kuyruk_doluyken_ve_oturum_bitince_surum_kalmaz():
+    serbest = threading.Event()
+    basladi = threading.Event()
+
+    def uret(uid):
+        basladi.set()
+        serbest.wait(5)
+        return None if uid == "bitti" else SimpleNamespace(soru_no=2)
+
+    hazirlayici = SoruHazirlayici(uret, azami_kuyruk=1)
+    hazirlayici.planla("bitti")
+    assert basladi.wait(5)            # işçi "bitti" üzerinde meşgul, kuyruk boş
+    hazirlayici.planla("u1")          # kuyruğu doldurur
+    hazirlayici.planla("u2")          # reddedilir
+    assert "u2" not in hazirlayici._surum and hazirlayici.metrikler()["dusen"] == 1
+    serbest.set()
+    hazirlayici.bekle()
+
+    # Soru gerekmeyen öğrencinin girdisi bırakılır; hazırlanan soru iptalde temizlenir
+    assert set(hazirlayici._surum) == {"u1"}
+    hazirlayici.iptal("u1")
+    assert not hazirlayici._surum and hazirlayici.metrikler()["hazir"] == 0
+
+
+def test_hazirlanan_soru_kullanilir_eskisi_atilir():
+    sorular = iter(range(2, 100))
+    hazirlayici = SoruHazirlayici(lambda uid: SimpleNamespace(soru_no=next(sorular)))
+
+    hazirlayici.planla("u1")
+    hazirlayici.bekle()
+    assert hazirlayici.al("u1", 2).soru_no == 2   # isabet: hazır soru aynen verilir
+
+    # Cevap puanlanmadan sayfa yenilendi gibi: hazırlanan soru (3) istenen numaraya uymaz
+    hazirlayici.planla("u1")
+    hazirlayici.bekle()
+    assert hazirlayici.al("u1", 2) is None
+    assert hazirlayici.al("u1", 3) is None        # eski soru atıldı, ikinci kez verilmez
+    m = hazirlayici.metrikler()
+    assert (m["isabet"], m["iska"], m["hazir"]) == (1, 2, 0)
+
+
+def test_uretim_surerken_yeniden_planlanan_sonuc_atilir():
+    serbest, basladi = threading.Event(), threading.Event()
+    sorular = iter(range(2, 100))
+
+    def uret(uid):
+        basladi.set()
+        serbest.wait(5)
+        return SimpleNamespace(soru_no=next(sorular))
+
+    hazirlayici = SoruHazirlayici(uret)
+    hazirlayici.planla("u1")
+    assert basladi.wait(5)
+    hazirlayici.planla("u1")  # ilk üretim bitmeden yeni cevap puanlandı
+    serbest.set()
+    hazirlayici.bekle()
+    assert hazirlayici.metrikler()["atilan"] == 1
+    assert hazirlayici.al("u1", 3).soru_no == 3
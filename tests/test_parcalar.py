@@ -0,0 +1,54 @@
+import time
+
+import parcalar as parcalar_mod
+from parcalar import Parcalar, uid_uret
+from veri_modeli import CevapKaydi, Ogrenci, Zorluk
+
+
+def test_bostaki_parcanin_deposu_kapanir_ve_yeniden_acilir(tmp_path):
+    parcalar = Parcalar(str(tmp_path))
+    parcalar.ac()
+    try:
+        uid_a, uid_b = uid_uret("7-A"), uid_uret("7-B")
+        parcalar.sinif_parcasi("7-A").depo.kaydet(uid_a, Ogrenci("Ali", "Veli", "7-A", ""))
+        parcalar.sinif_parcasi("7-B").depo.kaydet(uid_b, Ogrenci("Ayşe", "Kaya", "7-B", ""))
+        parcalar.parca(uid_a).son_erisim -= parcalar_mod.BOSTA_KAPATMA + 1
+
+        # Denetim aralığı dolunca herhangi bir erişim boştaki parçayı kapatır
+        parcalar._son_denetim = time.monotonic() - parcalar_mod.BOSTA_DENETIMI
+        assert parcalar.getir(uid_b).ad == "Ayşe"
+        depo_a = parcalar._parcalar[uid_a.split("-")[0]].depo
+        assert not depo_a.acik and parcalar.sinif_parcasi("7-B").depo.acik
+
+        # Kapanan depo sonraki erişimde kayıtlarıyla birlikte açılır
+        assert parcalar.getir(uid_a).ad == "Ali" and depo_a.acik
+    finally:
+        parcalar.kapat()
+
+
+def test_imlecle_sayfalama_iki_parcayi_kayipsiz_birlestirir(tmp_path):
+    parcalar = Parcalar(str(tmp_path))
+    parcalar.ac()
+    try:
+        for sinif in ("7-A", "7-B"):
+            defter = parcalar.sinif_parcasi(sinif).defter
+            for i in range(7):
+                # Aynı puanlar iki parçada da var: eşitlikler (kod, sıra) ile çözülmeli
+                defter.ekle(CevapKaydi(f"19-10-2026 10:{i:02d}", f"{sinif}-{i}", f"Öğrenci {i}", sinif,
+                                       "1/2 + 1/3 = 5/6", "paydaları eşitledim", (i % 3) * 10,
+                                       Zorluk.TEMEL, 1, "İyi"))
+
+        for sirala, azalan in (("zaman", False), ("puan", True)):
+            gorulen, imlec = [], None
+            while True:
+                sayfa = parcalar.sorgula(sirala=sirala, azalan=azalan, limit=3, imlec=imlec)
+                assert len(sayfa["kayitlar"]) <= 3
+                gorulen += [(k["sinif"], k["uid"], k["puan"]) for k in sayfa["kayitlar"]]
+                imlec = sayfa["sonraki"]
+                if not imlec:
+                    break
+            assert len(gorulen) == len(set(gorulen)) == 14
+            if sirala == "puan":
+                assert [p for _, _, p in gorulen] == sorted((p for _, _, p in gorulen), reverse=True)
+    finally:
+        parcalar.kapat()
@@ -0,0 +1,40 @@
+from fractions import Fraction
+
+from sayisal import beklenen_coz, sayisal_denetle
+
+TOPLAMA = beklenen_coz("1/2 + 1/3 = 5/6")
+
+
+def _puan(cevap, beklenen=TOPLAMA):
+    return sayisal_denetle(cevap, beklenen)
+
+
+def test_adim_adim_dogru_cozum_tam_puan_alir():
+    assert _puan("paydaları eşitledim 3/6 + 2/6 = 5/6")["puan"] == 100
+
+
+def test_yanlis_sonuc_yakalanir():
+    denetim = _puan("3/6 + 2/6 = 4/6")
+    assert denetim["yanlis"] == Fraction(4, 6) and denetim["puan"] <= 40
+
+
+def test_sonradan_duzeltilen_sonuc_gecerlidir():
+    denetim = _puan("önce = 4/6 buldum, yanlışmış: 3/6 + 2/6 toplamı 5/6")
+    assert denetim["yanlis"] is None and denetim["puan"] == 100
+
+
+def test_duzeltmeden_sonra_yeniden_yanlis_iddia_yanlistir():
+    assert _puan("5/6 değil, = 4/6")["yanlis"] is not None
+
+
+def test_soruyu_kopyalamak_ya_da_yanlis_isaret_tutarlilik_puani_almaz():
+    assert _puan("1/2 + 1/3")["puan"] == 0
+    assert _puan("-5/6")["puan"] == 0
+
+
+def test_sonuca_esit_islenen_kopyalanirsa_sonuc_sayilmaz():
+    beklenen = beklenen_coz("1/2 * 1 = 1/2")
+    assert sayisal_denetle("1/2 * 1", beklenen)["puan"] == 0
+    assert sayisal_denetle("1/2 * 1 = 1/2", beklenen)["puan"] == 100
+    assert sayisal_denetle("(1) * (1) -> 1/1 = 1", beklenen_coz("1 * 1 = 1"))["puan"] == 100
+    assert sayisal_denetle("1/2 ile 1 çarpılınca 1/2", beklenen_coz("1/2 * 1 = 1/2"))["sonuc"]
@@ -0,0 +1,29 @@
+import random
+
+import krm_calisir
+from analiz import Kalibrasyon
+from veri_modeli import Zorluk, rasyonel_parcalar
+
+
+class _SayanKalibrasyon(Kalibrasyon):
+    def __init__(self, veri):
+        super().__init__(veri)
+        self.sorulan = []
+
+    def zorluk(self, madde):
+        self.sorulan.append(madde)
+        return super().zorluk(madde)
+
+
+def test_kalibre_edilmemis_madde_kabul_edilir(monkeypatch):
+    # Tabloda tek bir (temel) madde var; diğer tüm maddeler kalibre edilmemiş
+    kalibrasyon = _SayanKalibrasyon({"esikler": [40, 70], "maddeler": {"1/2 + 1/3": [10, 90]}})
+    monkeypatch.setattr(krm_calisir, "KALIBRASYON", kalibrasyon)
+    random.seed(7)
+    for _ in range(50):
+        kalibrasyon.sorulan.clear()
+        soru = krm_calisir.rasyonel_soru_uret_motoru(zorluk=Zorluk.ILERI)
+        s1, op, s2, _ = rasyonel_parcalar(soru)
+        assert f"{s1} {op} {s2}" != "1/2 + 1/3"
+        assert kalibrasyon.sorulan[-1] == f"{s1} {op} {s2}"
+        assert len(kalibrasyon.sorulan) < krm_calisir.KALIBRASYON_DENEME
@@ -0,0 +1,25 @@
+import pytest
+from flask import Flask
+
+import varliklar
+
+
+@pytest.fixture
+def istemci():
+    app = Flask(__name__)
+    app.register_blueprint(varliklar.varlik_bp)
+    return app.test_client()
+
+
+def test_varlik_parmak_izli_sunulur(istemci):
+    with istemci.application.test_request_context():
+        url = varliklar.varlik("dynaproof.css")
+    yanit = istemci.get(url)
+    assert yanit.status_code == 200 and "immutable" in yanit.headers["Cache-Control"]
+
+
+@pytest.mark.parametrize("dosya", ["../krm_calisir.x.py", "vendor/../../krm_calisir.x.py",
+                                   "%2e%2e/krm_calisir.x.py", "..%5ckrm_calisir.x.py"])
+def test_statik_dizin_disina_cikilamaz(istemci, dosya):
+    assert istemci.get("/varlik/" + dosya).status_code == 404
+
@@ -0,0 +1,149 @@
+"""Statik varlıklar (parmak izli URL, uzun önbellek) ve yanıt sıkıştırma.
+
+Sayfalardaki ortak CSS static/dynaproof.css dosyasındadır. Şablonlar onu
+`{{ varlik('dynaproof.css') }}` ile bağlar; URL içeriğin özetini taşır
+(/varlik/dynaproof.3f2a9c1e.css), bu yüzden tarayıcı dosyayı bir yıl boyunca
+yeniden sormadan önbellekte tutabilir. İçerik değişince URL de değişir.
+
+Bootstrap varsayılan olarak CDN'den gelir. static/vendor/bootstrap.min.css varsa
+(internetsiz sınıflar için) yerel kopya aynı şekilde parmak izli sunulur:
+    python varliklar.py bootstrap-indir
+
+HTML, JSON, CSS ve JS yanıtları ESIK bayttan büyükse istemcinin kabul ettiği
+kodlamayla sıkıştırılır: brotli (paket kuruluysa) ya da gzip.
+"""
+import gzip
+import hashlib
+import os
+import sys
+
+from flask import Blueprint, Response, abort, request, url_for
+from werkzeug.security import safe_join
+
+try:
+    import brotli  # İsteğe bağlı: pip install brotli
+except ImportError:
+    brotli = None
+
+STATIK_DIZIN = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+BOOTSTRAP_CDN = "https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css"
+BOOTSTRAP_YEREL = "vendor/bootstrap.min.css"
+ESIK = 1024
+GZIP_SEVIYESI = 6
+BROTLI_KALITESI = 5  # Dinamik yanıtlar için hız/oran dengesi
+SIKISTIRILABILIR = {"text/html", "application/json", "text/css", "application/javascript", "text/csv"}
+BIR_YIL = 365 * 24 * 3600
+
+varlik_bp = Blueprint("varliklar", __name__)
+_onbellek = {}  # ad -> (özet, içerik, değişiklik zamanı)
+
+
+def _oku(ad: str):
+    # safe_join STATIK_DIZIN dışına çıkan adları (../, Windows'ta ..\ ve sürücü yolları) reddeder
+    yol = safe_join(STATIK_DIZIN, ad)
+    if yol is None:
+        raise FileNotFoundError(ad)
+    degisim = os.path.getmtime(yol)
+    kayit = _onbellek.get(ad)
+    if kayit is None or kayit[2] != degisim:
+        with open(yol, "rb") as f:
+            icerik = f.read()
+        kayit = (hashlib.blake2b(icerik, digest_size=4).hexdigest(), icerik, degisim)
+        _onbellek[ad] = kayit
+    return kayit
+
+
+def varlik(ad: str) -> str:
+    """Varlığın parmak izli URL'si ('dynaproof.css' → '/varlik/dynaproof.<özet>.css')"""
+    ozet = _oku(ad)[0]
+    kok, uzanti = os.path.splitext(ad)
+    return url_for("varliklar.varlik_sun", dosya=f"{kok}.{ozet}{uzanti}")
+
+
+def bootstrap_css() -> str:
+    if os.path.exists(os.path.join(STATIK_DIZIN, BOOTSTRAP_YEREL)):
+        return varlik(BOOTSTRAP_YEREL)
+    return BOOTSTRAP_CDN
+
+
+@varlik_bp.app_context_processor
+def _sablon_degiskenleri():
+    return {"varlik": varlik, "bootstrap_css": bootstrap_css()}
+
+
+@varlik_bp.route("/varlik/<path:dosya>")
+def varlik_sun(dosya):
+    kok, uzanti = os.path.splitext(dosya)
+    kok, _, ozet = kok.rpartition(".")
+    ad = kok + uzanti
+    if not kok:
+        abort(404)
+    try:
+        guncel_ozet, icerik, _ = _oku(ad)
+    except OSError:
+        abort(404)
+    yanit = Response(icerik, mimetype="text/css" if uzanti == ".css" else None)
+    if ozet == guncel_ozet:
+        yanit.headers["Cache-Control"] = f"public, max-age={BIR_YIL}, immutable"
+    else:
+        # Eski özetli URL: güncel içerik verilir ama önbelleğe alınmaz
+        yanit.headers["Cache-Control"] = "no-cache"
+    return yanit
+
+
+def _kodlama_sec(kabul: str):
+    """Accept-Encoding başlığına göre 'br', 'gzip' ya da None (q=0 reddedilmiş sayılır)"""
+    kabul_edilen = set()
+    for parca in kabul.lower().split(","):
+        ad, _, parametre = parca.partition(";")
+        try:
+            q = float(parametre.strip()[2:]) if parametre.strip().startswith("q=") else 1.0
+        except ValueError:
+            q = 1.0
+        if q > 0:
+            kabul_edilen.add(ad.strip())
+    for kodlama in (("br",) if brotli else ()) + ("gzip",):
+        if kodlama in kabul_edilen:
+            return kodlama
+    return None
+
+
+@varlik_bp.after_app_request
+def yaniti_sikistir(yanit):
+    if (yanit.direct_passthrough or yanit.is_streamed or yanit.status_code < 200
+            or yanit.status_code in (204, 304) or "Content-Encoding" in yanit.headers
+            or yanit.mimetype not in SIKISTIRILABILIR):
+        return yanit
+    yanit.vary.add("Accept-Encoding")
+    govde = yanit.get_data()
+    if len(govde) < ESIK:
+        return yanit
+    kodlama = _kodlama_sec(request.headers.get("Accept-Encoding", ""))
+    if kodlama is None:
+        return yanit
+    if kodlama == "br":
+        yanit.set_data(brotli.compress(govde, quality=BROTLI_KALITESI))
+    else:
+        yanit.set_data(gzip.compress(govde, compresslevel=GZIP_SEVIYESI, mtime=0))
+    yanit.headers["Content-Encoding"] = kodlama
+    return yanit
+
+
+def bootstrap_indir():
+    """Bootstrap CSS'i static/vendor altına indirir (internetsiz sınıf kurulumları için)"""
+    from urllib.request import urlopen
+
+    hedef = os.path.join(STATIK_DIZIN, BOOTSTRAP_YEREL)
+    os.makedirs(os.path.dirname(hedef), exist_ok=True)
+    with urlopen(BOOTSTRAP_CDN, timeout=30) as kaynak:
+        icerik = kaynak.read()
+    with open(hedef, "wb") as f:
+        f.write(icerik)
+    print(f"--> {hedef} ({len(icerik) / 1024:.0f} KiB)")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["bootstrap-indir"]:
+        bootstrap_indir()
+    else:
+        print(__doc__)
@@ -0,0 +1,270 @@
+"""DynaProof veri modeli: öğrenci profilleri ve cevap kayıtları için kompakt tipler.
+
+Profiller eskiden serbest biçimli sözlüklerdi ve `indent=2` ile yazılıyordu.
+Burada `__slots__` kullanan dataclass'lar ve küçük tamsayı enum'ları kullanılır;
+dosya biçimi ise şema sürümü taşıyan, girintisiz ve konumsal (anahtarsız) JSON'dur.
+Eski biçimdeki dosyalar okunurken otomatik olarak dönüştürülür.
+"""
+import enum
+import json
+import re
+import sys
+from array import array
+from dataclasses import dataclass, field
+
+SEMA_SURUMU = 3
+
+# Bozuk ama JSON olarak okunabilen bir satırın Ogrenci/SoruDenemesi.satirdan'da verebileceği hatalar
+COZUM_HATALARI = (ValueError, TypeError, IndexError, KeyError, AttributeError, OverflowError)
+
+
+class Zorluk(enum.IntEnum):
+    TEMEL = 0
+    ORTA = 1
+    ILERI = 2
+
+    @property
+    def metin(self) -> str:
+        return _ZORLUK_METINLERI[self]
+
+    @classmethod
+    def coz(cls, deger) -> "Zorluk":
+        """'temel' gibi bir metni ya da 0/1/2 kodunu Zorluk'a çevirir (bilinmeyen → TEMEL)"""
+        if isinstance(deger, int):
+            return cls(deger)
+        return _METINDEN_ZORLUK.get(str(deger).strip().lower(), cls.TEMEL)
+
+
+class Konu(enum.IntEnum):
+    RASYONEL = 0
+
+    @property
+    def metin(self) -> str:
+        return _KONU_METINLERI[self]
+
+    @classmethod
+    def coz(cls, deger) -> "Konu":
+        if isinstance(deger, int):
+            return cls(deger)
+        return _METINDEN_KONU.get(str(deger).strip().lower(), cls.RASYONEL)
+
+
+class Islem(enum.IntEnum):
+    TOPLAMA = 0
+    CIKARMA = 1
+    CARPMA = 2
+    BOLME = 3
+
+    @property
+    def sembol(self) -> str:
+        return "+-*/"[self]
+
+    @property
+    def metin(self) -> str:
+        return _ISLEM_METINLERI[self]
+
+    @classmethod
+    def sembolden(cls, sembol: str) -> "Islem":
+        return cls("+-*/".index(sembol))
+
+
+_ZORLUK_METINLERI = {Zorluk.TEMEL: "temel", Zorluk.ORTA: "orta", Zorluk.ILERI: "ileri"}
+_METINDEN_ZORLUK = {v: k for k, v in _ZORLUK_METINLERI.items()}
+_ISLEM_METINLERI = {Islem.TOPLAMA: "toplama", Islem.CIKARMA: "çıkarma", Islem.CARPMA: "çarpma", Islem.BOLME: "bölme"}
+_KONU_METINLERI = {Konu.RASYONEL: "rasyonel"}
+_METINDEN_KONU = {v: k for k, v in _KONU_METINLERI.items()}
+
+# Rasyonel sayı motorunun ürettiği soru metni sabit bir kalıba uyar; bellekte ve
+# dosyada yalnızca ifade kısmı ("1/2 + -1/3 = 1/6") tutulur, metin istendiğinde kurulur.
+RASYONEL_SORU_KALIBI = "({s1}) {op} ({s2}) işleminin sonucunun neden {sonuc} olduğunu adım adım açıkla."
+RASYONEL_SORU_RE = re.compile(
+    r"^\((-?\d+(?:/\d+)?)\) ([-+*/]) \((-?\d+(?:/\d+)?)\) işleminin sonucunun neden "
+    r"(-?\d+(?:/\d+)?) olduğunu adım adım açıkla\.$"
+)
+_IFADE_RE = re.compile(r"^(-?\d+(?:/\d+)?) ([-+*/]) (-?\d+(?:/\d+)?) = (-?\d+(?:/\d+)?)$")
+
+
+def soru_sikistir(metin: str) -> str:
+    m = RASYONEL_SORU_RE.match(metin)
+    if not m:
+        return metin
+    return f"{m.group(1)} {m.group(2)} {m.group(3)} = {m.group(4)}"
+
+
+def rasyonel_parcalar(soru: str):
+    """Rasyonel soru metninden ya da kompakt ifadesinden (s1, op, s2, sonuc) metinleri (uymuyorsa None)"""
+    m = _IFADE_RE.match(soru) or RASYONEL_SORU_RE.match(soru)
+    return m.groups() if m else None
+
+
+def islem_coz(soru: str):
+    """Rasyonel soru metninden ya da kompakt ifadesinden işlemi çıkarır (bulunamazsa None)"""
+    parcalar = rasyonel_parcalar(soru)
+    return Islem.sembolden(parcalar[1]) if parcalar else None
+
+
+def soru_ac(kayit: str) -> str:
+    m = _IFADE_RE.match(kayit)
+    if not m:
+        return kayit
+    return RASYONEL_SORU_KALIBI.format(s1=m.group(1), op=m.group(2), s2=m.group(3), sonuc=m.group(4))
+
+
+@dataclass(slots=True)
+class SoruDenemesi:
+    """Öğrenciye sorulmuş tek bir soru ve aldığı puan.
+
+    `ifade` sorunun kompakt biçimidir; tam metin `soru` özelliğiyle elde edilir.
+    """
+    soru_no: int
+    konu: Konu
+    zorluk: Zorluk
+    ifade: str
+    puan: int = 0
+
+    @property
+    def soru(self) -> str:
+        return soru_ac(self.ifade)
+
+    @property
+    def islem(self):
+        return islem_coz(self.ifade)
+
+    @classmethod
+    def yeni(cls, soru_no: int, konu: Konu, zorluk: Zorluk, soru: str) -> "SoruDenemesi":
+        return cls(soru_no, konu, zorluk, soru_sikistir(soru))
+
+    def satir(self) -> list:
+        return [self.soru_no, int(self.konu), int(self.zorluk), self.ifade, self.puan]
+
+    @classmethod
+    def satirdan(cls, s: list) -> "SoruDenemesi":
+        return cls(s[0], Konu(s[1]), Zorluk(s[2]), s[3], s[4])
+
+    @classmethod
+    def sozlukten(cls, d: dict) -> "SoruDenemesi":
+        """Eski (sözlük) biçimden dönüştürür"""
+        return cls(int(d.get("soru_no", 0)), Konu.coz(d.get("konu", "rasyonel")),
+                   Zorluk.coz(d.get("zorluk", "temel")), soru_sikistir(d.get("soru", "")),
+                   int(d.get("puan", 0)))
+
+
+@dataclass(slots=True)
+class OgrenciIstatistik:
+    """Adaptif motorun öğrenci başına artımlı istatistikleri (bkz. adaptif.py).
+
+    `ustalik` ve `deneme` işlem (Islem) koduna göre indekslenir; ustalık 0-1 arasıdır.
+    """
+    n: int = 0
+    ortalama: float = 0.0
+    trend: float = 0.0
+    son_puan: int = 0
+    ustalik: array = field(default_factory=lambda: array("f", [0.5] * len(Islem)))
+    deneme: array = field(default_factory=lambda: array("H", [0] * len(Islem)))
+
+    def satir(self) -> list:
+        return [self.n, round(self.ortalama, 2), round(self.trend, 2), self.son_puan,
+                [round(u, 3) for u in self.ustalik], self.deneme.tolist()]
+
+    @classmethod
+    def satirdan(cls, s: list) -> "OgrenciIstatistik":
+        return cls(s[0], s[1], s[2], s[3], array("f", s[4]), array("H", s[5]))
+
+
+@dataclass(slots=True)
+class Ogrenci:
+    """Bir öğrencinin profili ve oturum ilerlemesi"""
+    ad: str
+    soyad: str
+    sinif: str
+    kayit_zamani: str
+    soru_sayisi: int = 0
+    gecmis_puanlar: array = field(default_factory=lambda: array("h"))
+    gecmis_sorular: list = field(default_factory=list)
+    istatistik: OgrenciIstatistik = field(default_factory=OgrenciIstatistik)
+
+    @property
+    def ad_soyad(self) -> str:
+        return f"{self.ad} {self.soyad}"
+
+    def satir(self) -> list:
+        return [self.ad, self.soyad, self.sinif, self.kayit_zamani, self.soru_sayisi,
+                self.gecmis_puanlar.tolist(), [s.satir() for s in self.gecmis_sorular],
+                self.istatistik.satir()]
+
+    @classmethod
+    def satirdan(cls, s: list) -> "Ogrenci":
+        # Şema 2'de istatistik alanı yoktu; boş başlatılır, adaptif motor geçmişten kurar
+        istatistik = OgrenciIstatistik.satirdan(s[7]) if len(s) > 7 else OgrenciIstatistik()
+        return cls(s[0], s[1], sys.intern(s[2]), s[3], s[4], array("h", s[5]),
+                   [SoruDenemesi.satirdan(x) for x in s[6]], istatistik)
+
+    @classmethod
+    def sozlukten(cls, d: dict) -> "Ogrenci":
+        """Eski (sözlük) biçimden dönüştürür"""
+        return cls(d.get("ad", ""), d.get("soyad", ""), sys.intern(d.get("sinif", "")), d.get("kayit_zamani", ""),
+                   int(d.get("soru_sayisi", 0)), array("h", (int(p) for p in d.get("gecmis_puanlar", []))),
+                   [SoruDenemesi.sozlukten(x) for x in d.get("gecmis_sorular", [])])
+
+
+@dataclass(slots=True)
+class CevapKaydi:
+    """defter.csv'deki tek bir cevap satırı"""
+    zaman: str
+    uid: str
+    ad_soyad: str
+    sinif: str
+    soru: str
+    cevap: str
+    puan: int
+    zorluk: Zorluk
+    soru_no: int
+    geri_bildirim: str
+
+    def sozluk(self) -> dict:
+        return {
+            "zaman": self.zaman, "uid": self.uid, "ad_soyad": self.ad_soyad, "sinif": self.sinif,
+            "soru": self.soru, "cevap": self.cevap, "puan": self.puan, "zorluk": self.zorluk.metin,
+            "soru_no": self.soru_no, "geri_bildirim": self.geri_bildirim,
+        }
+
+
+def anlik_coz(icerik: str, atlanan: list = None):
+    """Dosya içeriğini (gunluk_sirasi, {uid: Ogrenci}) ikilisine çevirir.
+
+    Hem yeni hem eski biçimi okur; `gunluk_sirasi` anlık görüntünün kapsadığı son
+    günlük kaydının sıra numarasıdır (eski dosyalarda 0). Bozuk içerikte
+    ValueError (json.JSONDecodeError) yükseltir. `atlanan` listesi verilirse
+    çözülemeyen öğrenci satırları atlanır ve (uid, hata) olarak listeye eklenir.
+    """
+    if not icerik.strip():
+        return 0, {}
+    veri = json.loads(icerik)
+    if isinstance(veri, dict) and "v" in veri and "o" in veri:
+        if veri["v"] > SEMA_SURUMU:
+            raise ValueError(f"Desteklenmeyen şema sürümü: {veri['v']}")
+        sira, satirlar, coz = veri.get("s", 0), veri["o"], Ogrenci.satirdan
+    else:
+        # Eski biçim: {uid: {"ad": ..., "gecmis_sorular": [{...}]}}
+        sira, satirlar, coz = 0, veri, Ogrenci.sozlukten
+    if atlanan is None:
+        return sira, {uid: coz(s) for uid, s in satirlar.items()}
+    ogrenciler = {}
+    for uid, s in satirlar.items():
+        try:
+            ogrenciler[uid] = coz(s)
+        except COZUM_HATALARI as e:
+            atlanan.append((uid, e))
+    return sira, ogrenciler
+
+
+def ogrencileri_coz(icerik: str) -> dict:
+    """Dosya içeriğini {uid: Ogrenci} sözlüğüne çevirir (bkz. anlik_coz)"""
+    return anlik_coz(icerik)[1]
+
+
+def ogrencileri_serilestir(ogrenciler: dict, gunluk_sirasi: int = 0) -> str:
+    return json.dumps(
+        {"v": SEMA_SURUMU, "s": gunluk_sirasi, "o": {uid: o.satir() for uid, o in ogrenciler.items()}},
+        ensure_ascii=False, separators=(",", ":"),
+    )